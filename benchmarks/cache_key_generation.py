@@ -0,0 +1,122 @@
+"""Micro-benchmark for CacheManager cache key generation.
+
+Compares key generation with memoized case/candidate fingerprints against the
+previous behaviour, where every lookup re-serialized the full case and
+candidate. The "uncached" path is emulated by clearing the memo tables before
+each key, which forces the same recursive serialization the old code did.
+
+Run with:
+
+    uv run python benchmarks/cache_key_generation.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import timeit
+from dataclasses import dataclass, field
+
+from pydantic_evals import Case
+
+from pydantic_ai_gepa.cache import CacheManager
+from pydantic_ai_gepa.types import RolloutOutput
+
+
+@dataclass
+class Document:
+    title: str
+    body: str
+    tags: list[str] = field(default_factory=list)
+    attributes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StructuredInput:
+    query: str
+    documents: list[Document]
+
+
+def _make_cases(num_cases: int, docs_per_case: int) -> list[Case]:
+    cases = []
+    for case_idx in range(num_cases):
+        documents = [
+            Document(
+                title=f"doc-{case_idx}-{doc_idx}",
+                body="lorem ipsum dolor sit amet " * 40,
+                tags=[f"tag-{n}" for n in range(10)],
+                attributes={f"attr-{n}": f"value-{n}" for n in range(10)},
+            )
+            for doc_idx in range(docs_per_case)
+        ]
+        cases.append(
+            Case(
+                name=f"case-{case_idx}",
+                inputs=StructuredInput(query=f"query {case_idx}", documents=documents),
+                metadata={"split": "train", "difficulty": case_idx % 3},
+            )
+        )
+    return cases
+
+
+def _generate_all(
+    cache: CacheManager,
+    cases: list[Case],
+    candidate: dict[str, str],
+    output: RolloutOutput[str],
+    *,
+    memoized: bool,
+) -> None:
+    for index, case in enumerate(cases):
+        for key_type, key_output in (("agent_run", None), ("metric", output)):
+            if not memoized:
+                cache._case_fingerprints.clear()
+                cache._candidate_segments.clear()
+            cache._generate_cache_key(
+                case, index, key_output, candidate, key_type, model_identifier=None
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=50)
+    parser.add_argument("--docs-per-case", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = _make_cases(args.cases, args.docs_per_case)
+    candidate = {
+        "instructions": "Answer the query using the documents. " * 20,
+        "tool:search:description": "Search the corpus for relevant passages.",
+    }
+    output = RolloutOutput.from_success("answer")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = CacheManager(cache_dir=tmpdir, model_identifier="test:model")
+        try:
+            results: dict[str, float] = {}
+            for label, memoized in (("uncached", False), ("memoized", True)):
+                # Warm the memo tables so the memoized path measures steady state.
+                _generate_all(cache, cases, candidate, output, memoized=True)
+                timings = timeit.repeat(
+                    lambda: _generate_all(
+                        cache, cases, candidate, output, memoized=memoized
+                    ),
+                    number=1,
+                    repeat=args.repeat,
+                )
+                results[label] = min(timings)
+        finally:
+            cache.close()
+
+    keys_per_pass = args.cases * 2
+    for label, seconds in results.items():
+        print(
+            f"{label:>9}: {seconds * 1000:8.2f} ms per pass "
+            f"({seconds / keys_per_pass * 1e6:8.1f} us per key)"
+        )
+    print(f"  speedup: {results['uncached'] / results['memoized']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,7 +37,13 @@ ReflectiveDataset = SharedReflectiveDataset | ComponentReflectiveDataset
 
 
 class Adapter(Protocol, Generic[InputT, OutputT, MetadataT]):
-    """Protocol describing the minimal surface required by the GEPA engine."""
+    """Protocol describing the minimal surface required by the GEPA engine.
+
+    ``evaluate`` may additionally accept a keyword-only ``limiter``
+    (``asyncio.Semaphore``). The evaluator then sends cases in chunks and
+    expects each case to acquire the limiter before running; adapters without
+    it are called once per case.
+    """
 
     async def evaluate(
         self,
@@ -727,38 +727,51 @@ class _BaseAgentAdapter(
         candidate: CandidateMap,
         capture_traces: bool,
         example_bank: "InMemoryExampleBank | None" = None,
+        *,
+        limiter: asyncio.Semaphore | None = None,
     ) -> EvaluationBatch:
-        """Evaluate a batch of cases asynchronously."""
+        """Evaluate a batch of cases asynchronously.
+
+        The candidate is applied once for the whole batch. When ``limiter`` is
+        given, every case acquires it before running, so a caller can stream
+        several chunks through one shared concurrency limit. Such cases are
+        treated as independent single-case evaluations: unnamed cases are
+        labelled (and cache-keyed) as ``case-0``, exactly as they would be by
+        ``evaluate([case], ...)``.
+        """
         outputs: list[RolloutOutput[Any]] = []
         scores: list[float] = []
-        trajectories: list[AgentAdapterTrajectory] | None = (
-            [] if capture_traces else None
-        )
+        trajectories: list[AgentAdapterTrajectory | None] = []
+
+        async def run_case(index: int, case: Case[InputT, OutputT, MetadataT]):
+            if limiter is None:
+                return await self.process_case(
+                    case, index, capture_traces, candidate, example_bank=example_bank
+                )
+            async with limiter:
+                return await self.process_case(
+                    case, 0, capture_traces, candidate, example_bank=example_bank
+                )
 
         with self.apply_candidate(candidate):
             results = await asyncio.gather(
-                *(
-                    self.process_case(
-                        case,
-                        index,
-                        capture_traces,
-                        candidate,
-                        example_bank=example_bank,
-                    )
-                    for index, case in enumerate(batch)
-                )
+                *(run_case(index, case) for index, case in enumerate(batch))
             )
 
         for result in results:
             outputs.append(result["output"])
             scores.append(result["score"])
-            if trajectories is not None and "trajectory" in result:
-                trajectories.append(result["trajectory"])
+            # Keep one slot per case so trajectories stay aligned with scores.
+            trajectories.append(result.get("trajectory"))
 
         return EvaluationBatch(
             outputs=outputs,
             scores=scores,
-            trajectories=trajectories if trajectories else None,
+            trajectories=(
+                trajectories
+                if capture_traces and any(t is not None for t in trajectories)
+                else None
+            ),
         )
 
     def apply_candidate(self, candidate: CandidateMap | None):
@@ -770,6 +783,34 @@ class _BaseAgentAdapter(
             stack.enter_context(self.input_spec.apply_candidate(candidate))
         return stack
 
+    async def _run_agent(
+        self,
+        case: Case[InputT, OutputT, MetadataT],
+        case_index: int,
+        candidate: CandidateMap | None,
+        capture_traces: bool,
+        *,
+        example_bank: "InMemoryExampleBank | None" = None,
+    ) -> tuple[AgentAdapterTrajectory | None, RolloutOutput[Any]]:
+        if capture_traces:
+            return await self._run_with_trace(
+                case, case_index, candidate, example_bank=example_bank
+            )
+        output = await self._run_simple(
+            case, case_index, candidate, example_bank=example_bank
+        )
+        return None, output
+
+    async def _compute_metric(
+        self,
+        case: Case[InputT, OutputT, MetadataT],
+        output: RolloutOutput[Any],
+    ) -> MetricResult:
+        maybe_metric_result = self.metric(case, output)
+        if inspect.isawaitable(maybe_metric_result):
+            return await maybe_metric_result
+        return maybe_metric_result
+
     async def process_case(
         self,
         case: Case[InputT, OutputT, MetadataT],
@@ -783,78 +824,37 @@ class _BaseAgentAdapter(
         case_name = self._case_identifier(case, case_index)
         try:
             if self.cache_manager and candidate:
-                cached_agent_result = self.cache_manager.get_cached_agent_run(
+                trajectory, output = await self.cache_manager.aget_or_run_agent(
                     case,
                     case_index,
                     candidate,
                     capture_traces,
-                    model_identifier=self._model_identifier,
-                )
-
-                if cached_agent_result is not None:
-                    trajectory, output = cached_agent_result
-                else:
-                    if capture_traces:
-                        trajectory, output = await self._run_with_trace(
-                            case, case_index, candidate, example_bank=example_bank
-                        )
-                    else:
-                        output = await self._run_simple(
-                            case, case_index, candidate, example_bank=example_bank
-                        )
-                        trajectory = None
-
-                    self.cache_manager.cache_agent_run(
+                    lambda: self._run_agent(
                         case,
                         case_index,
                         candidate,
-                        trajectory,
-                        output,
                         capture_traces,
-                        model_identifier=self._model_identifier,
-                    )
-            else:
-                if capture_traces:
-                    trajectory, output = await self._run_with_trace(
-                        case, case_index, candidate, example_bank=example_bank
-                    )
-                else:
-                    output = await self._run_simple(
-                        case, case_index, candidate, example_bank=example_bank
-                    )
-                    trajectory = None
-
-            if self.cache_manager and candidate:
-                cached_metric = self.cache_manager.get_cached_metric_result(
+                        example_bank=example_bank,
+                    ),
+                    model_identifier=self._model_identifier,
+                )
+                metric_result = await self.cache_manager.aget_or_compute_metric(
                     case,
                     case_index,
                     output,
                     candidate,
+                    lambda: self._compute_metric(case, output),
                     model_identifier=self._model_identifier,
                 )
-
-                if cached_metric is not None:
-                    metric_result = cached_metric
-                else:
-                    maybe_metric_result = self.metric(case, output)
-                    if inspect.isawaitable(maybe_metric_result):
-                        metric_result = await maybe_metric_result
-                    else:
-                        metric_result = maybe_metric_result
-                    self.cache_manager.cache_metric_result(
-                        case,
-                        case_index,
-                        output,
-                        candidate,
-                        metric_result,
-                        model_identifier=self._model_identifier,
-                    )
             else:
-                maybe_metric_result = self.metric(case, output)
-                if inspect.isawaitable(maybe_metric_result):
-                    metric_result = await maybe_metric_result
-                else:
-                    metric_result = maybe_metric_result
+                trajectory, output = await self._run_agent(
+                    case,
+                    case_index,
+                    candidate,
+                    capture_traces,
+                    example_bank=example_bank,
+                )
+                metric_result = await self._compute_metric(case, output)
 
             if trajectory is not None:
                 trajectory.metric_feedback = metric_result.feedback
@@ -0,0 +1,35 @@
+"""Internal caching system for GEPA optimization to support resumable runs."""
+
+from __future__ import annotations
+
+from .backends import (
+    BackendName,
+    BackendStats,
+    CacheBackend,
+    EntryTags,
+    EvictionResult,
+    PickleDirectoryBackend,
+    SQLiteBackend,
+    UsageRow,
+)
+from .bundle import BundleFilter, BundleSummary
+from .codec import Compression
+from .metrics import CacheMetricsSnapshot
+from .manager import CacheManager, create_cached_metric
+
+__all__ = [
+    "BackendName",
+    "BackendStats",
+    "BundleFilter",
+    "BundleSummary",
+    "CacheBackend",
+    "CacheManager",
+    "CacheMetricsSnapshot",
+    "Compression",
+    "EntryTags",
+    "EvictionResult",
+    "PickleDirectoryBackend",
+    "SQLiteBackend",
+    "UsageRow",
+    "create_cached_metric",
+]
@@ -0,0 +1,878 @@
+"""Storage backends for the GEPA rollout cache.
+
+``CacheManager`` serializes metric results and agent runs into opaque byte
+payloads and hands them to a backend keyed by their cache key. Backends only
+deal in bytes, so swapping the on-disk layout never changes cache semantics.
+
+Payloads may reference content-addressed blobs (see :mod:`.codec`). Backends
+store blobs alongside entries, read the references from each payload header,
+and drop blobs once no entry refers to them.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, Protocol, runtime_checkable
+
+import logfire
+
+from .codec import HEADER_PREFIX_SIZE, header_size, payload_refs
+
+BackendName = Literal["sqlite", "pickle"]
+
+LEGACY_SUFFIX = ".pkl"
+BLOB_SUFFIX = ".blob"
+BLOB_DIRNAME = "blobs"
+SQLITE_FILENAME = "cache.sqlite3"
+
+# SQLite caps the number of bound parameters per statement (999 on older builds).
+_SQLITE_BATCH_SIZE = 500
+_SQLITE_SCHEMA_VERSION = 3
+# Buffered access-time updates are written back once this many keys are pending.
+_TOUCH_FLUSH_THRESHOLD = 512
+
+
+@dataclass(frozen=True, slots=True)
+class BackendStats:
+    """Entry count and payload size reported by a cache backend.
+
+    ``total_bytes`` includes shared blobs; ``blob_bytes`` breaks them out.
+    """
+
+    num_entries: int
+    total_bytes: int
+    blob_bytes: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class EntryTags:
+    """Descriptive labels stored alongside an entry for usage reporting."""
+
+    key_type: str | None = None
+    model: str | None = None
+    run_id: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class UsageRow:
+    """Aggregated entry count and size for one (run, model, key type) group."""
+
+    run_id: str | None
+    model: str | None
+    key_type: str | None
+    num_entries: int
+    total_bytes: int
+    last_accessed_at: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class EvictionResult:
+    """Entries removed (or, for a dry run, selected) by an eviction pass."""
+
+    num_entries: int
+    total_bytes: int
+    dry_run: bool = False
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """Byte-oriented key/value store used by :class:`CacheManager`."""
+
+    name: str
+
+    def get(self, key: str) -> bytes | None:
+        """Return the payload stored under ``key``, if any."""
+        ...
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Return payloads for every key that is present."""
+        ...
+
+    def put(self, key: str, value: bytes, tags: EntryTags | None = None) -> None:
+        """Store ``value`` under ``key``, replacing any previous payload."""
+        ...
+
+    def put_many(
+        self,
+        items: Mapping[str, bytes],
+        tags: Mapping[str, EntryTags] | None = None,
+        blobs: Mapping[str, bytes] | None = None,
+    ) -> None:
+        """Store several payloads, and the blobs they reference, in a single write."""
+        ...
+
+    def get_blobs(self, refs: Sequence[str]) -> dict[str, bytes]:
+        """Return the blobs stored under each digest in ``refs`` that is present."""
+        ...
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete the given keys and return how many entries were removed."""
+        ...
+
+    def iter_keys(self) -> Iterator[str]:
+        """Iterate over every stored key."""
+        ...
+
+    def iter_entries(self) -> Iterator[tuple[str, EntryTags]]:
+        """Iterate over every stored key together with its tags."""
+        ...
+
+    def stats(self) -> BackendStats:
+        """Return the entry count and total payload size."""
+        ...
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        ...
+
+    def usage(self) -> list[UsageRow]:
+        """Return entry counts and sizes grouped by run, model and key type."""
+        ...
+
+    def evict(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+        dry_run: bool = False,
+    ) -> EvictionResult:
+        """Drop entries idle for longer than ``ttl`` seconds, then the least
+        recently used entries until the store fits ``max_bytes``/``max_entries``.
+        Blobs no longer referenced by any entry are dropped with them.
+        """
+        ...
+
+    def compact(self) -> None:
+        """Reclaim space left behind by overwritten or deleted entries and blobs."""
+        ...
+
+    def close(self) -> None:
+        """Release any open handles."""
+        ...
+
+
+class PickleDirectoryBackend:
+    """Legacy layout: one ``<key>.pkl`` file per entry inside ``directory``."""
+
+    name = "pickle"
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.blob_directory = self.directory / BLOB_DIRNAME
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{LEGACY_SUFFIX}"
+
+    def _blob_path(self, ref: str) -> Path:
+        return self.blob_directory / f"{ref}{BLOB_SUFFIX}"
+
+    def _blob_paths(self) -> Iterator[Path]:
+        if self.blob_directory.is_dir():
+            yield from self.blob_directory.glob(f"*{BLOB_SUFFIX}")
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def put(self, key: str, value: bytes, tags: EntryTags | None = None) -> None:
+        _write_atomic(self._path(key), value)
+
+    def put_many(
+        self,
+        items: Mapping[str, bytes],
+        tags: Mapping[str, EntryTags] | None = None,
+        blobs: Mapping[str, bytes] | None = None,
+    ) -> None:
+        # Blobs land before the entries that reference them. The file layout has
+        # nowhere to keep tags; they are accepted and dropped.
+        if blobs:
+            self.blob_directory.mkdir(exist_ok=True)
+            for ref, blob in blobs.items():
+                path = self._blob_path(ref)
+                if not path.exists():
+                    _write_atomic(path, blob)
+        for key, value in items.items():
+            self.put(key, value)
+
+    def get_blobs(self, refs: Sequence[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        for ref in refs:
+            try:
+                found[ref] = self._blob_path(ref).read_bytes()
+            except FileNotFoundError:
+                continue
+        return found
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        removed = 0
+        for key in keys:
+            try:
+                self._path(key).unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def iter_keys(self) -> Iterator[str]:
+        for path in self.directory.glob(f"*{LEGACY_SUFFIX}"):
+            yield path.name.removesuffix(LEGACY_SUFFIX)
+
+    def iter_entries(self) -> Iterator[tuple[str, EntryTags]]:
+        no_tags = EntryTags()
+        for key in self.iter_keys():
+            yield key, no_tags
+
+    def stats(self) -> BackendStats:
+        count = 0
+        total = 0
+        for path in self.directory.glob(f"*{LEGACY_SUFFIX}"):
+            count += 1
+            total += path.stat().st_size
+        blob_bytes = sum(path.stat().st_size for path in self._blob_paths())
+        return BackendStats(
+            num_entries=count, total_bytes=total + blob_bytes, blob_bytes=blob_bytes
+        )
+
+    def prune_blobs(self) -> int:
+        """Delete blobs that no entry references and return how many were removed."""
+        referenced: set[str] = set()
+        for path in self.directory.glob(f"*{LEGACY_SUFFIX}"):
+            try:
+                referenced.update(_read_refs(path))
+            except FileNotFoundError:
+                continue
+        removed = 0
+        for path in self._blob_paths():
+            if path.name.removesuffix(BLOB_SUFFIX) not in referenced:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for path in [*self.directory.glob(f"*{LEGACY_SUFFIX}"), *self._blob_paths()]:
+            try:
+                path.unlink()
+            except Exception as e:
+                logfire.warn(
+                    "Failed to delete cache file",
+                    cache_file=str(path),
+                    exception=e,
+                )
+
+    def usage(self) -> list[UsageRow]:
+        stats = self.stats()
+        if not stats.num_entries:
+            return []
+        last_accessed = max(
+            max(stat.st_atime, stat.st_mtime)
+            for stat in (
+                path.stat() for path in self.directory.glob(f"*{LEGACY_SUFFIX}")
+            )
+        )
+        return [
+            UsageRow(
+                run_id=None,
+                model=None,
+                key_type=None,
+                num_entries=stats.num_entries,
+                total_bytes=stats.total_bytes,
+                last_accessed_at=last_accessed,
+            )
+        ]
+
+    def evict(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+        dry_run: bool = False,
+    ) -> EvictionResult:
+        # Access order comes from file timestamps (atime where the filesystem
+        # tracks it, otherwise the write time).
+        entries: list[tuple[float, str, int]] = []
+        for path in self.directory.glob(f"*{LEGACY_SUFFIX}"):
+            stat = path.stat()
+            entries.append(
+                (
+                    max(stat.st_atime, stat.st_mtime),
+                    path.name.removesuffix(LEGACY_SUFFIX),
+                    stat.st_size,
+                )
+            )
+        blob_bytes = sum(path.stat().st_size for path in self._blob_paths())
+        victims = _select_victims(
+            sorted(entries),
+            BackendStats(
+                num_entries=len(entries),
+                total_bytes=sum(size for _, _, size in entries) + blob_bytes,
+            ),
+            max_bytes=max_bytes,
+            max_entries=max_entries,
+            ttl=ttl,
+        )
+        if not dry_run and victims:
+            self.delete_many(victims)
+            self.prune_blobs()
+        return EvictionResult(
+            num_entries=len(victims),
+            total_bytes=sum(victims.values()),
+            dry_run=dry_run,
+        )
+
+    def compact(self) -> None:
+        # Interrupted writes leave hidden temp files behind.
+        for path in self.directory.glob(f".*{LEGACY_SUFFIX}.*.tmp"):
+            path.unlink(missing_ok=True)
+        if self.blob_directory.is_dir():
+            for path in self.blob_directory.glob(f".*{BLOB_SUFFIX}.*.tmp"):
+                path.unlink(missing_ok=True)
+        self.prune_blobs()
+
+    def close(self) -> None:
+        return None
+
+
+class SQLiteBackend:
+    """Single-file cache stored in SQLite with write-ahead logging.
+
+    All entries live in one indexed table, so lookups never touch the directory
+    listing and batched reads/writes share one transaction. Shared blobs live in
+    a second table, with an ``entry_blobs`` table recording which entries
+    reference them. When ``legacy_dir``
+    contains ``<key>.pkl`` files from the pickle-directory layout, they are
+    served read-only on a miss until :meth:`compact` folds them into the
+    database.
+
+    Reads record access times in memory; they are written back in batches
+    (alongside the next write, or before eviction) so a lookup never costs a
+    write transaction.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        legacy_dir: str | Path | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._touched: dict[str, float] = {}
+        self._legacy = (
+            PickleDirectoryBackend(legacy_dir)
+            if legacy_dir is not None and _has_legacy_entries(Path(legacy_dir))
+            else None
+        )
+
+    def _migrate(self) -> None:
+        """Bring the schema up to :data:`_SQLITE_SCHEMA_VERSION`."""
+        with self._lock, self._transaction():
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version < 1:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, "
+                    "value BLOB NOT NULL, "
+                    "size INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, "
+                    "accessed_at REAL NOT NULL)"
+                )
+            if version < 2:
+                for column in ("key_type", "model", "run_id"):
+                    if column not in self._columns():
+                        self._conn.execute(
+                            f"ALTER TABLE entries ADD COLUMN {column} TEXT"
+                        )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS entries_accessed_at "
+                    "ON entries (accessed_at)"
+                )
+            if version < 3:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs ("
+                    "hash TEXT PRIMARY KEY, "
+                    "value BLOB NOT NULL, "
+                    "size INTEGER NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entry_blobs ("
+                    "key TEXT NOT NULL, "
+                    "hash TEXT NOT NULL, "
+                    "PRIMARY KEY (key, hash)) WITHOUT ROWID"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS entry_blobs_hash ON entry_blobs (hash)"
+                )
+            if version < _SQLITE_SCHEMA_VERSION:
+                self._conn.execute(f"PRAGMA user_version = {_SQLITE_SCHEMA_VERSION}")
+
+    def _columns(self) -> set[str]:
+        return {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._touch([key])
+                return row[0]
+        if self._legacy is not None:
+            return self._legacy.get(key)
+        return None
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for chunk in _chunked(unique_keys, _SQLITE_BATCH_SIZE):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                found.update(rows)
+            self._touch(found)
+        if self._legacy is not None:
+            missing = [key for key in unique_keys if key not in found]
+            if missing:
+                found.update(self._legacy.get_many(missing))
+        return found
+
+    def _touch(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= _TOUCH_FLUSH_THRESHOLD:
+            with self._transaction():
+                self._write_touches()
+
+    def _write_touches(self) -> None:
+        """Persist buffered access times; caller holds the lock and a transaction."""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def flush_access_times(self) -> None:
+        """Write buffered access times to the database."""
+        with self._lock:
+            if self._touched:
+                with self._transaction():
+                    self._write_touches()
+
+    def put(self, key: str, value: bytes, tags: EntryTags | None = None) -> None:
+        self.put_many({key: value}, {key: tags} if tags is not None else None)
+
+    def put_many(
+        self,
+        items: Mapping[str, bytes],
+        tags: Mapping[str, EntryTags] | None = None,
+        blobs: Mapping[str, bytes] | None = None,
+    ) -> None:
+        if not items:
+            return
+        now = time.time()
+        no_tags = EntryTags()
+        rows = []
+        refs = []
+        for key, value in items.items():
+            refs.extend((key, ref) for ref in payload_refs(value))
+            entry_tags = (tags or {}).get(key, no_tags)
+            rows.append(
+                (
+                    key,
+                    value,
+                    len(value),
+                    now,
+                    now,
+                    entry_tags.key_type,
+                    entry_tags.model,
+                    entry_tags.run_id,
+                )
+            )
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "INSERT INTO entries "
+                "(key, value, size, created_at, accessed_at, key_type, model, run_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, "
+                "accessed_at = excluded.accessed_at, "
+                "key_type = COALESCE(excluded.key_type, key_type), "
+                "model = COALESCE(excluded.model, model), "
+                "run_id = COALESCE(excluded.run_id, run_id)",
+                rows,
+            )
+            if blobs:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO blobs (hash, value, size) VALUES (?, ?, ?)",
+                    [(ref, blob, len(blob)) for ref, blob in blobs.items()],
+                )
+            self._delete_refs(list(items))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entry_blobs (key, hash) VALUES (?, ?)", refs
+            )
+            self._write_touches()
+
+    def get_blobs(self, refs: Sequence[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        unique_refs = list(dict.fromkeys(refs))
+        with self._lock:
+            for chunk in _chunked(unique_refs, _SQLITE_BATCH_SIZE):
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    self._conn.execute(
+                        f"SELECT hash, value FROM blobs WHERE hash IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                )
+        if self._legacy is not None and len(found) < len(unique_refs):
+            found.update(
+                self._legacy.get_blobs([ref for ref in unique_refs if ref not in found])
+            )
+        return found
+
+    def _delete_refs(self, keys: Sequence[str]) -> None:
+        """Drop blob references held by ``keys``; caller holds a transaction."""
+        for chunk in _chunked(keys, _SQLITE_BATCH_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            self._conn.execute(
+                f"DELETE FROM entry_blobs WHERE key IN ({placeholders})", chunk
+            )
+
+    def _prune_blobs(self) -> None:
+        """Drop blobs no entry references; caller holds a transaction."""
+        self._conn.execute(
+            "DELETE FROM blobs WHERE NOT EXISTS "
+            "(SELECT 1 FROM entry_blobs WHERE entry_blobs.hash = blobs.hash)"
+        )
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        removed = 0
+        key_list = list(keys)
+        with self._lock, self._transaction():
+            for chunk in _chunked(key_list, _SQLITE_BATCH_SIZE):
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"DELETE FROM entries WHERE key IN ({placeholders})", chunk
+                )
+                removed += cursor.rowcount
+            self._delete_refs(key_list)
+            self._prune_blobs()
+            for key in key_list:
+                self._touched.pop(key, None)
+        if self._legacy is not None:
+            removed += self._legacy.delete_many(key_list)
+        return removed
+
+    def iter_keys(self) -> Iterator[str]:
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM entries")]
+        yield from keys
+        if self._legacy is not None:
+            yield from self._legacy.iter_keys()
+
+    def iter_entries(self) -> Iterator[tuple[str, EntryTags]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, key_type, model, run_id FROM entries"
+            ).fetchall()
+        for key, key_type, model, run_id in rows:
+            yield key, EntryTags(key_type=key_type, model=model, run_id=run_id)
+        if self._legacy is not None:
+            yield from self._legacy.iter_entries()
+
+    def stats(self) -> BackendStats:
+        with self._lock:
+            count, total, blob_bytes = self._totals()
+        if self._legacy is not None:
+            legacy = self._legacy.stats()
+            count += legacy.num_entries
+            total += legacy.total_bytes
+            blob_bytes += legacy.blob_bytes
+        return BackendStats(num_entries=count, total_bytes=total, blob_bytes=blob_bytes)
+
+    def _totals(self) -> tuple[int, int, int]:
+        """Entry count, total bytes (blobs included) and blob bytes in the database."""
+        count, entry_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        (blob_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()
+        return count, entry_bytes + blob_bytes, blob_bytes
+
+    def usage(self) -> list[UsageRow]:
+        self.flush_access_times()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, model, key_type, COUNT(*), SUM(size), "
+                "MAX(accessed_at) FROM entries "
+                "GROUP BY run_id, model, key_type "
+                "ORDER BY MAX(accessed_at) DESC"
+            ).fetchall()
+        usage = [UsageRow(*row) for row in rows]
+        if self._legacy is not None:
+            usage.extend(self._legacy.usage())
+        return usage
+
+    def evict(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+        dry_run: bool = False,
+    ) -> EvictionResult:
+        """Evict cold entries from the database.
+
+        Legacy ``.pkl`` files are left alone; run :meth:`compact` first to bring
+        them under eviction.
+        """
+        self.flush_access_times()
+        with self._lock:
+            count, total, _ = self._totals()
+            cursor = self._conn.execute(
+                "SELECT accessed_at, key, size FROM entries ORDER BY accessed_at"
+            )
+            victims = _select_victims(
+                cursor,
+                BackendStats(num_entries=count, total_bytes=total),
+                max_bytes=max_bytes,
+                max_entries=max_entries,
+                ttl=ttl,
+            )
+            cursor.close()
+        if victims and not dry_run:
+            with self._lock, self._transaction():
+                victim_keys = list(victims)
+                for chunk in _chunked(victim_keys, _SQLITE_BATCH_SIZE):
+                    placeholders = ",".join("?" * len(chunk))
+                    self._conn.execute(
+                        f"DELETE FROM entries WHERE key IN ({placeholders})", chunk
+                    )
+                self._delete_refs(victim_keys)
+                self._prune_blobs()
+        return EvictionResult(
+            num_entries=len(victims),
+            total_bytes=sum(victims.values()),
+            dry_run=dry_run,
+        )
+
+    def clear(self) -> None:
+        with self._lock, self._transaction():
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM entry_blobs")
+            self._conn.execute("DELETE FROM blobs")
+            self._touched.clear()
+        if self._legacy is not None:
+            self._legacy.clear()
+            self._legacy = None
+
+    def compact(self) -> None:
+        """Fold legacy pickle files into the database and vacuum it.
+
+        Each batch of legacy files is imported in its own transaction and only
+        unlinked after that transaction commits, and ``VACUUM`` rebuilds the
+        database atomically, so an interrupted compaction never loses entries.
+        """
+        self.flush_access_times()
+        if self._legacy is not None:
+            legacy = self._legacy
+            legacy_keys = list(legacy.iter_keys())
+            for chunk in _chunked(legacy_keys, _SQLITE_BATCH_SIZE):
+                payloads = legacy.get_many(chunk)
+                refs = [
+                    (key, ref)
+                    for key, value in payloads.items()
+                    for ref in payload_refs(value)
+                ]
+                blobs = legacy.get_blobs(list({ref for _, ref in refs}))
+                now = time.time()
+                with self._lock, self._transaction():
+                    # Never clobber entries written since the legacy file was created.
+                    placeholders = ",".join("?" * len(payloads))
+                    existing = {
+                        row[0]
+                        for row in self._conn.execute(
+                            f"SELECT key FROM entries WHERE key IN ({placeholders})",
+                            list(payloads),
+                        )
+                    }
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO blobs (hash, value, size) "
+                        "VALUES (?, ?, ?)",
+                        [(ref, blob, len(blob)) for ref, blob in blobs.items()],
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO entry_blobs (key, hash) VALUES (?, ?)",
+                        [(key, ref) for key, ref in refs if key not in existing],
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO entries "
+                        "(key, value, size, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (key, value, len(value), now, now)
+                            for key, value in payloads.items()
+                        ],
+                    )
+                legacy.delete_many(payloads)
+            legacy.compact()
+            self._legacy = None
+        with self._lock:
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        self.flush_access_times()
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._conn)
+
+
+class _Transaction:
+    """Explicit ``BEGIN IMMEDIATE`` transaction for an autocommit connection."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self._conn.execute("COMMIT")
+        else:
+            self._conn.execute("ROLLBACK")
+
+
+def create_backend(
+    backend: CacheBackend | BackendName,
+    cache_dir: Path,
+) -> CacheBackend:
+    """Resolve a backend name (or instance) for ``cache_dir``."""
+    if not isinstance(backend, str):
+        return backend
+    if backend == "sqlite":
+        return SQLiteBackend(cache_dir / SQLITE_FILENAME, legacy_dir=cache_dir)
+    if backend == "pickle":
+        return PickleDirectoryBackend(cache_dir)
+    raise ValueError(
+        f"Unknown cache backend {backend!r}; expected 'sqlite' or 'pickle'."
+    )
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _read_refs(path: Path) -> list[str]:
+    """Read the blob references from the header of a stored payload file."""
+    with path.open("rb") as handle:
+        prefix = handle.read(HEADER_PREFIX_SIZE)
+        size = header_size(prefix)
+        if not size:
+            return []
+        return payload_refs(prefix + handle.read(size - len(prefix)))
+
+
+def _has_legacy_entries(directory: Path) -> bool:
+    if not directory.is_dir():
+        return False
+    with os.scandir(directory) as entries:
+        return any(
+            entry.name.endswith(LEGACY_SUFFIX) and entry.is_file() for entry in entries
+        )
+
+
+def _select_victims(
+    entries: Iterable[tuple[float, str, int]],
+    totals: BackendStats,
+    *,
+    max_bytes: int | None,
+    max_entries: int | None,
+    ttl: float | None,
+) -> dict[str, int]:
+    """Pick keys to evict from ``(accessed_at, key, size)`` rows.
+
+    ``entries`` must be ordered from least to most recently accessed and
+    ``totals`` must describe all of them. Entries idle for longer than ``ttl``
+    go first; the coldest of the rest follow until the remaining entries fit
+    both limits. Iteration stops at the first entry that is kept, so callers
+    can stream rows from a cursor.
+    """
+    remaining_entries = totals.num_entries
+    remaining_bytes = totals.total_bytes
+    cutoff = time.time() - ttl if ttl is not None else None
+
+    victims: dict[str, int] = {}
+    for accessed_at, key, size in entries:
+        expired = cutoff is not None and accessed_at < cutoff
+        over_entries = max_entries is not None and remaining_entries > max_entries
+        over_bytes = max_bytes is not None and remaining_bytes > max_bytes
+        if not (expired or over_entries or over_bytes):
+            # Rows are ordered by access time, so nothing hotter can be expired.
+            break
+        victims[key] = size
+        remaining_entries -= 1
+        remaining_bytes -= size
+    return victims
+
+
+def _chunked(items: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+__all__ = [
+    "BackendName",
+    "BackendStats",
+    "CacheBackend",
+    "EntryTags",
+    "EvictionResult",
+    "PickleDirectoryBackend",
+    "SQLiteBackend",
+    "UsageRow",
+    "create_backend",
+]
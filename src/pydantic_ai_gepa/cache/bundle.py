@@ -0,0 +1,226 @@
+"""Portable cache bundles for moving a warm cache between machines.
+
+A bundle is an uncompressed tar stream. Its first member is ``index.json``,
+which lists every entry key with its tags; it is followed by ``blobs/<hash>``
+members and ``entries/<key>`` members, with each blob written before the first
+entry that references it. Payloads are copied verbatim (they are already
+compressed), so a bundle can be written to and read from pipes, and importing
+one merges entries under their original keys without re-deriving them.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .backends import CacheBackend, EntryTags, _chunked
+from .codec import payload_refs
+
+BUNDLE_FORMAT = "gepa-cache-bundle"
+BUNDLE_VERSION = 1
+INDEX_NAME = "index.json"
+_ENTRY_PREFIX = "entries/"
+_BLOB_PREFIX = "blobs/"
+_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True, slots=True)
+class BundleFilter:
+    """Select which entries to export; ``None`` fields match anything."""
+
+    model: str | None = None
+    run_id: str | None = None
+    key_type: str | None = None
+
+    def matches(self, tags: EntryTags) -> bool:
+        return (
+            (self.model is None or tags.model == self.model)
+            and (self.run_id is None or tags.run_id == self.run_id)
+            and (self.key_type is None or tags.key_type == self.key_type)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BundleSummary:
+    """Entries and blobs written to (or merged from) a bundle."""
+
+    num_entries: int
+    num_blobs: int
+    total_bytes: int
+    skipped_entries: int = 0
+
+
+def write_bundle(
+    backend: CacheBackend,
+    destination: str | Path | IO[bytes],
+    filter: BundleFilter | None = None,
+) -> BundleSummary:
+    """Stream the entries of ``backend`` matching ``filter`` into a bundle."""
+    selected = [
+        (key, tags)
+        for key, tags in backend.iter_entries()
+        if filter is None or filter.matches(tags)
+    ]
+    index = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "created_at": time.time(),
+        "entries": [
+            {
+                "key": key,
+                "key_type": tags.key_type,
+                "model": tags.model,
+                "run_id": tags.run_id,
+            }
+            for key, tags in selected
+        ],
+    }
+
+    num_entries = 0
+    written_blobs: set[str] = set()
+    total_bytes = 0
+    with _open_tar(destination, "w|") as archive:
+        _add_member(archive, INDEX_NAME, json.dumps(index).encode())
+        for chunk in _chunked([key for key, _ in selected], _BATCH_SIZE):
+            payloads = backend.get_many(chunk)
+            refs = {
+                ref
+                for payload in payloads.values()
+                for ref in payload_refs(payload)
+                if ref not in written_blobs
+            }
+            for ref, blob in backend.get_blobs(sorted(refs)).items():
+                _add_member(archive, f"{_BLOB_PREFIX}{ref}", blob)
+                written_blobs.add(ref)
+                total_bytes += len(blob)
+            for key in chunk:
+                payload = payloads.get(key)
+                if payload is None:
+                    # Evicted between listing and reading.
+                    continue
+                _add_member(archive, f"{_ENTRY_PREFIX}{key}", payload)
+                num_entries += 1
+                total_bytes += len(payload)
+    return BundleSummary(
+        num_entries=num_entries,
+        num_blobs=len(written_blobs),
+        total_bytes=total_bytes,
+    )
+
+
+def read_bundle(
+    backend: CacheBackend,
+    source: str | Path | IO[bytes],
+    *,
+    overwrite: bool = False,
+) -> BundleSummary:
+    """Merge a bundle into ``backend``.
+
+    Entries whose key already exists are kept unless ``overwrite`` is set.
+    Blobs are content-addressed, so existing ones are never duplicated.
+    """
+    existing = set() if overwrite else set(backend.iter_keys())
+    tags: dict[str, EntryTags] = {}
+    items: dict[str, bytes] = {}
+    blobs: dict[str, bytes] = {}
+    num_entries = 0
+    num_blobs = 0
+    skipped = 0
+    total_bytes = 0
+
+    def flush() -> None:
+        if items:
+            backend.put_many(items, tags, blobs=blobs)
+            items.clear()
+            blobs.clear()
+
+    try:
+        archive = _open_tar(source, "r|*")
+    except tarfile.TarError as e:
+        raise ValueError(f"Not a cache bundle: {e}") from e
+    with archive:
+        members = _iter_members(archive)
+        first = next(members, None)
+        if first is None or first[0] != INDEX_NAME:
+            raise ValueError(f"Not a cache bundle: {INDEX_NAME} must come first")
+        index = json.loads(first[1])
+        _check_index(index)
+        for entry in index["entries"]:
+            tags[entry["key"]] = EntryTags(
+                key_type=entry.get("key_type"),
+                model=entry.get("model"),
+                run_id=entry.get("run_id"),
+            )
+
+        for name, data in members:
+            if name.startswith(_BLOB_PREFIX):
+                blobs[name.removeprefix(_BLOB_PREFIX)] = data
+                num_blobs += 1
+                total_bytes += len(data)
+            elif name.startswith(_ENTRY_PREFIX):
+                key = name.removeprefix(_ENTRY_PREFIX)
+                if key in existing:
+                    skipped += 1
+                    continue
+                items[key] = data
+                num_entries += 1
+                total_bytes += len(data)
+                if len(items) >= _BATCH_SIZE:
+                    flush()
+        flush()
+
+    return BundleSummary(
+        num_entries=num_entries,
+        num_blobs=num_blobs,
+        total_bytes=total_bytes,
+        skipped_entries=skipped,
+    )
+
+
+def _check_index(index: Any) -> None:
+    if not isinstance(index, dict) or index.get("format") != BUNDLE_FORMAT:
+        raise ValueError("Not a cache bundle: unrecognized index")
+    version = index.get("version")
+    if not isinstance(version, int) or version > BUNDLE_VERSION:
+        raise ValueError(
+            f"Cache bundle version {version!r} is newer than the supported "
+            f"v{BUNDLE_VERSION}; upgrade pydantic-ai-gepa to import it."
+        )
+
+
+def _open_tar(target: str | Path | IO[bytes], mode: str) -> tarfile.TarFile:
+    if isinstance(target, (str, Path)):
+        return tarfile.open(Path(target), mode)
+    return tarfile.open(fileobj=target, mode=mode)
+
+
+def _add_member(archive: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    archive.addfile(info, io.BytesIO(data))
+
+
+def _iter_members(archive: tarfile.TarFile) -> Iterator[tuple[str, bytes]]:
+    for member in archive:
+        if not member.isfile():
+            continue
+        handle = archive.extractfile(member)
+        if handle is None:
+            continue
+        yield member.name, handle.read()
+
+
+__all__ = [
+    "BUNDLE_FORMAT",
+    "BUNDLE_VERSION",
+    "BundleFilter",
+    "BundleSummary",
+    "read_bundle",
+    "write_bundle",
+]
@@ -0,0 +1,281 @@
+"""Payload encoding for cache entries.
+
+Entries are cloudpickled, compressed and framed with a small header::
+
+    magic (4) | format version (1) | codec (1) | ref count (4) | refs (32 each) | body
+
+Large strings, large byte strings and tool definitions are lifted out of the
+pickle into content-addressed blobs, referenced from the header by their
+SHA-256 digest. Trajectories for every case of a candidate repeat the same
+instructions, tool schemas and message-history prefixes, so those fragments
+are stored once no matter how many entries point at them.
+
+Payloads without the magic prefix are plain cloudpickle from earlier releases
+and still decode.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import pickle
+import struct
+import zlib
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Literal
+
+import cloudpickle
+from pydantic_ai.tools import ToolDefinition
+
+Compression = Literal["auto", "zstd", "zlib", "none"]
+
+MAGIC = b"\x00GPC"
+FORMAT_VERSION = 1
+# Strings and byte strings at least this long are stored as shared blobs.
+DEFAULT_BLOB_THRESHOLD = 1024
+
+_HEADER = struct.Struct(">4sBBI")
+HEADER_PREFIX_SIZE = _HEADER.size
+_DIGEST_SIZE = 32
+# Bodies shorter than this are stored uncompressed; framing would outweigh gains.
+_MIN_COMPRESS_SIZE = 128
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+_CODEC_NONE = 0
+_CODEC_ZLIB = 1
+_CODEC_ZSTD = 2
+_CODEC_NAMES = {_CODEC_NONE: "none", _CODEC_ZLIB: "zlib", _CODEC_ZSTD: "zstd"}
+
+
+@functools.cache
+def _zstd() -> ModuleType | None:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return zstandard
+
+
+def zstd_available() -> bool:
+    """Whether the optional ``zstandard`` package is installed."""
+    return _zstd() is not None
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedPayload:
+    """An encoded entry together with the blobs it references."""
+
+    payload: bytes
+    blobs: dict[str, bytes]
+
+    @property
+    def size(self) -> int:
+        return len(self.payload) + sum(len(blob) for blob in self.blobs.values())
+
+
+class PayloadCodec:
+    """Encode cache values into framed, compressed, deduplicated payloads."""
+
+    def __init__(
+        self,
+        compression: Compression = "auto",
+        blob_threshold: int = DEFAULT_BLOB_THRESHOLD,
+    ) -> None:
+        if compression == "auto":
+            codec = _CODEC_ZSTD if zstd_available() else _CODEC_ZLIB
+        elif compression == "zstd":
+            if not zstd_available():
+                raise ValueError(
+                    "compression='zstd' requires the 'zstandard' package; "
+                    "install it or use compression='zlib'."
+                )
+            codec = _CODEC_ZSTD
+        elif compression == "zlib":
+            codec = _CODEC_ZLIB
+        elif compression == "none":
+            codec = _CODEC_NONE
+        else:
+            raise ValueError(
+                f"Unknown compression {compression!r}; "
+                "expected 'auto', 'zstd', 'zlib' or 'none'."
+            )
+        self._codec = codec
+        self.blob_threshold = blob_threshold
+
+    @property
+    def compression(self) -> str:
+        return _CODEC_NAMES[self._codec]
+
+    def encode(self, value: Any) -> EncodedPayload:
+        """Pickle ``value``, moving large shared fragments into blobs."""
+        buffer = io.BytesIO()
+        pickler = _BlobPickler(buffer, self)
+        pickler.dump(value)
+        refs = list(pickler.blobs)
+        return EncodedPayload(
+            payload=self._frame(buffer.getvalue(), refs),
+            blobs=pickler.blobs,
+        )
+
+    def encode_blob(self, data: bytes) -> bytes:
+        return self._frame(data, [])
+
+    def decode(
+        self,
+        payload: bytes,
+        load_blobs: Callable[[Sequence[str]], Mapping[str, bytes]],
+    ) -> Any:
+        """Decode ``payload``, fetching referenced blobs through ``load_blobs``."""
+        if not payload.startswith(MAGIC):
+            return cloudpickle.loads(payload)
+        refs, body = _unframe(payload)
+        resolved: list[Any] = []
+        if refs:
+            blobs = load_blobs(refs)
+            for ref in refs:
+                blob = blobs.get(ref)
+                if blob is None:
+                    raise KeyError(f"Cache blob {ref} is missing")
+                resolved.append(pickle.loads(_unframe(blob)[1]))
+        return _BlobUnpickler(io.BytesIO(body), resolved).load()
+
+    def _frame(self, body: bytes, refs: Sequence[str]) -> bytes:
+        codec = self._codec
+        if len(body) < _MIN_COMPRESS_SIZE:
+            codec = _CODEC_NONE
+        compressed = _compress(codec, body)
+        if len(compressed) >= len(body):
+            codec, compressed = _CODEC_NONE, body
+        return b"".join(
+            [
+                _HEADER.pack(MAGIC, FORMAT_VERSION, codec, len(refs)),
+                *(bytes.fromhex(ref) for ref in refs),
+                compressed,
+            ]
+        )
+
+
+class _BlobPickler(cloudpickle.Pickler):
+    """Cloudpickler that replaces large shared fragments with blob references.
+
+    Each reference is pickled as its index into the payload header's digest
+    list, which keeps the body free of incompressible hashes.
+    """
+
+    def __init__(self, file: io.BytesIO, codec: PayloadCodec) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._codec = codec
+        self._threshold = codec.blob_threshold
+        self._seen: dict[int, int] = {}
+        self._indexes: dict[str, int] = {}
+        self.blobs: dict[str, bytes] = {}
+
+    def persistent_id(self, obj: Any) -> int | None:
+        obj_type = type(obj)
+        if obj_type is str or obj_type is bytes:
+            if len(obj) < self._threshold:
+                return None
+        elif obj_type is not ToolDefinition:
+            return None
+        seen = self._seen.get(id(obj))
+        if seen is not None:
+            return seen
+        if obj_type is ToolDefinition:
+            data = cloudpickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        ref = hashlib.sha256(data).hexdigest()
+        index = self._indexes.get(ref)
+        if index is None:
+            index = self._indexes[ref] = len(self.blobs)
+            self.blobs[ref] = self._codec.encode_blob(data)
+        self._seen[id(obj)] = index
+        return index
+
+
+class _BlobUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, resolved: Sequence[Any]) -> None:
+        super().__init__(file)
+        self._resolved = resolved
+
+    def persistent_load(self, pid: Any) -> Any:
+        if type(pid) is int and 0 <= pid < len(self._resolved):
+            return self._resolved[pid]
+        raise pickle.UnpicklingError(f"Unsupported persistent id {pid!r}")
+
+
+def payload_refs(payload: bytes) -> list[str]:
+    """Return the blob digests referenced by ``payload`` (empty for legacy data)."""
+    if not payload.startswith(MAGIC) or len(payload) < _HEADER.size:
+        return []
+    _, _, _, num_refs = _HEADER.unpack_from(payload)
+    start = _HEADER.size
+    return [
+        payload[offset : offset + _DIGEST_SIZE].hex()
+        for offset in range(start, start + num_refs * _DIGEST_SIZE, _DIGEST_SIZE)
+    ]
+
+
+def header_size(prefix: bytes) -> int:
+    """Length of the header and references of a payload starting with ``prefix``.
+
+    ``prefix`` needs to hold at least :data:`HEADER_PREFIX_SIZE` bytes; legacy
+    payloads have no header and report ``0``.
+    """
+    if not prefix.startswith(MAGIC) or len(prefix) < _HEADER.size:
+        return 0
+    _, _, _, num_refs = _HEADER.unpack_from(prefix)
+    return _HEADER.size + num_refs * _DIGEST_SIZE
+
+
+def _unframe(payload: bytes) -> tuple[list[str], bytes]:
+    _, version, codec, num_refs = _HEADER.unpack_from(payload)
+    if version > FORMAT_VERSION:
+        raise ValueError(
+            f"Cache payload format v{version} is newer than the supported "
+            f"v{FORMAT_VERSION}; upgrade pydantic-ai-gepa to read it."
+        )
+    body_start = _HEADER.size + num_refs * _DIGEST_SIZE
+    return payload_refs(payload), _decompress(codec, payload[body_start:])
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == _CODEC_ZLIB:
+        return zlib.compress(data, _ZLIB_LEVEL)
+    if codec == _CODEC_ZSTD:
+        zstandard = _zstd()
+        assert zstandard is not None
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return data
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == _CODEC_NONE:
+        return data
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == _CODEC_ZSTD:
+        zstandard = _zstd()
+        if zstandard is None:
+            raise ValueError(
+                "Cache entry is zstd-compressed but 'zstandard' is not installed."
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown cache payload codec {codec}")
+
+
+__all__ = [
+    "Compression",
+    "DEFAULT_BLOB_THRESHOLD",
+    "EncodedPayload",
+    "FORMAT_VERSION",
+    "HEADER_PREFIX_SIZE",
+    "PayloadCodec",
+    "header_size",
+    "payload_refs",
+    "zstd_available",
+]
@@ -0,0 +1,1433 @@
+"""Internal caching system for GEPA optimization to support resumable runs."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, is_dataclass
+from pathlib import Path
+from collections.abc import Awaitable, Mapping, Sequence
+from datetime import timedelta
+from typing import IO, Any, Callable, TypeVar
+
+import logfire
+
+from pydantic_evals import Case
+
+from ..gepa_graph.models import CandidateMap, candidate_texts
+from ..types import (
+    MetadataWithMessageHistory,
+    MetricResult,
+    RolloutOutput,
+    Trajectory,
+)
+from .backends import (
+    BackendName,
+    CacheBackend,
+    EntryTags,
+    EvictionResult,
+    UsageRow,
+    create_backend,
+)
+from .bundle import BundleFilter, BundleSummary, read_bundle, write_bundle
+from .codec import Compression, EncodedPayload, PayloadCodec
+from .memory import MemoryTier
+from .metrics import CacheMetrics, CacheMetricsSnapshot
+
+CaseInputT = TypeVar("CaseInputT")
+CaseOutputT = TypeVar("CaseOutputT")
+CaseMetadataT = TypeVar("CaseMetadataT")
+
+_CANDIDATE_SEGMENT_CACHE_SIZE = 1024
+_TRAJECTORY_SUFFIX = "_trajectory"
+# Minimum spacing between automatic limit checks, in seconds.
+_EVICTION_CHECK_INTERVAL = 5.0
+# Automatic eviction trims to this fraction of a size limit.
+_EVICTION_LOW_WATER = 0.9
+
+
+@dataclass(slots=True, eq=False)
+class _PendingEntry:
+    """A queued write-behind entry and the tags it will be stored with."""
+
+    value: Any
+    tags: EntryTags
+
+
+@dataclass(slots=True)
+class _CaseFingerprint:
+    """Serialized key segments for one case, plus hash states keyed by prefix."""
+
+    case_ref: weakref.ref[Case[Any, Any, Any]]
+    segment: str
+    prefix_hashes: dict[tuple[str, str | None, str], Any] = field(default_factory=dict)
+
+
+class CacheManager:
+    """Manages caching of metric evaluation results for GEPA optimization.
+
+    This cache allows optimization runs to be resumed without re-running
+    expensive LLM calls that have already been completed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        enabled: bool = True,
+        verbose: bool = False,
+        model_identifier: str | None = None,
+        backend: CacheBackend | BackendName = "sqlite",
+        io_workers: int = 4,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        ttl: float | timedelta | None = None,
+        memory_max_entries: int = 4096,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        compression: Compression = "auto",
+    ):
+        """Initialize the cache manager.
+
+        Args:
+            cache_dir: Directory to store cache files. If None, uses '.gepa_cache'
+                      in the current working directory.
+            enabled: Whether caching is enabled.
+            verbose: Whether to log cache hits and misses.
+            model_identifier: Optional string that scopes cache entries to a specific
+                model (e.g., ``openai:gpt-4o``). When provided, cache keys include
+                this identifier so different models never share cached artifacts.
+            backend: Storage backend for cache entries. ``"sqlite"`` (default) keeps
+                every entry in a single WAL-mode database inside ``cache_dir`` and
+                still reads entries written by the legacy layout; ``"pickle"``
+                writes one ``<key>.pkl`` file per entry. A custom
+                :class:`CacheBackend` instance may also be supplied.
+            io_workers: Size of the thread pool used by the async API for backend
+                reads, unpickling, and write-behind flushes.
+            max_bytes: Optional cap on the total payload size. When exceeded, the
+                least recently used entries are evicted.
+            max_entries: Optional cap on the number of entries, enforced the same way.
+            ttl: Optional idle lifetime (seconds or ``timedelta``). Entries not read
+                or written for longer than this are evicted.
+            memory_max_entries: Entry bound for the in-process LRU tier that
+                keeps recently used entries deserialized in front of the
+                backend. ``0`` disables the tier.
+            memory_max_bytes: Approximate byte bound for the in-process tier,
+                measured by stored payload size.
+            compression: Codec for new entries. ``"auto"`` (default) uses zstd
+                when the optional ``zstandard`` package is installed and zlib
+                otherwise. Entries written with any codec remain readable, and
+                large instructions, tool definitions and message contents are
+                stored once as shared blobs regardless of this setting.
+        """
+        self.enabled = enabled
+        self.verbose = verbose
+        self.model_identifier = model_identifier
+        self.run_id: str | None = None
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+        self._last_eviction_check = 0.0
+
+        if cache_dir is None:
+            cache_dir = Path.cwd() / ".gepa_cache"
+
+        self.cache_dir = Path(cache_dir)
+        self.backend: CacheBackend | None = None
+        self.io_workers = io_workers
+        self._executor: ThreadPoolExecutor | None = None
+        # Write-behind queue: entries stay here (and are served from here)
+        # until a flush hands them to the backend in a single put_many.
+        self._pending: dict[str, _PendingEntry] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+        # Single-flight registry: cache key -> future shared by concurrent callers.
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._memory = MemoryTier(memory_max_entries, memory_max_bytes)
+        self._codec = PayloadCodec(compression)
+        self.metrics = CacheMetrics()
+        self._case_fingerprints: dict[int, _CaseFingerprint] = {}
+        self._candidate_segments: OrderedDict[tuple[tuple[str, str], ...], str] = (
+            OrderedDict()
+        )
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.backend = create_backend(backend, self.cache_dir)
+            if self.verbose:
+                logfire.info(
+                    "Cache enabled",
+                    cache_dir=str(self.cache_dir),
+                    backend=self.backend.name,
+                )
+            self._maybe_evict()
+
+    def _peek(self, cache_keys: Sequence[str]) -> tuple[str, Any] | None:
+        """Return the first of ``cache_keys`` held in process, without I/O.
+
+        Queued write-behind entries and the in-memory LRU tier both count as
+        memory hits.
+        """
+        with self._pending_lock:
+            for cache_key in cache_keys:
+                pending = self._pending.get(cache_key)
+                if pending is not None:
+                    self.metrics.record_tier("memory", hit=True)
+                    return cache_key, _detach(pending.value)
+        for cache_key in cache_keys:
+            value = self._memory.get(cache_key)
+            if value is not None:
+                self.metrics.record_tier("memory", hit=True)
+                return cache_key, _detach(value)
+        self.metrics.record_tier("memory", hit=False)
+        return None
+
+    def _load_from_backend(
+        self, cache_keys: Sequence[str], description: str
+    ) -> tuple[str, Any] | None:
+        """Load the first of ``cache_keys`` present in the backend, in one read."""
+        assert self.backend is not None
+        started = time.perf_counter()
+        bytes_read = 0
+        try:
+            try:
+                payloads = self.backend.get_many(cache_keys)
+            except Exception as e:
+                logfire.warn(
+                    f"Failed to load {description} cache entry",
+                    cache_key=cache_keys[0],
+                    exception=e,
+                )
+                return None
+            bytes_read = sum(len(payload) for payload in payloads.values())
+            for cache_key in cache_keys:
+                payload = payloads.get(cache_key)
+                if payload is None:
+                    continue
+                blob_sizes: list[int] = []
+
+                def load_blobs(refs: Sequence[str]) -> Mapping[str, bytes]:
+                    assert self.backend is not None
+                    blobs = self.backend.get_blobs(refs)
+                    blob_sizes.extend(len(blob) for blob in blobs.values())
+                    return blobs
+
+                try:
+                    value = self._codec.decode(payload, load_blobs)
+                except Exception as e:
+                    logfire.warn(
+                        f"Failed to load {description} cache entry",
+                        cache_key=cache_key,
+                        exception=e,
+                    )
+                    continue
+                finally:
+                    bytes_read += sum(blob_sizes)
+                self.metrics.record_tier("backend", hit=True)
+                self._memory.put(cache_key, value, len(payload) + sum(blob_sizes))
+                return cache_key, _detach(value)
+            self.metrics.record_tier("backend", hit=False)
+            return None
+        finally:
+            self.metrics.record_load(bytes_read, time.perf_counter() - started)
+
+    def _load_first(
+        self, cache_keys: Sequence[str], description: str
+    ) -> tuple[str, Any] | None:
+        """Load the first of ``cache_keys`` that is present in any tier."""
+        found = self._peek(cache_keys)
+        if found is not None:
+            return found
+        return self._load_from_backend(cache_keys, description)
+
+    async def _aload_first(
+        self, cache_keys: Sequence[str], description: str
+    ) -> tuple[str, Any] | None:
+        """Async :meth:`_load_first`; only backend reads leave the event loop."""
+        found = self._peek(cache_keys)
+        if found is not None:
+            return found
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), self._load_from_backend, cache_keys, description
+        )
+
+    def _load(self, cache_key: str, description: str) -> Any | None:
+        """Load and unpickle the entry stored under ``cache_key``."""
+        found = self._load_first([cache_key], description)
+        return found[1] if found is not None else None
+
+    async def _aload(self, cache_key: str, description: str) -> Any | None:
+        found = await self._aload_first([cache_key], description)
+        return found[1] if found is not None else None
+
+    def _store(self, entries: Mapping[str, tuple[Any, EntryTags]]) -> None:
+        """Encode each value and write all ``entries`` in one backend call."""
+        assert self.backend is not None
+        started = time.perf_counter()
+        encoded = {
+            cache_key: self._codec.encode(value)
+            for cache_key, (value, _) in entries.items()
+        }
+        self._put_encoded(
+            encoded, {cache_key: tags for cache_key, (_, tags) in entries.items()}
+        )
+        self.metrics.record_store(
+            sum(entry.size for entry in encoded.values()),
+            time.perf_counter() - started,
+        )
+        with self._pending_lock:
+            for cache_key in entries:
+                self._pending.pop(cache_key, None)
+        for cache_key, (value, _) in entries.items():
+            # Snapshot so later caller mutations do not reach the memory tier.
+            self._memory.put(cache_key, _detach(value), encoded[cache_key].size)
+        self._maybe_evict()
+
+    def _put_encoded(
+        self, encoded: Mapping[str, EncodedPayload], tags: Mapping[str, EntryTags]
+    ) -> None:
+        assert self.backend is not None
+        blobs: dict[str, bytes] = {}
+        for entry in encoded.values():
+            blobs.update(entry.blobs)
+        self.backend.put_many(
+            {cache_key: entry.payload for cache_key, entry in encoded.items()},
+            tags,
+            blobs=blobs,
+        )
+
+    def _tags(self, key_type: str, model_identifier: str | None) -> EntryTags:
+        return EntryTags(
+            key_type=key_type,
+            model=model_identifier or self.model_identifier,
+            run_id=self.run_id,
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.io_workers,
+                thread_name_prefix="gepa-cache-io",
+            )
+        return self._executor
+
+    def _enqueue(self, cache_key: str, value: Any, tags: EntryTags) -> None:
+        with self._pending_lock:
+            self._pending[cache_key] = _PendingEntry(value, tags)
+        if self._active_flush_task() is None:
+            self._schedule_flush()
+
+    def _active_flush_task(self) -> asyncio.Task[None] | None:
+        """Return the in-flight flush task if it belongs to the running loop."""
+        task = self._flush_task
+        if task is None or task.done():
+            return None
+        try:
+            if task.get_loop() is not asyncio.get_running_loop():
+                return None
+        except RuntimeError:
+            return None
+        return task
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_task = loop.create_task(self._flush_pending())
+
+    async def _flush_pending(self) -> None:
+        """Drain the write-behind queue in batches.
+
+        Entries queued while a batch is being written are picked up by the
+        next iteration, so bursts of puts coalesce into a few transactions.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._pending_lock:
+                batch = dict(self._pending)
+            if not batch:
+                return
+            await loop.run_in_executor(self._get_executor(), self._write_batch, batch)
+
+    def _write_batch(self, batch: dict[str, _PendingEntry]) -> None:
+        assert self.backend is not None
+        started = time.perf_counter()
+        encoded: dict[str, EncodedPayload] = {}
+        for cache_key, entry in batch.items():
+            try:
+                encoded[cache_key] = self._codec.encode(entry.value)
+            except Exception as e:
+                logfire.warn(
+                    "Failed to serialize cache entry", cache_key=cache_key, exception=e
+                )
+        try:
+            self._put_encoded(
+                encoded,
+                {cache_key: entry.tags for cache_key, entry in batch.items()},
+            )
+        except Exception as e:
+            logfire.warn(
+                "Failed to write cache entries", num_entries=len(batch), exception=e
+            )
+        else:
+            self.metrics.record_store(
+                sum(entry.size for entry in encoded.values()),
+                time.perf_counter() - started,
+            )
+        for cache_key, payload in encoded.items():
+            self._memory.put(cache_key, batch[cache_key].value, payload.size)
+        with self._pending_lock:
+            for cache_key, entry in batch.items():
+                # Keep entries that were overwritten while this batch was in flight.
+                if self._pending.get(cache_key) is entry:
+                    del self._pending[cache_key]
+        self._maybe_evict()
+
+    @property
+    def _has_limits(self) -> bool:
+        return (
+            self.max_bytes is not None
+            or self.max_entries is not None
+            or self.ttl is not None
+        )
+
+    def _maybe_evict(self) -> None:
+        """Incrementally enforce the configured limits.
+
+        Runs at most every few seconds. Once a size limit is exceeded, entries
+        are evicted down to a low-water mark below it, so a full cache is not
+        trimmed again on every subsequent write.
+        """
+        if not self._has_limits:
+            return
+        now = time.monotonic()
+        if now - self._last_eviction_check < _EVICTION_CHECK_INTERVAL:
+            return
+        self._last_eviction_check = now
+        assert self.backend is not None
+        try:
+            stats = self.backend.stats()
+            over_bytes = (
+                self.max_bytes is not None and stats.total_bytes > self.max_bytes
+            )
+            over_entries = (
+                self.max_entries is not None and stats.num_entries > self.max_entries
+            )
+            if not (over_bytes or over_entries or self.ttl is not None):
+                return
+            result = self.backend.evict(
+                max_bytes=_low_water(self.max_bytes) if over_bytes else None,
+                max_entries=_low_water(self.max_entries) if over_entries else None,
+                ttl=self.ttl,
+            )
+        except Exception as e:
+            logfire.warn("Failed to evict cache entries", exception=e)
+            return
+        if result.num_entries and self.verbose:
+            logfire.info(
+                "Evicted cache entries",
+                num_entries=result.num_entries,
+                total_bytes=result.total_bytes,
+            )
+
+    def prune_cache(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        ttl: float | timedelta | None = None,
+        dry_run: bool = False,
+    ) -> EvictionResult:
+        """Evict cold entries now.
+
+        Limits default to the ones configured on the manager. Entries idle for
+        longer than ``ttl`` are removed first, then the least recently used
+        entries until the cache fits ``max_bytes`` and ``max_entries``.
+        """
+        if not self.enabled:
+            return EvictionResult(num_entries=0, total_bytes=0, dry_run=dry_run)
+        assert self.backend is not None
+        self.flush()
+        ttl_seconds = ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+        return self.backend.evict(
+            max_bytes=max_bytes if max_bytes is not None else self.max_bytes,
+            max_entries=max_entries if max_entries is not None else self.max_entries,
+            ttl=ttl_seconds if ttl_seconds is not None else self.ttl,
+            dry_run=dry_run,
+        )
+
+    def get_cache_usage(self) -> list[UsageRow]:
+        """Return entry counts and sizes grouped by run, model and key type."""
+        if not self.enabled:
+            return []
+        assert self.backend is not None
+        self.flush()
+        return self.backend.usage()
+
+    def export_bundle(
+        self,
+        path: str | Path | IO[bytes],
+        filter: BundleFilter | None = None,
+    ) -> BundleSummary:
+        """Write entries matching ``filter`` to a portable bundle.
+
+        ``path`` may be a file path or a writable binary stream; the bundle is
+        written sequentially, so pipes work. Use :meth:`import_bundle` on the
+        receiving side.
+        """
+        if not self.enabled:
+            return BundleSummary(num_entries=0, num_blobs=0, total_bytes=0)
+        assert self.backend is not None
+        self.flush()
+        return write_bundle(self.backend, path, filter)
+
+    def import_bundle(
+        self, path: str | Path | IO[bytes], *, overwrite: bool = False
+    ) -> BundleSummary:
+        """Merge a bundle written by :meth:`export_bundle` into this cache.
+
+        Entries keep their original keys. Keys already present are left alone
+        unless ``overwrite`` is set.
+        """
+        if not self.enabled:
+            return BundleSummary(num_entries=0, num_blobs=0, total_bytes=0)
+        assert self.backend is not None
+        self.flush()
+        summary = read_bundle(self.backend, path, overwrite=overwrite)
+        if overwrite:
+            self._memory.clear()
+        self._maybe_evict()
+        return summary
+
+    async def _single_flight(
+        self,
+        cache_key: str,
+        lookup: Callable[[], Awaitable[Any | None]],
+        compute: Callable[[], Awaitable[Any]],
+        store: Callable[[Any], Awaitable[None]],
+    ) -> Any:
+        """Resolve ``cache_key`` once for all concurrent callers.
+
+        The first caller becomes the leader: it checks the cache and, on a
+        miss, runs ``compute`` and stores the result. Callers arriving while
+        the leader is in flight await the same future instead of repeating
+        the work. If the leader is cancelled, a waiter takes over.
+        """
+        while True:
+            inflight = self._inflight.get(cache_key)
+            if inflight is None:
+                break
+            self.metrics.record_coalesced()
+            try:
+                return _detach(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leader was cancelled; retry and possibly lead ourselves.
+                continue
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            value = await lookup()
+            if value is None:
+                value = await compute()
+                await store(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so unawaited failures are not logged by asyncio.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    @staticmethod
+    def _serialize_for_key(obj: Any) -> str:
+        """Convert an object to a stable string representation for cache key generation.
+
+        This handles various types including dataclasses, dicts, lists, and primitives.
+        """
+        if obj is None:
+            return "None"
+        elif isinstance(obj, (str, int, float, bool)):
+            return str(obj)
+        elif isinstance(obj, (list, tuple)):
+            return (
+                f"[{','.join(CacheManager._serialize_for_key(item) for item in obj)}]"
+            )
+        elif isinstance(obj, dict):
+            # Sort dict keys for stable serialization
+            sorted_items = sorted(obj.items())
+            return f"{{{','.join(f'{CacheManager._serialize_for_key(k)}:{CacheManager._serialize_for_key(v)}' for k, v in sorted_items)}}}"
+        # Special handling for pydantic-ai message parts to exclude timestamp
+        elif type(obj).__name__ in [
+            "UserPromptPart",
+            "SystemPromptPart",
+            "ToolResponsePart",
+            "ModelRequestPart",
+            "ModelResponsePart",
+            "RetryPromptPart",
+            "ToolReturnPart",
+            "TextPart",
+        ]:
+            # For message parts, exclude timestamp field for stable cache keys
+            obj_dict = obj.__dict__.copy() if hasattr(obj, "__dict__") else {}
+            obj_dict.pop("timestamp", None)  # Remove timestamp if present
+            return CacheManager._serialize_for_key(obj_dict)
+        elif is_dataclass(obj):
+            # Convert dataclass to dict and serialize
+            # Handle dataclass instances
+            if not isinstance(obj, type):
+                from dataclasses import asdict
+
+                return CacheManager._serialize_for_key(asdict(obj))
+            else:
+                # If it's a dataclass type (not instance), use its name
+                return f"DataclassType:{obj.__name__}"
+        elif hasattr(obj, "__dict__"):
+            # For other objects, try to use their __dict__
+            return CacheManager._serialize_for_key(obj.__dict__)
+        else:
+            # Fallback to string representation
+            return str(obj)
+
+    @staticmethod
+    def _extract_message_history(case: Case[Any, Any, Any]) -> list[Any] | None:
+        metadata = case.metadata
+        if isinstance(metadata, MetadataWithMessageHistory):
+            return metadata.message_history
+        return None
+
+    @staticmethod
+    def _case_label(case: Case[Any, Any, Any], case_index: int | None) -> str:
+        if case.name:
+            return case.name
+        if case_index is not None:
+            return f"case-{case_index}"
+        return "case-unknown"
+
+    def _case_fingerprint(self, case: Case[Any, Any, Any]) -> _CaseFingerprint:
+        """Return the memoized key segments for ``case``.
+
+        Cases are treated as immutable for the lifetime of the manager, so the
+        serialized inputs/metadata/history are computed once per case object.
+        Entries are keyed by identity and dropped when the case is collected.
+        """
+        case_id = id(case)
+        fingerprint = self._case_fingerprints.get(case_id)
+        if fingerprint is not None and fingerprint.case_ref() is case:
+            return fingerprint
+
+        segments = [
+            f"inputs:{self._serialize_for_key(case.inputs)}",
+            f"metadata:{self._serialize_for_key(case.metadata)}",
+        ]
+        message_history = self._extract_message_history(case)
+        if message_history:
+            segments.append(f"history:{self._serialize_for_key(message_history)}")
+
+        fingerprints = self._case_fingerprints
+
+        def _forget(_: weakref.ref[Any], case_id: int = case_id) -> None:
+            fingerprints.pop(case_id, None)
+
+        fingerprint = _CaseFingerprint(
+            case_ref=weakref.ref(case, _forget),
+            segment="|".join(segments),
+        )
+        fingerprints[case_id] = fingerprint
+        return fingerprint
+
+    def _candidate_segment(self, candidate: dict[str, str]) -> str:
+        """Return the memoized ``candidate:`` key segment for ``candidate``.
+
+        Lookups hash the component texts, which Python caches per string, so
+        repeated keys for the same candidate skip re-serialization entirely.
+        """
+        sorted_candidate = tuple(sorted(candidate.items()))
+        segment = self._candidate_segments.get(sorted_candidate)
+        if segment is not None:
+            self._candidate_segments.move_to_end(sorted_candidate)
+            return segment
+
+        segment = f"candidate:{self._serialize_for_key(sorted_candidate)}"
+        self._candidate_segments[sorted_candidate] = segment
+        if len(self._candidate_segments) > _CANDIDATE_SEGMENT_CACHE_SIZE:
+            self._candidate_segments.popitem(last=False)
+        return segment
+
+    def _generate_cache_key(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any] | None,
+        candidate: dict[str, str],
+        key_type: str = "metric",
+        model_identifier: str | None = None,
+    ) -> str:
+        """Generate a unique cache key.
+
+        The key is based on:
+        - The key type ("metric" or "agent_run")
+        - The case inputs/metadata/name (prompt or structured signature)
+        - The output from the agent run (if provided, for metric caching)
+        - The candidate prompts being evaluated
+
+        The case and candidate segments are memoized, and the SHA-256 state
+        after the case prefix is reused across keys, so only the per-call
+        output segment is hashed from scratch.
+        """
+        resolved_model_identifier = model_identifier or self.model_identifier
+        case_name = self._case_label(case, case_index)
+        fingerprint = self._case_fingerprint(case)
+
+        prefix_id = (key_type, resolved_model_identifier, case_name)
+        prefix_hash = fingerprint.prefix_hashes.get(prefix_id)
+        if prefix_hash is None:
+            key_parts = [f"type:{key_type}"]
+            if resolved_model_identifier:
+                key_parts.append(
+                    f"model:{self._serialize_for_key(resolved_model_identifier)}"
+                )
+            key_parts.append(f"case_name:{case_name}")
+            key_parts.append(fingerprint.segment)
+            prefix_hash = hashlib.sha256("|".join(key_parts).encode("utf-8"))
+            fingerprint.prefix_hashes[prefix_id] = prefix_hash
+
+        suffix_parts = [""]
+
+        # Add output information (only for metric caching)
+        if output is not None:
+            suffix_parts.append(f"result:{self._serialize_for_key(output.result)}")
+            suffix_parts.append(f"success:{output.success}")
+            suffix_parts.append(f"error:{output.error_message or 'None'}")
+
+        suffix_parts.append(self._candidate_segment(candidate))
+
+        hash_obj = prefix_hash.copy()
+        hash_obj.update("|".join(suffix_parts).encode("utf-8"))
+        return hash_obj.hexdigest()
+
+    def set_model_identifier(self, model_identifier: str | None) -> None:
+        """Configure the default model identifier used for cache keys."""
+        self.model_identifier = model_identifier
+
+    def set_run_id(self, run_id: str | None) -> None:
+        """Tag entries written from now on with ``run_id`` for usage reports."""
+        self.run_id = run_id
+
+    def _metric_key(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any],
+        candidate: CandidateMap,
+        model_identifier: str | None,
+    ) -> str:
+        return self._generate_cache_key(
+            case,
+            case_index,
+            output,
+            candidate_texts(candidate),
+            "metric",
+            model_identifier=model_identifier,
+        )
+
+    def _agent_run_key(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        candidate: CandidateMap,
+        model_identifier: str | None,
+    ) -> str:
+        """Return the base key for an agent run.
+
+        The rollout output is stored under this key and the (trajectory,
+        output) pair under ``<key>_trajectory``, so untraced lookups never
+        deserialize message histories and traced runs serve both kinds of
+        request. Entries written before this layout used
+        ``<key>_traces_<bool>`` and are still read.
+        """
+        return self._generate_cache_key(
+            case,
+            case_index,
+            None,
+            candidate_texts(candidate),
+            "agent_run",
+            model_identifier=model_identifier,
+        )
+
+    @staticmethod
+    def _agent_run_lookup_keys(base_key: str, capture_traces: bool) -> list[str]:
+        if capture_traces:
+            return [
+                f"{base_key}{_TRAJECTORY_SUFFIX}",
+                _legacy_agent_run_key(base_key, True),
+            ]
+        return [
+            base_key,
+            _legacy_agent_run_key(base_key, False),
+            _legacy_agent_run_key(base_key, True),
+        ]
+
+    @staticmethod
+    def _resolve_agent_run(
+        base_key: str, capture_traces: bool, found: tuple[str, Any] | None
+    ) -> tuple[Trajectory | None, RolloutOutput[Any]] | None:
+        if found is None:
+            return None
+        cache_key, value = found
+        if cache_key == base_key:
+            return None, value
+        trajectory, output = value
+        # Traced entries serve untraced lookups by dropping the trajectory.
+        return (trajectory if capture_traces else None), output
+
+    def _load_agent_run(
+        self, base_key: str, capture_traces: bool
+    ) -> tuple[Trajectory | None, RolloutOutput[Any]] | None:
+        found = self._load_first(
+            self._agent_run_lookup_keys(base_key, capture_traces), "agent run"
+        )
+        return self._resolve_agent_run(base_key, capture_traces, found)
+
+    async def _aload_agent_run(
+        self, base_key: str, capture_traces: bool
+    ) -> tuple[Trajectory | None, RolloutOutput[Any]] | None:
+        found = await self._aload_first(
+            self._agent_run_lookup_keys(base_key, capture_traces), "agent run"
+        )
+        return self._resolve_agent_run(base_key, capture_traces, found)
+
+    def _agent_run_entries(
+        self,
+        base_key: str,
+        trajectory: Trajectory | None,
+        output: RolloutOutput[Any],
+        capture_traces: bool,
+        model_identifier: str | None,
+    ) -> dict[str, tuple[Any, EntryTags]]:
+        entries: dict[str, tuple[Any, EntryTags]] = {
+            base_key: (output, self._tags("agent_run", model_identifier))
+        }
+        if capture_traces:
+            entries[f"{base_key}{_TRAJECTORY_SUFFIX}"] = (
+                (trajectory, output),
+                self._tags("trajectory", model_identifier),
+            )
+        return entries
+
+    def _record_metric_lookup(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        cached_result: MetricResult | None,
+    ) -> None:
+        self.metrics.record_lookup("metric", hit=cached_result is not None)
+        if not self.verbose:
+            return
+        case_label = self._case_label(case, case_index)
+        if cached_result is not None:
+            logfire.info(
+                "Cache hit for metric",
+                case_label=case_label,
+                score=cached_result.score,
+            )
+        else:
+            logfire.debug("Cache miss for metric", case_label=case_label)
+
+    def _record_agent_run_lookup(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        cached_result: tuple[Trajectory | None, RolloutOutput[Any]] | None,
+        capture_traces: bool,
+    ) -> None:
+        self.metrics.record_lookup(
+            "trajectory" if capture_traces else "agent_run",
+            hit=cached_result is not None,
+        )
+        if not self.verbose:
+            return
+        case_label = self._case_label(case, case_index)
+        if cached_result is not None:
+            logfire.info("Cache hit for agent run", case_label=case_label)
+        else:
+            logfire.debug("Cache miss for agent run", case_label=case_label)
+
+    def get_cached_metric_result(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any],
+        candidate: CandidateMap,
+        model_identifier: str | None = None,
+    ) -> MetricResult | None:
+        """Get cached metric result if available.
+
+        Args:
+            case: The case being evaluated.
+            case_index: Optional stable index for logging/cache keys when the case has no name.
+            output: The output from the agent run.
+            candidate: The candidate prompts being evaluated.
+            model_identifier: Optional override for the model identifier to use when
+                computing the cache key. Defaults to the manager-level identifier.
+
+        Returns:
+            Cached (score, feedback) tuple if found, None otherwise.
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self._metric_key(
+            case, case_index, output, candidate, model_identifier
+        )
+        cached_result: MetricResult | None = self._load(cache_key, "metric")
+        self._record_metric_lookup(case, case_index, cached_result)
+        return cached_result
+
+    async def aget_cached_metric_result(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any],
+        candidate: CandidateMap,
+        model_identifier: str | None = None,
+    ) -> MetricResult | None:
+        """Async variant of :meth:`get_cached_metric_result`.
+
+        The backend read and unpickling run on the cache I/O thread pool so the
+        event loop stays free for other rollouts.
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self._metric_key(
+            case, case_index, output, candidate, model_identifier
+        )
+        cached_result: MetricResult | None = await self._aload(cache_key, "metric")
+        self._record_metric_lookup(case, case_index, cached_result)
+        return cached_result
+
+    def cache_metric_result(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any],
+        candidate: CandidateMap,
+        metric_result: MetricResult,
+        model_identifier: str | None = None,
+    ) -> None:
+        """Cache a metric evaluation result.
+
+        Args:
+            case: The case that was evaluated.
+            case_index: Optional index associated with the case.
+            output: The output from the agent run.
+            candidate: The candidate prompts that were evaluated.
+            metric_result: The computed metric result.
+        """
+        if not self.enabled:
+            return
+
+        cache_key = self._metric_key(
+            case, case_index, output, candidate, model_identifier
+        )
+
+        try:
+            self._store(
+                {cache_key: (metric_result, self._tags("metric", model_identifier))}
+            )
+
+            if self.verbose:
+                logfire.debug(
+                    "Cached metric result",
+                    case_label=self._case_label(case, case_index),
+                    score=metric_result.score,
+                )
+        except Exception as e:
+            logfire.warn("Failed to cache metric result", exception=e)
+
+    async def acache_metric_result(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any],
+        candidate: CandidateMap,
+        metric_result: MetricResult,
+        model_identifier: str | None = None,
+    ) -> None:
+        """Queue a metric result for a write-behind batch.
+
+        Returns without waiting for disk I/O. Queued entries are visible to
+        subsequent lookups immediately; call :meth:`aflush` to persist them.
+        """
+        if not self.enabled:
+            return
+
+        cache_key = self._metric_key(
+            case, case_index, output, candidate, model_identifier
+        )
+        self._enqueue(cache_key, metric_result, self._tags("metric", model_identifier))
+
+        if self.verbose:
+            logfire.debug(
+                "Queued metric result",
+                case_label=self._case_label(case, case_index),
+                score=metric_result.score,
+            )
+
+    def clear_cache(self) -> None:
+        """Clear all cached results, including writes that are still queued."""
+        if not self.enabled:
+            return
+
+        assert self.backend is not None
+        with self._pending_lock:
+            self._pending.clear()
+        self._memory.clear()
+        self.backend.clear()
+
+        if self.verbose:
+            logfire.info("Cache cleared", cache_dir=str(self.cache_dir))
+
+    def compact_cache(self) -> None:
+        """Compact the cache storage.
+
+        For the SQLite backend this imports any legacy ``.pkl`` entries into the
+        database, removes the files, and vacuums the database.
+        """
+        if not self.enabled:
+            return
+
+        assert self.backend is not None
+        self.flush()
+        self.backend.compact()
+
+        if self.verbose:
+            logfire.info("Cache compacted", cache_dir=str(self.cache_dir))
+
+    def flush(self) -> None:
+        """Synchronously write every queued entry to the backend."""
+        if not self.enabled:
+            return
+        with self._pending_lock:
+            batch = dict(self._pending)
+        if batch:
+            self._write_batch(batch)
+
+    async def aflush(self) -> None:
+        """Wait until every queued write has reached the backend."""
+        if not self.enabled:
+            return
+        while True:
+            task = self._active_flush_task()
+            if task is not None:
+                await asyncio.shield(task)
+                continue
+            with self._pending_lock:
+                has_pending = bool(self._pending)
+            if not has_pending:
+                return
+            self._schedule_flush()
+
+    def close(self) -> None:
+        """Flush queued writes and release the storage backend's handles."""
+        if self.backend is None:
+            return
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.backend.close()
+
+    def get_cached_agent_run(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        candidate: CandidateMap,
+        capture_traces: bool,
+        model_identifier: str | None = None,
+    ) -> tuple[Trajectory | None, RolloutOutput[Any]] | None:
+        """Get cached agent run result if available.
+
+        Args:
+            case: The case being evaluated.
+            case_index: Optional index associated with the case.
+            candidate: The candidate prompts being evaluated.
+            capture_traces: Whether traces were captured.
+
+        Returns:
+            Cached (trajectory, output) tuple if found, None otherwise.
+        """
+        if not self.enabled:
+            return None
+
+        base_key = self._agent_run_key(case, case_index, candidate, model_identifier)
+        cached_result = self._load_agent_run(base_key, capture_traces)
+        self._record_agent_run_lookup(case, case_index, cached_result, capture_traces)
+        return cached_result
+
+    async def aget_cached_agent_run(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        candidate: CandidateMap,
+        capture_traces: bool,
+        model_identifier: str | None = None,
+    ) -> tuple[Trajectory | None, RolloutOutput[Any]] | None:
+        """Async variant of :meth:`get_cached_agent_run`."""
+        if not self.enabled:
+            return None
+
+        base_key = self._agent_run_key(case, case_index, candidate, model_identifier)
+        cached_result = await self._aload_agent_run(base_key, capture_traces)
+        self._record_agent_run_lookup(case, case_index, cached_result, capture_traces)
+        return cached_result
+
+    def cache_agent_run(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        candidate: CandidateMap,
+        trajectory: Trajectory | None,
+        output: RolloutOutput[Any],
+        capture_traces: bool,
+        model_identifier: str | None = None,
+    ) -> None:
+        """Cache an agent run result.
+
+        Args:
+            case: The case that was evaluated.
+            case_index: Optional index associated with the case.
+            candidate: The candidate prompts that were evaluated.
+            trajectory: The execution trajectory (if captured).
+            output: The output from the agent run.
+            capture_traces: Whether traces were captured.
+        """
+        if not self.enabled:
+            return
+
+        base_key = self._agent_run_key(case, case_index, candidate, model_identifier)
+
+        try:
+            self._store(
+                self._agent_run_entries(
+                    base_key, trajectory, output, capture_traces, model_identifier
+                )
+            )
+
+            if self.verbose:
+                logfire.debug(
+                    "Cached agent run",
+                    case_label=self._case_label(case, case_index),
+                )
+        except Exception as e:
+            logfire.warn("Failed to cache agent run", exception=e)
+
+    async def acache_agent_run(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        candidate: CandidateMap,
+        trajectory: Trajectory | None,
+        output: RolloutOutput[Any],
+        capture_traces: bool,
+        model_identifier: str | None = None,
+    ) -> None:
+        """Queue an agent run for a write-behind batch.
+
+        The trajectory is shallow-copied so later attribute updates by the
+        caller (for example attaching metric feedback) do not leak into the
+        cached entry before it is pickled.
+        """
+        if not self.enabled:
+            return
+
+        base_key = self._agent_run_key(case, case_index, candidate, model_identifier)
+        entries = self._agent_run_entries(
+            base_key, copy.copy(trajectory), output, capture_traces, model_identifier
+        )
+        for cache_key, (value, tags) in entries.items():
+            self._enqueue(cache_key, value, tags)
+
+        if self.verbose:
+            logfire.debug(
+                "Queued agent run",
+                case_label=self._case_label(case, case_index),
+            )
+
+    async def aget_or_run_agent(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        candidate: CandidateMap,
+        capture_traces: bool,
+        run: Callable[[], Awaitable[tuple[Trajectory | None, RolloutOutput[Any]]]],
+        model_identifier: str | None = None,
+    ) -> tuple[Trajectory | None, RolloutOutput[Any]]:
+        """Return the cached agent run, or execute ``run`` once and cache it.
+
+        Concurrent calls for the same (case, candidate, capture_traces) share a
+        single execution of ``run``. An untraced request also joins an
+        in-flight traced run for the same case and candidate.
+        """
+        if not self.enabled:
+            return await run()
+
+        base_key = self._agent_run_key(case, case_index, candidate, model_identifier)
+        traced_key = f"{base_key}{_TRAJECTORY_SUFFIX}"
+        cache_key = traced_key if capture_traces else base_key
+
+        if not capture_traces and cache_key not in self._inflight:
+            traced_run = self._inflight.get(traced_key)
+            if traced_run is not None:
+                self.metrics.record_coalesced()
+                try:
+                    _, output = await asyncio.shield(traced_run)
+                    return None, output
+                except asyncio.CancelledError:
+                    if not traced_run.cancelled():
+                        raise
+
+        async def lookup() -> tuple[Trajectory | None, RolloutOutput[Any]] | None:
+            cached_result = await self._aload_agent_run(base_key, capture_traces)
+            self._record_agent_run_lookup(
+                case, case_index, cached_result, capture_traces
+            )
+            return cached_result
+
+        async def store(value: tuple[Trajectory | None, RolloutOutput[Any]]) -> None:
+            trajectory, output = value
+            await self.acache_agent_run(
+                case,
+                case_index,
+                candidate,
+                trajectory,
+                output,
+                capture_traces,
+                model_identifier=model_identifier,
+            )
+
+        return await self._single_flight(cache_key, lookup, run, store)
+
+    async def aget_or_compute_metric(
+        self,
+        case: Case[Any, Any, Any],
+        case_index: int | None,
+        output: RolloutOutput[Any],
+        candidate: CandidateMap,
+        compute: Callable[[], Awaitable[MetricResult]],
+        model_identifier: str | None = None,
+    ) -> MetricResult:
+        """Return the cached metric result, or run ``compute`` once and cache it."""
+        if not self.enabled:
+            return await compute()
+
+        cache_key = self._metric_key(
+            case, case_index, output, candidate, model_identifier
+        )
+
+        async def lookup() -> MetricResult | None:
+            cached_result = await self._aload(cache_key, "metric")
+            self._record_metric_lookup(case, case_index, cached_result)
+            return cached_result
+
+        async def store(value: MetricResult) -> None:
+            await self.acache_metric_result(
+                case,
+                case_index,
+                output,
+                candidate,
+                value,
+                model_identifier=model_identifier,
+            )
+
+        return await self._single_flight(cache_key, lookup, compute, store)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get statistics about the cache.
+
+        Returns:
+            Dictionary with cache statistics.
+        """
+        if not self.enabled:
+            return {"enabled": False}
+
+        assert self.backend is not None
+        self.flush()
+        stats = self.backend.stats()
+
+        return {
+            "enabled": True,
+            "cache_dir": str(self.cache_dir),
+            "backend": self.backend.name,
+            "num_cached_results": stats.num_entries,
+            "total_size_bytes": stats.total_bytes,
+            "total_size_mb": stats.total_bytes / (1024 * 1024),
+            **self._counter_snapshot(),
+        }
+
+    def _counter_snapshot(self) -> dict[str, Any]:
+        snapshot = self.metrics.snapshot()
+        return {
+            "hits": snapshot.hits,
+            "misses": snapshot.misses,
+            "coalesced": snapshot.coalesced,
+            "key_types": {
+                key_type: {
+                    "hits": counts.hits,
+                    "misses": counts.misses,
+                    "hit_ratio": counts.hit_ratio,
+                }
+                for key_type, counts in snapshot.lookups.items()
+            },
+            "bytes_read": snapshot.bytes_read,
+            "bytes_written": snapshot.bytes_written,
+            "latency": {
+                "load": snapshot.load_latency.as_dict(),
+                "store": snapshot.store_latency.as_dict(),
+            },
+            "tiers": {
+                "memory": {
+                    "hits": snapshot.memory.hits,
+                    "lookups": snapshot.memory.lookups,
+                    "hit_ratio": snapshot.memory.hit_ratio,
+                    "entries": len(self._memory),
+                    "size_bytes": self._memory.total_bytes,
+                },
+                "backend": {
+                    "hits": snapshot.backend.hits,
+                    "lookups": snapshot.backend.lookups,
+                    "hit_ratio": snapshot.backend.hit_ratio,
+                },
+            },
+        }
+
+    def metrics_snapshot(self) -> CacheMetricsSnapshot:
+        """Return the live hit/miss, byte and latency counters.
+
+        Unlike :meth:`get_cache_stats` this never touches the backend, so it is
+        cheap enough to poll during a run.
+        """
+        return self.metrics.snapshot()
+
+    def emit_metrics(self, **attributes: Any) -> None:
+        """Report counter changes since the last call as logfire metrics.
+
+        ``attributes`` (for example the graph node that just ran) are attached
+        to every data point.
+        """
+        if not self.enabled:
+            return
+        try:
+            self.metrics.emit(**attributes)
+        except Exception as e:
+            logfire.warn("Failed to emit cache metrics", exception=e)
+
+
+def _legacy_agent_run_key(base_key: str, capture_traces: bool) -> str:
+    return f"{base_key}_traces_{capture_traces}"
+
+
+def _low_water(limit: int | None) -> int | None:
+    return int(limit * _EVICTION_LOW_WATER) if limit is not None else None
+
+
+def _detach(value: Any) -> Any:
+    """Copy a queued agent-run tuple so callers never mutate the queued entry."""
+    if isinstance(value, tuple) and len(value) == 2:
+        trajectory, output = value
+        return (copy.copy(trajectory), output)
+    return value
+
+
+def create_cached_metric(
+    metric: Callable[
+        [Case[CaseInputT, CaseOutputT, CaseMetadataT], RolloutOutput[Any]], MetricResult
+    ],
+    cache_manager: CacheManager,
+    candidate: CandidateMap,
+    *,
+    model_identifier: str | None = None,
+) -> Callable[
+    [Case[CaseInputT, CaseOutputT, CaseMetadataT], RolloutOutput[Any]],
+    MetricResult | Awaitable[MetricResult],
+]:
+    """Create a cached version of a metric function.
+
+    This wrapper function checks the cache before calling the actual metric,
+    and caches the result afterward.
+
+    Args:
+        metric: The original metric function that accepts a Case.
+        cache_manager: The cache manager to use.
+        candidate: The current candidate being evaluated.
+        model_identifier: Optional override for the model identifier. When not
+            provided, the cache manager's configured identifier (if any) is used.
+
+    Returns:
+        A wrapped metric function that uses caching.
+    """
+
+    def cached_metric(
+        case: Case[CaseInputT, CaseOutputT, CaseMetadataT],
+        output: RolloutOutput[Any],
+    ) -> MetricResult | Awaitable[MetricResult]:
+        # Check cache first
+        cached_result = cache_manager.get_cached_metric_result(
+            case,
+            None,
+            output,
+            candidate,
+            model_identifier=model_identifier,
+        )
+
+        if cached_result is not None:
+            return cached_result
+
+        # Call the actual metric
+        metric_result = metric(case, output)
+        if inspect.isawaitable(metric_result):
+
+            async def cache_and_return() -> MetricResult:
+                awaited = await metric_result
+                cache_manager.cache_metric_result(
+                    case,
+                    None,
+                    output,
+                    candidate,
+                    awaited,
+                    model_identifier=model_identifier,
+                )
+                return awaited
+
+            return cache_and_return()
+
+        # Cache the result
+        cache_manager.cache_metric_result(
+            case,
+            None,
+            output,
+            candidate,
+            metric_result,
+            model_identifier=model_identifier,
+        )
+
+        return metric_result
+
+    return cached_metric
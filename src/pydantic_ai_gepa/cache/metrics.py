@@ -0,0 +1,268 @@
+"""Live hit/miss, byte and latency counters for :class:`CacheManager`."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any
+
+import logfire
+
+# Upper bounds, in seconds, of the latency histogram buckets; the last is open.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    math.inf,
+)
+# Latency samples buffered between emissions; older samples are dropped first.
+_MAX_PENDING_SAMPLES = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class LookupCounts:
+    """Hits and misses for one key type."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    """Bucketed latency observations, in seconds."""
+
+    count: int
+    total_seconds: float
+    bucket_counts: tuple[int, ...]
+    bucket_bounds: tuple[float, ...] = LATENCY_BUCKETS
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bucket_bounds, self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.bucket_bounds[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_seconds * 1000,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class CacheMetricsSnapshot:
+    """Point-in-time copy of every cache counter."""
+
+    lookups: dict[str, LookupCounts]
+    coalesced: int
+    bytes_read: int
+    bytes_written: int
+    memory: LookupCounts
+    backend: LookupCounts
+    load_latency: HistogramSnapshot
+    store_latency: HistogramSnapshot
+
+    @property
+    def hits(self) -> int:
+        return sum(counts.hits for counts in self.lookups.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(counts.misses for counts in self.lookups.values())
+
+
+@dataclass(slots=True)
+class _Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    total: float = 0.0
+    pending: deque[float] = field(
+        default_factory=lambda: deque(maxlen=_MAX_PENDING_SAMPLES)
+    )
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.pending.append(seconds)
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            count=sum(self.counts),
+            total_seconds=self.total,
+            bucket_counts=tuple(self.counts),
+        )
+
+
+class CacheMetrics:
+    """Thread-safe counters updated on every cache lookup, read and write.
+
+    :meth:`snapshot` returns cumulative totals. :meth:`emit` forwards whatever
+    changed since the previous call to logfire metrics, so it can be called
+    after every optimization step without double counting.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._lookups: dict[str, list[int]] = {}
+        self._tiers = {"memory": [0, 0], "backend": [0, 0]}
+        self._coalesced = 0
+        self._bytes = {"read": 0, "written": 0}
+        self._latency = {"load": _Histogram(), "store": _Histogram()}
+        self._emitted: dict[tuple[str, ...], int] = {}
+
+    def record_lookup(self, key_type: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._lookups.setdefault(key_type, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def record_tier(self, tier: str, hit: bool) -> None:
+        with self._lock:
+            self._tiers[tier][0 if hit else 1] += 1
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self._coalesced += 1
+
+    def record_load(self, num_bytes: int, seconds: float) -> None:
+        with self._lock:
+            self._bytes["read"] += num_bytes
+            self._latency["load"].record(seconds)
+
+    def record_store(self, num_bytes: int, seconds: float) -> None:
+        with self._lock:
+            self._bytes["written"] += num_bytes
+            self._latency["store"].record(seconds)
+
+    def snapshot(self) -> CacheMetricsSnapshot:
+        with self._lock:
+            return CacheMetricsSnapshot(
+                lookups={
+                    key_type: LookupCounts(hits=hits, misses=misses)
+                    for key_type, (hits, misses) in sorted(self._lookups.items())
+                },
+                coalesced=self._coalesced,
+                bytes_read=self._bytes["read"],
+                bytes_written=self._bytes["written"],
+                memory=LookupCounts(*self._tiers["memory"]),
+                backend=LookupCounts(*self._tiers["backend"]),
+                load_latency=self._latency["load"].snapshot(),
+                store_latency=self._latency["store"].snapshot(),
+            )
+
+    def emit(self, **attributes: Any) -> None:
+        """Report counter deltas and buffered latencies as logfire metrics."""
+        with self._lock:
+            totals: dict[tuple[str, ...], int] = {
+                ("coalesced",): self._coalesced,
+                ("bytes", "read"): self._bytes["read"],
+                ("bytes", "written"): self._bytes["written"],
+            }
+            for key_type, (hits, misses) in self._lookups.items():
+                totals["lookups", key_type, "hit"] = hits
+                totals["lookups", key_type, "miss"] = misses
+            for tier, (hits, misses) in self._tiers.items():
+                totals["tier", tier, "hit"] = hits
+                totals["tier", tier, "miss"] = misses
+            samples = {}
+            for operation, histogram in self._latency.items():
+                samples[operation] = list(histogram.pending)
+                histogram.pending.clear()
+            deltas = {
+                name: total - self._emitted.get(name, 0)
+                for name, total in totals.items()
+            }
+            self._emitted = totals
+
+        instruments = _instruments()
+        for name, delta in deltas.items():
+            if not delta:
+                continue
+            if name[0] == "lookups":
+                instruments["lookups"].add(
+                    delta, {**attributes, "key_type": name[1], "result": name[2]}
+                )
+            elif name[0] == "tier":
+                instruments["tier_lookups"].add(
+                    delta, {**attributes, "tier": name[1], "result": name[2]}
+                )
+            elif name[0] == "bytes":
+                instruments["bytes"].add(delta, {**attributes, "direction": name[1]})
+            else:
+                instruments["coalesced"].add(delta, attributes)
+        for operation, values in samples.items():
+            histogram = instruments["duration"]
+            for seconds in values:
+                histogram.record(seconds, {**attributes, "operation": operation})
+
+
+@cache
+def _instruments() -> dict[str, Any]:
+    return {
+        "lookups": logfire.metric_counter(
+            "gepa.cache.lookups",
+            unit="1",
+            description="Cache lookups by key type and result (hit/miss).",
+        ),
+        "tier_lookups": logfire.metric_counter(
+            "gepa.cache.tier_lookups",
+            unit="1",
+            description="Lookups served by each cache tier.",
+        ),
+        "coalesced": logfire.metric_counter(
+            "gepa.cache.coalesced",
+            unit="1",
+            description="Requests that joined an identical in-flight computation.",
+        ),
+        "bytes": logfire.metric_counter(
+            "gepa.cache.bytes",
+            unit="By",
+            description="Payload bytes read from or written to the cache backend.",
+        ),
+        "duration": logfire.metric_histogram(
+            "gepa.cache.duration",
+            unit="s",
+            description="Latency of cache backend loads and stores.",
+        ),
+    }
+
+
+__all__ = [
+    "CacheMetrics",
+    "CacheMetricsSnapshot",
+    "HistogramSnapshot",
+    "LATENCY_BUCKETS",
+    "LookupCounts",
+]
@@ -10,6 +10,7 @@ from __future__ import annotations
 import typer
 
 from . import apply as apply_cmd
+from . import cache as cache_cmd
 from . import components as components_cmd
 from . import eval as eval_cmd
 from . import events as events_cmd
@@ -97,6 +98,11 @@ app.add_typer(
 app.add_typer(
     journal_cmd.app, name="journal", help="Read and append the Reflection Ledger."
 )
+app.add_typer(
+    cache_cmd.app,
+    name="cache",
+    help="Inspect rollout cache usage and evict cold entries.",
+)
 
 
 __all__ = ["app"]
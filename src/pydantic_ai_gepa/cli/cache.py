@@ -0,0 +1,295 @@
+"""`gepa cache` — inspect and prune the rollout cache."""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from ..cache.backends import CacheBackend, UsageRow, create_backend
+from ..cache.bundle import BundleFilter, BundleSummary, read_bundle, write_bundle
+
+
+app = typer.Typer(
+    no_args_is_help=True, help="Inspect, prune, and ship the rollout cache."
+)
+
+DEFAULT_CACHE_DIR = ".gepa_cache"
+
+_GROUP_FIELDS = {"run": "run_id", "model": "model", "key-type": "key_type"}
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1024,
+    "kb": 1024,
+    "m": 1024**2,
+    "mb": 1024**2,
+    "g": 1024**3,
+    "gb": 1024**3,
+}
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def _parse_size(value: str) -> int:
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", value)
+    if match is None or match.group(2).lower() not in _SIZE_UNITS:
+        raise typer.BadParameter(
+            f"{value!r} is not a size; use bytes or a K/M/G suffix (e.g. 500MB)."
+        )
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def _parse_duration(value: str) -> float:
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", value)
+    if match is None:
+        raise typer.BadParameter(
+            f"{value!r} is not a duration; use seconds or an s/m/h/d/w suffix (e.g. 7d)."
+        )
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2) or "s"]
+
+
+@contextmanager
+def _open_backend(
+    cache_dir: Path, backend: str, *, create: bool = False
+) -> Iterator[CacheBackend]:
+    if create:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    elif not cache_dir.is_dir():
+        typer.echo(f"No cache directory at {cache_dir}", err=True)
+        raise typer.Exit(code=1)
+    if backend not in ("sqlite", "pickle"):
+        typer.echo(
+            f"Unknown --backend {backend!r}; expected one of: sqlite, pickle",
+            err=True,
+        )
+        raise typer.Exit(code=2)
+    opened = create_backend(backend, cache_dir)  # type: ignore[arg-type]
+    try:
+        yield opened
+    finally:
+        opened.close()
+
+
+def _group_usage(rows: list[UsageRow], by: str) -> list[dict[str, Any]]:
+    field = _GROUP_FIELDS[by]
+    groups: dict[str | None, dict[str, Any]] = {}
+    for row in rows:
+        label = getattr(row, field)
+        group = groups.setdefault(
+            label,
+            {
+                field: label,
+                "num_entries": 0,
+                "total_bytes": 0,
+                "last_accessed_at": None,
+            },
+        )
+        group["num_entries"] += row.num_entries
+        group["total_bytes"] += row.total_bytes
+        if row.last_accessed_at is not None and (
+            group["last_accessed_at"] is None
+            or row.last_accessed_at > group["last_accessed_at"]
+        ):
+            group["last_accessed_at"] = row.last_accessed_at
+    return sorted(groups.values(), key=lambda g: g["total_bytes"], reverse=True)
+
+
+@app.command("stats")
+def stats(
+    cache_dir: Path = typer.Option(
+        Path(DEFAULT_CACHE_DIR), "--cache-dir", help="Cache directory to inspect."
+    ),
+    by: str = typer.Option(
+        "run", "--by", help="run | model | key-type", show_default=True
+    ),
+    backend: str = typer.Option(
+        "sqlite", "--backend", help="sqlite | pickle", show_default=True
+    ),
+    format_: str = typer.Option(
+        "json", "--format", help="json | tsv", show_default=True
+    ),
+) -> None:
+    """Report cache usage grouped by run, model, or key type."""
+    if by not in _GROUP_FIELDS:
+        typer.echo(
+            f"Unknown --by {by!r}; expected one of: {', '.join(_GROUP_FIELDS)}",
+            err=True,
+        )
+        raise typer.Exit(code=2)
+    if format_ not in ("json", "tsv"):
+        typer.echo(
+            f"Unknown --format {format_!r}; expected one of: json, tsv",
+            err=True,
+        )
+        raise typer.Exit(code=2)
+
+    with _open_backend(cache_dir, backend) as opened:
+        totals = opened.stats()
+        groups = _group_usage(opened.usage(), by)
+
+    if format_ == "json":
+        payload = {
+            "cache_dir": str(cache_dir),
+            "backend": backend,
+            "num_entries": totals.num_entries,
+            "total_bytes": totals.total_bytes,
+            "groups": groups,
+        }
+        typer.echo(json.dumps(payload, indent=2))
+    else:
+        field = _GROUP_FIELDS[by]
+        lines = [f"{field}\tnum_entries\ttotal_bytes\tlast_accessed_at"]
+        for group in groups:
+            lines.append(
+                "\t".join(
+                    [
+                        str(group[field] or ""),
+                        str(group["num_entries"]),
+                        str(group["total_bytes"]),
+                        str(group["last_accessed_at"] or ""),
+                    ]
+                )
+            )
+        typer.echo("\n".join(lines))
+
+
+@app.command("gc")
+def gc(
+    cache_dir: Path = typer.Option(
+        Path(DEFAULT_CACHE_DIR), "--cache-dir", help="Cache directory to prune."
+    ),
+    max_bytes: str | None = typer.Option(
+        None, "--max-bytes", help="Keep at most this much data (e.g. 500MB, 2G)."
+    ),
+    max_entries: int | None = typer.Option(
+        None, "--max-entries", min=0, help="Keep at most this many entries."
+    ),
+    ttl: str | None = typer.Option(
+        None,
+        "--ttl",
+        help="Drop entries not accessed within this window (e.g. 7d, 12h).",
+    ),
+    backend: str = typer.Option(
+        "sqlite", "--backend", help="sqlite | pickle", show_default=True
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Report what would be evicted without deleting."
+    ),
+) -> None:
+    """Evict cold entries: expired ones first, then least recently used."""
+    if max_bytes is None and max_entries is None and ttl is None:
+        typer.echo("Pass at least one of --max-bytes, --max-entries, --ttl", err=True)
+        raise typer.Exit(code=2)
+    byte_limit = _parse_size(max_bytes) if max_bytes is not None else None
+    ttl_seconds = _parse_duration(ttl) if ttl is not None else None
+
+    with _open_backend(cache_dir, backend) as opened:
+        result = opened.evict(
+            max_bytes=byte_limit,
+            max_entries=max_entries,
+            ttl=ttl_seconds,
+            dry_run=dry_run,
+        )
+        remaining = opened.stats()
+
+    remaining_entries = remaining.num_entries
+    remaining_bytes = remaining.total_bytes
+    if result.dry_run:
+        remaining_entries -= result.num_entries
+        remaining_bytes -= result.total_bytes
+
+    typer.echo(
+        json.dumps(
+            {
+                "dry_run": result.dry_run,
+                "evicted_entries": result.num_entries,
+                "evicted_bytes": result.total_bytes,
+                "remaining_entries": remaining_entries,
+                "remaining_bytes": remaining_bytes,
+            },
+            indent=2,
+        )
+    )
+
+
+def _echo_summary(summary: BundleSummary, path: str) -> None:
+    # Bundles streamed to stdout keep the summary off the data channel.
+    typer.echo(
+        json.dumps(
+            {
+                "bundle": path,
+                "entries": summary.num_entries,
+                "blobs": summary.num_blobs,
+                "total_bytes": summary.total_bytes,
+                "skipped_entries": summary.skipped_entries,
+            },
+            indent=2,
+        ),
+        err=path == "-",
+    )
+
+
+@app.command("export")
+def export(
+    bundle: str = typer.Argument(..., help="Bundle file to write, or - for stdout."),
+    cache_dir: Path = typer.Option(
+        Path(DEFAULT_CACHE_DIR), "--cache-dir", help="Cache directory to export."
+    ),
+    model: str | None = typer.Option(
+        None, "--model", help="Only entries recorded for this model identifier."
+    ),
+    run_id: str | None = typer.Option(
+        None, "--run", help="Only entries written by this optimization run."
+    ),
+    key_type: str | None = typer.Option(
+        None, "--key-type", help="Only entries of this key type (e.g. metric)."
+    ),
+    backend: str = typer.Option(
+        "sqlite", "--backend", help="sqlite | pickle", show_default=True
+    ),
+) -> None:
+    """Pack cache entries into a portable bundle (e.g. a CI artifact)."""
+    filter_ = BundleFilter(model=model, run_id=run_id, key_type=key_type)
+    with _open_backend(cache_dir, backend) as opened:
+        if bundle == "-":
+            summary = write_bundle(opened, sys.stdout.buffer, filter_)
+            sys.stdout.buffer.flush()
+        else:
+            summary = write_bundle(opened, Path(bundle), filter_)
+    _echo_summary(summary, bundle)
+
+
+@app.command("import")
+def import_(
+    bundle: str = typer.Argument(..., help="Bundle file to read, or - for stdin."),
+    cache_dir: Path = typer.Option(
+        Path(DEFAULT_CACHE_DIR), "--cache-dir", help="Cache directory to merge into."
+    ),
+    overwrite: bool = typer.Option(
+        False, "--overwrite", help="Replace entries that already exist locally."
+    ),
+    backend: str = typer.Option(
+        "sqlite", "--backend", help="sqlite | pickle", show_default=True
+    ),
+) -> None:
+    """Merge a bundle into the cache; existing entries are kept by default."""
+    if bundle != "-" and not Path(bundle).is_file():
+        typer.echo(f"No bundle at {bundle}", err=True)
+        raise typer.Exit(code=1)
+    with _open_backend(cache_dir, backend, create=True) as opened:
+        source = sys.stdin.buffer if bundle == "-" else Path(bundle)
+        try:
+            summary = read_bundle(opened, source, overwrite=overwrite)
+        except ValueError as e:
+            typer.echo(str(e), err=True)
+            raise typer.Exit(code=1) from e
+    _echo_summary(summary, bundle)
+
+
+__all__ = ["app"]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any, Mapping, Sequence
 
@@ -15,6 +15,7 @@ from pydantic import BaseModel
 from pydantic_evals import Case, Dataset
 
 from .adapters.agent_adapter import CaseFactory, create_adapter
+from .gepa_graph.evaluation.evaluator import iter_completed
 from .gepa_graph.models import CandidateMap, candidate_texts
 from .input_type import InputSpec
 from .skills import SkillsFS
@@ -53,6 +54,47 @@ async def evaluate_candidate_dataset(
     references — file paths, Mighty file ids, base64 blobs — that need
     to be materialized into ``BinaryContent`` (or similar) before the
     agent runs. Only honored for ``SignatureAgent`` agents.
+
+    Records are returned in completion order; use
+    :func:`stream_candidate_dataset` to act on them as they arrive.
+    """
+
+    return [
+        record
+        async for record in stream_candidate_dataset(
+            agent=agent,
+            metric=metric,
+            dataset=dataset,
+            candidate=candidate,
+            concurrency=concurrency,
+            agent_usage_limits=agent_usage_limits,
+            capture_traces=capture_traces,
+            input_type=input_type,
+            case_factory=case_factory,
+            skills_fs=skills_fs,
+            skills_capabilities=skills_capabilities,
+        )
+    ]
+
+
+async def stream_candidate_dataset(
+    *,
+    agent: AbstractAgent[Any, Any],
+    metric,
+    dataset: Sequence[Case[Any, Any, Any]] | Dataset[Any, Any],
+    candidate: CandidateMap | None = None,
+    concurrency: int = 20,
+    agent_usage_limits: UsageLimits | None = None,
+    capture_traces: bool = False,
+    input_type: InputSpec[BaseModel] | None = None,
+    case_factory: CaseFactory | None = None,
+    skills_fs: SkillsFS | None = None,
+    skills_capabilities: set[SkillCapability] | None = None,
+) -> AsyncIterator[EvaluationRecord]:
+    """Yield an :class:`EvaluationRecord` for each case as soon as it finishes.
+
+    Takes the same arguments as :func:`evaluate_candidate_dataset`. Closing
+    the iterator early cancels the cases still running.
     """
 
     semaphore = asyncio.Semaphore(max(1, concurrency))
@@ -84,7 +126,7 @@ async def evaluate_candidate_dataset(
     task_name = getattr(agent, "name", None) or agent.__class__.__name__
     extra_attributes: dict[str, Any] = {"gen_ai.operation.name": "experiment"}
 
-    async def run_case(index: int, case: Case[Any, Any, Any]) -> None:
+    async def run_case(index: int, case: Case[Any, Any, Any]) -> EvaluationRecord:
         async with semaphore:
             result = await adapter.process_case(
                 case,
@@ -93,13 +135,11 @@ async def evaluate_candidate_dataset(
                 candidate=candidate_map,
             )
             case_id = case.name or f"case-{index}"
-            records.append(
-                EvaluationRecord(
-                    case_id=case_id,
-                    score=float(result.get("score", 0.0)),
-                    feedback=result.get("feedback"),
-                    payload=result,
-                )
+            return EvaluationRecord(
+                case_id=case_id,
+                score=float(result.get("score", 0.0)),
+                feedback=result.get("feedback"),
+                payload=result,
             )
 
     with logfire.span(
@@ -112,9 +152,11 @@ async def evaluate_candidate_dataset(
         **extra_attributes,
     ) as eval_span:
         with adapter.apply_candidate(candidate_map):
-            await asyncio.gather(
-                *(run_case(idx, case) for idx, case in enumerate(cases))
-            )
+            async for record in iter_completed(
+                run_case(idx, case) for idx, case in enumerate(cases)
+            ):
+                records.append(record)
+                yield record
 
         experiment_metadata: dict[str, Any] = {"n_cases": total_cases}
         if dataset_name:
@@ -135,8 +177,6 @@ async def evaluate_candidate_dataset(
 
         eval_span.set_attribute("logfire.experiment.metadata", experiment_metadata)
 
-    return records
-
 
 PlainEvaluate = Callable[
     [Any],
@@ -227,4 +267,5 @@ __all__ = [
     "PlainEvaluate",
     "evaluate_callable_dataset",
     "evaluate_candidate_dataset",
+    "stream_candidate_dataset",
 ]
@@ -4,7 +4,12 @@ from __future__ import annotations
 
 from . import datasets, evaluation, models
 from .deps import GepaDeps
-from .evaluation import EvaluationResults, ParallelEvaluator, ParetoFrontManager
+from .evaluation import (
+    EvaluationResults,
+    EvaluationSample,
+    ParallelEvaluator,
+    ParetoFrontManager,
+)
 from .graph import create_gepa_graph
 from .helpers import create_deps
 from .models import (
@@ -32,6 +37,7 @@ __all__ = [
     "ComponentValue",
     "GepaDeps",
     "EvaluationResults",
+    "EvaluationSample",
     "ParallelEvaluator",
     "ParetoFrontManager",
 ]
@@ -1,12 +1,13 @@
 """Evaluation helpers for the GEPA graph implementation."""
 
 from ...evaluation_models import EvaluationBatch
-from .evaluator import EvaluationResults, ParallelEvaluator
+from .evaluator import EvaluationResults, EvaluationSample, ParallelEvaluator
 from .pareto import ParetoFrontManager
 
 __all__ = [
     "EvaluationBatch",
     "EvaluationResults",
+    "EvaluationSample",
     "ParallelEvaluator",
     "ParetoFrontManager",
 ]
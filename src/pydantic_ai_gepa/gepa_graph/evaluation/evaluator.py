@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+from collections.abc import AsyncIterator, Awaitable, Iterable
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, Sequence, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, Sequence, TypeVar
 from ...evaluation_models import EvaluationBatch
 from ...types import RolloutOutput, Trajectory
 from pydantic_evals import Case
@@ -15,6 +17,16 @@ if TYPE_CHECKING:
     from ..example_bank import InMemoryExampleBank
 
 DataIdT = TypeVar("DataIdT")
+ResultT = TypeVar("ResultT")
+
+
+class EvaluationSample(NamedTuple):
+    """Result for a single case, yielded as soon as the case finishes."""
+
+    data_id: str
+    score: float
+    output: RolloutOutput[Any]
+    trajectory: Trajectory | None = None
 
 
 @dataclass(slots=True, kw_only=True)
@@ -46,7 +58,16 @@ class EvaluationResults(Generic[DataIdT]):
 
 
 class ParallelEvaluator:
-    """Evaluate candidates on datasets with asyncio-powered parallelism."""
+    """Evaluate candidates on datasets with asyncio-powered parallelism.
+
+    Adapters whose ``evaluate`` accepts a ``limiter`` keyword receive cases in
+    chunks of ``chunk_size``: the candidate is applied once per chunk and every
+    case acquires the shared semaphore. Other adapters are called once per
+    case.
+    """
+
+    def __init__(self, chunk_size: int = 32) -> None:
+        self.chunk_size = max(1, chunk_size)
 
     async def evaluate_batch(
         self,
@@ -56,21 +77,109 @@ class ParallelEvaluator:
         adapter: "Adapter[Any, Any, Any]",
         max_concurrent: int = 10,
         capture_traces: bool = False,
+        data_ids: Sequence[str] | None = None,
     ) -> EvaluationResults[str]:
-        """Evaluate ``candidate`` for every instance in ``batch``."""
+        """Evaluate ``candidate`` for every instance in ``batch``.
+
+        Results are returned in the order of ``batch`` regardless of which
+        case finished first. ``data_ids`` overrides the identifiers derived
+        from case names and batch positions, e.g. when ``batch`` is a subset
+        of the validation set.
+        """
+        completed: list[tuple[int, list[EvaluationSample]]] = []
+        async for index, samples in self._stream_cases(
+            candidate=candidate,
+            batch=batch,
+            adapter=adapter,
+            max_concurrent=max_concurrent,
+            capture_traces=capture_traces,
+            data_ids=data_ids,
+        ):
+            completed.append((index, samples))
+        completed.sort(key=lambda item: item[0])
+        return self._merge_samples(
+            [sample for _, samples in completed for sample in samples],
+            capture_traces=capture_traces,
+        )
+
+    async def evaluate_stream(
+        self,
+        *,
+        candidate: CandidateProgram,
+        batch: Sequence[Case[Any, Any, Any]],
+        adapter: "Adapter[Any, Any, Any]",
+        max_concurrent: int = 10,
+        capture_traces: bool = False,
+        data_ids: Sequence[str] | None = None,
+    ) -> AsyncIterator[EvaluationSample]:
+        """Yield an :class:`EvaluationSample` per case in completion order.
+
+        Chunked adapters yield every case of a chunk once the chunk returns.
+        Closing the iterator early cancels the cases still in flight.
+        """
+        async for _, samples in self._stream_cases(
+            candidate=candidate,
+            batch=batch,
+            adapter=adapter,
+            max_concurrent=max_concurrent,
+            capture_traces=capture_traces,
+            data_ids=data_ids,
+        ):
+            for sample in samples:
+                yield sample
+
+    async def _stream_cases(
+        self,
+        *,
+        candidate: CandidateProgram,
+        batch: Sequence[Case[Any, Any, Any]],
+        adapter: "Adapter[Any, Any, Any]",
+        max_concurrent: int,
+        capture_traces: bool,
+        data_ids: Sequence[str] | None,
+    ) -> AsyncIterator[tuple[int, list[EvaluationSample]]]:
+        """Yield ``(batch index, samples)`` pairs as cases or chunks complete."""
         if not batch:
-            return EvaluationResults(
-                data_ids=[],
-                scores=[],
-                outputs=[],
-                trajectories=[] if capture_traces else None,
-            )
+            return
+        if data_ids is None:
+            ids = [self._data_id(instance, idx) for idx, instance in enumerate(batch)]
+        else:
+            ids = list(data_ids)
+            if len(ids) != len(batch):
+                raise ValueError("data_ids must have one entry per batch instance.")
 
         semaphore = asyncio.Semaphore(max(1, max_concurrent))
         candidate_payload = candidate.components
         example_bank = candidate.example_bank
 
-        async def run_one(index: int, instance: Case[Any, Any, Any]):
+        if _accepts_limiter(adapter):
+
+            async def run_chunk(start: int) -> list[tuple[int, list[EvaluationSample]]]:
+                chunk = batch[start : start + self.chunk_size]
+                eval_batch = await adapter.evaluate(  # type: ignore[call-arg]
+                    chunk,
+                    candidate_payload,
+                    capture_traces,
+                    example_bank=example_bank,
+                    limiter=semaphore,
+                )
+                return [
+                    (start + offset, self._samples(ids[start + offset], case_batch))
+                    for offset, case_batch in enumerate(
+                        self._split_chunk(chunk, eval_batch)
+                    )
+                ]
+
+            async for chunk_results in iter_completed(
+                run_chunk(start) for start in range(0, len(batch), self.chunk_size)
+            ):
+                for result in chunk_results:
+                    yield result
+            return
+
+        async def run_one(
+            index: int, instance: Case[Any, Any, Any]
+        ) -> tuple[int, list[EvaluationSample]]:
             async with semaphore:
                 eval_batch = await self._call_adapter(
                     adapter=adapter,
@@ -79,13 +188,40 @@ class ParallelEvaluator:
                     capture_traces=capture_traces,
                     example_bank=example_bank,
                 )
-            data_id = self._data_id(instance, index)
-            return data_id, eval_batch
+            return index, self._samples(ids[index], eval_batch)
 
-        tasks = [run_one(idx, instance) for idx, instance in enumerate(batch)]
+        async for result in iter_completed(
+            run_one(idx, instance) for idx, instance in enumerate(batch)
+        ):
+            yield result
 
-        results = await asyncio.gather(*tasks)
-        return self._merge_results(results, capture_traces=capture_traces)
+    def _split_chunk(
+        self,
+        chunk: Sequence[Case[Any, Any, Any]],
+        eval_batch: EvaluationBatch,
+    ) -> list[EvaluationBatch]:
+        """Break a chunk's batch into the per-case shape of the fallback path."""
+        scores = list(eval_batch.scores)
+        outputs = list(eval_batch.outputs)
+        if not len(scores) == len(outputs) == len(chunk):
+            raise ValueError(
+                "Adapter returned a result count that does not match the chunk."
+            )
+        traces = (
+            list(eval_batch.trajectories)
+            if eval_batch.trajectories is not None
+            else None
+        )
+        if traces is not None and len(traces) != len(chunk):
+            raise ValueError("Adapter returned mismatched trace count.")
+        return [
+            EvaluationBatch(
+                outputs=[outputs[offset]],
+                scores=[scores[offset]],
+                trajectories=[traces[offset]] if traces is not None else None,
+            )
+            for offset in range(len(chunk))
+        ]
 
     async def _call_adapter(
         self,
@@ -103,49 +239,36 @@ class ParallelEvaluator:
             example_bank=example_bank,
         )
 
-    def _merge_results(
-        self,
-        results: list[tuple[str, EvaluationBatch]],
+    @staticmethod
+    def _samples(data_id: str, batch: EvaluationBatch) -> list[EvaluationSample]:
+        scores = list(batch.scores)
+        outputs = list(batch.outputs)
+        if len(scores) != len(outputs):
+            raise ValueError("Adapter returned mismatched scores and outputs.")
+        if batch.trajectories is None:
+            traces: list[Trajectory | None] = [None] * len(scores)
+        else:
+            traces = list(batch.trajectories)
+            if len(traces) != len(scores):
+                raise ValueError("Adapter returned mismatched trace count.")
+        return [
+            EvaluationSample(data_id, score, output, trace)
+            for score, output, trace in zip(scores, outputs, traces)
+        ]
+
+    @staticmethod
+    def _merge_samples(
+        samples: Sequence[EvaluationSample],
         *,
         capture_traces: bool,
     ) -> EvaluationResults[str]:
-        data_ids: list[str] = []
-        scores: list[float] = []
-        outputs: list[RolloutOutput[Any]] = []
-        trajectories: list[Trajectory | None] | None = [] if capture_traces else None
-
-        for data_id, batch in results:
-            batch_scores = list(batch.scores)
-            batch_outputs = list(batch.outputs)
-
-            if len(batch_scores) != len(batch_outputs):
-                raise ValueError("Adapter returned mismatched scores and outputs.")
-
-            data_ids.extend([data_id] * len(batch_scores))
-            scores.extend(batch_scores)
-            outputs.extend(batch_outputs)
-
-            if trajectories is not None:
-                batch_traces = batch.trajectories
-                if batch_traces is None:
-                    trajectories.extend([None] * len(batch_scores))
-                else:
-                    batch_traces_list = list(batch_traces)
-                    if len(batch_traces_list) != len(batch_scores):
-                        raise ValueError("Adapter returned mismatched trace count.")
-                    trajectories.extend(batch_traces_list)
-
-        trajectory_payload: list[Trajectory | None] | None
-        if trajectories is None:
-            trajectory_payload = None
-        else:
-            trajectory_payload = trajectories
-
         return EvaluationResults(
-            data_ids=data_ids,
-            scores=scores,
-            outputs=outputs,
-            trajectories=trajectory_payload,
+            data_ids=[sample.data_id for sample in samples],
+            scores=[sample.score for sample in samples],
+            outputs=[sample.output for sample in samples],
+            trajectories=(
+                [sample.trajectory for sample in samples] if capture_traces else None
+            ),
         )
 
     @staticmethod
@@ -153,4 +276,38 @@ class ParallelEvaluator:
         return instance.name or f"case-{index}"
 
 
-__all__ = ["EvaluationResults", "ParallelEvaluator"]
+async def iter_completed(
+    aws: Iterable[Awaitable[ResultT]],
+) -> AsyncIterator[ResultT]:
+    """Run ``aws`` concurrently and yield their results as each one finishes.
+
+    The first exception propagates to the consumer. Whether the iterator fails,
+    is closed early or is exhausted, unfinished tasks are cancelled and awaited
+    before it returns.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _accepts_limiter(adapter: "Adapter[Any, Any, Any]") -> bool:
+    try:
+        parameters = inspect.signature(adapter.evaluate).parameters
+    except (TypeError, ValueError):
+        return False
+    return "limiter" in parameters
+
+
+__all__ = [
+    "EvaluationResults",
+    "EvaluationSample",
+    "ParallelEvaluator",
+    "iter_completed",
+]
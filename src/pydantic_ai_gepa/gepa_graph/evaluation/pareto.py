@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+from ...types import RolloutOutput
 from ..models import CandidateProgram, GepaState, ParetoFrontEntry
 from .evaluator import EvaluationResults
 
@@ -19,15 +22,26 @@ class ParetoFrontManager:
     ) -> None:
         """Merge evaluation results into the state's Pareto fronts."""
         for data_id, score, output in eval_results:
-            entry = state.pareto_front.get(data_id)
-            if entry is None:
-                entry = ParetoFrontEntry(data_id=data_id)
-                state.pareto_front[data_id] = entry
-            entry.update(
-                candidate_idx=candidate_idx,
-                score=score,
-                output=output,
-            )
+            self.record_result(state, candidate_idx, data_id, score, output)
+
+    def record_result(
+        self,
+        state: GepaState,
+        candidate_idx: int,
+        data_id: str,
+        score: float,
+        output: RolloutOutput[Any],
+    ) -> None:
+        """Merge the result of a single case into its Pareto front."""
+        entry = state.pareto_front.get(data_id)
+        if entry is None:
+            entry = ParetoFrontEntry(data_id=data_id)
+            state.pareto_front[data_id] = entry
+        entry.update(
+            candidate_idx=candidate_idx,
+            score=score,
+            output=output,
+        )
 
     def find_dominators(self, state: GepaState) -> list[int]:
         """Return indices of non-dominated candidates."""
@@ -42,6 +56,11 @@ class ParetoFrontManager:
             if not candidate.validation_scores:
                 # Until evaluated, treat as potentially useful.
                 continue
+            if candidate.validation_raced_out:
+                # Racing only stops candidates that cannot win on average and
+                # are not sole best on any instance.
+                dominated.add(idx)
+                continue
             for other_idx, other in enumerate(candidates):
                 if idx == other_idx or other_idx in dominated:
                     continue
@@ -56,21 +75,23 @@ class ParetoFrontManager:
         candidate_a: CandidateProgram,
         candidate_b: CandidateProgram,
     ) -> bool:
-        """Return True if ``candidate_a`` dominates ``candidate_b``."""
+        """Return True if ``candidate_a`` dominates ``candidate_b``.
+
+        Coverage-aware: ``candidate_a`` must have been scored on every instance
+        ``candidate_b`` covers, since an unscored instance could be where
+        ``candidate_b`` wins. A sparsely validated candidate can therefore be
+        dominated by one with wider coverage, but never dominates it.
+        """
         scores_a = candidate_a.validation_scores
         scores_b = candidate_b.validation_scores
         if not scores_a or not scores_b:
             return False
-
-        coverage_b = set(scores_b.keys())
-        shared = coverage_b & set(scores_a.keys())
-        if not shared or shared != coverage_b:
+        if not scores_b.keys() <= scores_a.keys():
             return False
 
         strictly_better = False
-        for data_id in shared:
+        for data_id, score_b in scores_b.items():
             score_a = scores_a[data_id]
-            score_b = scores_b[data_id]
             if score_a + SCORE_EPSILON < score_b:
                 return False
             if score_a - SCORE_EPSILON > score_b:
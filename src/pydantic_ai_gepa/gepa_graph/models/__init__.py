@@ -1,6 +1,7 @@
 """Data models used by the GEPA graph implementation."""
 
 from .candidate import CandidateMap, CandidateProgram, ComponentValue, candidate_texts
+from .case_results import CaseResult, CaseResultStore
 from .pareto import ParetoFrontEntry
 from .result import GepaResult
 from .state import (
@@ -16,6 +17,8 @@ __all__ = [
     "CandidateSelectorStrategy",
     "CandidateMap",
     "candidate_texts",
+    "CaseResult",
+    "CaseResultStore",
     "EvaluationErrorEvent",
     "ComponentValue",
     "GenealogyRecord",
@@ -60,6 +60,8 @@ class CandidateProgram(BaseModel):
 
     validation_scores: dict[str, float] = Field(default_factory=dict)
     validation_outputs: dict[str, RolloutOutput[Any]] = Field(default_factory=dict)
+    # Set when validation_racing stopped the pass early; scores cover a subset.
+    validation_raced_out: bool = False
     minibatch_scores: list[float] | None = None
 
     discovered_at_iteration: int
@@ -0,0 +1,60 @@
+"""Per-(candidate, case) rollout results shared across GEPA steps."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from ...types import RolloutOutput, Trajectory
+
+
+@dataclass(slots=True)
+class CaseResult:
+    """One candidate's rollout on one case."""
+
+    score: float
+    output: RolloutOutput[Any]
+    trajectory: Trajectory | None = None
+
+
+class CaseResultStore:
+    """Latest rollout result per candidate and training data id.
+
+    Results with a trajectory are not replaced by later ones without, so a
+    captured trace stays available to reflection after a traceless re-run.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[int, dict[str, CaseResult]] = {}
+
+    def record(
+        self,
+        candidate_idx: int,
+        data_id: str,
+        score: float,
+        output: RolloutOutput[Any],
+        trajectory: Trajectory | None = None,
+    ) -> None:
+        results = self._results.setdefault(candidate_idx, {})
+        existing = results.get(data_id)
+        if trajectory is None and existing is not None and existing.trajectory:
+            return
+        results[data_id] = CaseResult(score, output, trajectory)
+
+    def get(self, candidate_idx: int, data_id: str) -> CaseResult | None:
+        return self._results.get(candidate_idx, {}).get(data_id)
+
+    def for_candidate(self, candidate_idx: int) -> dict[str, CaseResult]:
+        return dict(self._results.get(candidate_idx, {}))
+
+    def __len__(self) -> int:
+        return sum(len(results) for results in self._results.values())
+
+    def __iter__(self) -> Iterator[tuple[int, str, CaseResult]]:
+        for candidate_idx, results in self._results.items():
+            for data_id, result in results.items():
+                yield candidate_idx, data_id, result
+
+
+__all__ = ["CaseResult", "CaseResultStore"]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from enum import StrEnum, auto
 from typing import Any, Literal
 
@@ -20,6 +20,7 @@ from pydantic_evals import Case
 from ..datasets import DataLoader, ensure_loader
 from ...reflection import ReflectionSampler
 from .candidate import CandidateProgram
+from .case_results import CaseResultStore
 from .pareto import ParetoFrontEntry
 
 
@@ -168,12 +169,64 @@ class GepaConfig(BaseModel):
     enable_parallel_reflection: bool = Field(
         default=True, description="Allow LLM reflection calls to run concurrently."
     )
+    reflection_parallelism: int = Field(
+        default=1,
+        description=(
+            "Independent reflections (own parent, minibatch and proposal) run concurrently "
+            "per iteration when enable_parallel_reflection is set."
+        ),
+    )
+
+    # Runtime
+    runtime: Literal["graph", "steady_state"] = Field(
+        default="graph",
+        description=(
+            'Loop driver: "graph" runs the GEPA graph steps one after another; '
+            '"steady_state" validates accepted candidates in the background while '
+            "reflection continues."
+        ),
+    )
+    validation_workers: int = Field(
+        default=2,
+        description=(
+            'Candidates validated concurrently under runtime="steady_state"; reflection '
+            "runs at most this many iterations ahead of the validations it has applied."
+        ),
+    )
 
     # Evaluation policy
     validation_policy: Literal["full", "sparse"] = Field(
         default="full",
         description="Controls whether to score every validation example or use sparse sampling.",
     )
+    sparse_validation_fraction: float = Field(
+        default=0.1,
+        description=(
+            'Share of the validation set first scored under validation_policy="sparse"; '
+            "the subset is spread evenly across the dataset."
+        ),
+    )
+    sparse_validation_growth: float = Field(
+        default=2.0,
+        description=(
+            "Factor by which sparse coverage grows for a candidate that still matches "
+            "the best candidate on the instances both have been scored on."
+        ),
+    )
+    reuse_case_results: bool = Field(
+        default=True,
+        description=(
+            "Reuse a parent's stored per-case results (scores, outputs and traces) "
+            "instead of re-running those cases for its reflection minibatch."
+        ),
+    )
+    validation_racing: bool = Field(
+        default=False,
+        description=(
+            "Stop a full validation pass once, with scores bounded by perfect_score, "
+            "the candidate can neither beat best_score nor become sole best on any instance."
+        ),
+    )
 
     # Reproducibility
     seed: int = Field(default=0, description="Seed used for deterministic randomness.")
@@ -186,6 +239,8 @@ class GepaConfig(BaseModel):
         "max_concurrent_evaluations",
         "reflection_sampler_max_records",
         "merge_subsample_size",
+        "reflection_parallelism",
+        "validation_workers",
     )
     @classmethod
     def _validate_positive_int(cls, value: int, info: ValidationInfo) -> int:
@@ -207,6 +262,20 @@ class GepaConfig(BaseModel):
             raise ValueError("max_iterations must be > 0 when provided.")
         return value
 
+    @field_validator("sparse_validation_fraction")
+    @classmethod
+    def _validate_sparse_fraction(cls, value: float) -> float:
+        if not 0 < value <= 1:
+            raise ValueError("sparse_validation_fraction must be in (0, 1].")
+        return value
+
+    @field_validator("sparse_validation_growth")
+    @classmethod
+    def _validate_sparse_growth(cls, value: float) -> float:
+        if value <= 1:
+            raise ValueError("sparse_validation_growth must be > 1.")
+        return value
+
     @field_validator("perfect_score")
     @classmethod
     def _validate_perfect_score(cls, value: float) -> float:
@@ -214,6 +283,17 @@ class GepaConfig(BaseModel):
             raise ValueError("perfect_score must be > 0.")
         return value
 
+    @model_validator(mode="after")
+    def _validate_runtime(self) -> GepaConfig:
+        if self.runtime == "steady_state" and (
+            self.validation_policy == "sparse" or self.validation_racing
+        ):
+            raise ValueError(
+                'runtime="steady_state" validates candidates fully in the background; '
+                'validation_policy="sparse" and validation_racing are not supported.'
+            )
+        return self
+
 
 class GepaState(BaseModel):
     """Shared mutable state that flows through the GEPA graph steps."""
@@ -252,6 +332,10 @@ class GepaState(BaseModel):
         default=False,
         description="Whether the most recent reflection or merge was accepted.",
     )
+    pending_validation: list[int] = Field(
+        default_factory=list,
+        description="Accepted candidates awaiting validation, in acceptance order.",
+    )
     merge_scheduled: int = Field(
         default=0,
         description="Number of pending merge operations left to schedule after acceptance.",
@@ -276,6 +360,10 @@ class GepaState(BaseModel):
         default=0,
         description="Number of full validation passes that have been executed.",
     )
+    raced_validations: int = Field(
+        default=0,
+        description="Validation passes stopped early by validation_racing.",
+    )
 
     best_candidate_idx: int | None = Field(
         default=None,
@@ -285,6 +373,15 @@ class GepaState(BaseModel):
         default=None, description="Validation score for the current best candidate."
     )
 
+    case_results: CaseResultStore = Field(
+        default_factory=CaseResultStore,
+        exclude=True,
+        description=(
+            "Latest rollout per (candidate, training data id), with its trajectory "
+            "when one was captured."
+        ),
+    )
+
     config: GepaConfig = Field(
         ..., description="Immutable configuration that governs the optimization run."
     )
@@ -389,23 +486,25 @@ class GepaState(BaseModel):
         return self.candidates[self.best_candidate_idx]
 
     def recompute_best_candidate(self) -> CandidateProgram | None:
-        """Recalculate the best candidate based on validation scores."""
-        best_idx = None
-        best_score = float("-inf")
-        best_coverage = -1
+        """Recalculate the best candidate based on validation scores.
 
+        Candidates are compared on the validation instances both have been
+        scored on, so one with sparse coverage only takes over by beating the
+        incumbent on that shared subset. Ties go to the wider coverage.
+        """
+        best_idx = None
         for idx, candidate in enumerate(self.candidates):
-            if not candidate.validation_scores:
+            if not candidate.validation_scores or candidate.validation_raced_out:
+                # Raced-out candidates were stopped once they provably could not
+                # beat the best, so their partial average is not comparable.
                 continue
-            coverage = candidate.coverage
-            avg = candidate.avg_validation_score
-            if avg > best_score or (avg == best_score and coverage > best_coverage):
-                best_score = avg
+            if best_idx is None or _outranks(candidate, self.candidates[best_idx]):
                 best_idx = idx
-                best_coverage = coverage
 
         self.best_candidate_idx = best_idx
-        self.best_score = None if best_idx is None else best_score
+        self.best_score = (
+            None if best_idx is None else self.candidates[best_idx].avg_validation_score
+        )
         return self.get_best_candidate()
 
     def schedule_merge(self, count: int) -> None:
@@ -418,6 +517,10 @@ class GepaState(BaseModel):
         """Increment counters for each merge attempt."""
         self.merge_attempts += 1
 
+    def shares_case_ids(self) -> bool:
+        """Whether validation data ids name the same cases as training data ids."""
+        return self.validation_set is None or self.validation_set is self.training_set
+
     def budget_remaining(self) -> int:
         """Return the number of evaluations remaining in the budget."""
         remaining = self.config.max_evaluations - self.total_evaluations
@@ -451,3 +554,23 @@ class GepaState(BaseModel):
                     error_kind=output.error_kind,
                 )
             )
+
+
+def _outranks(challenger: CandidateProgram, incumbent: CandidateProgram) -> bool:
+    shared = challenger.validation_scores.keys() & incumbent.validation_scores.keys()
+    if shared:
+        challenger_avg = _shared_average(challenger, shared)
+        incumbent_avg = _shared_average(incumbent, shared)
+    else:
+        challenger_avg = challenger.avg_validation_score
+        incumbent_avg = incumbent.avg_validation_score
+    if challenger_avg != incumbent_avg:
+        return challenger_avg > incumbent_avg
+    if challenger.coverage != incumbent.coverage:
+        return challenger.coverage > incumbent.coverage
+    return challenger.avg_validation_score > incumbent.avg_validation_score
+
+
+def _shared_average(candidate: CandidateProgram, data_ids: Iterable[str]) -> float:
+    scores = [candidate.validation_scores[data_id] for data_id in sorted(data_ids)]
+    return sum(scores) / len(scores)
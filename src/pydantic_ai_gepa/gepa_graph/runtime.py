@@ -41,7 +41,8 @@ async def optimize(
         seed_candidate: Mapping of component names to their initial text. Required unless
             already attached to ``deps``.
         deps: Preconstructed dependency bundle; ``create_deps`` used when omitted.
-        graph: Custom graph definition; ``create_gepa_graph`` used when omitted.
+        graph: Custom graph definition; ``create_gepa_graph`` used when omitted. Not
+            used when ``config.runtime`` is ``"steady_state"``.
         show_progress: When True, display a Rich progress bar that tracks the evaluation budget.
     """
 
@@ -80,15 +81,20 @@ async def optimize(
 
     resolved_graph = graph if graph is not None else create_gepa_graph(config=config)
     training_loader = await resolve_dataset(trainset, name="trainset")
-    validation_loader = (
-        await resolve_dataset(valset, name="valset") if valset is not None else None
-    )
+    if valset is None or valset is trainset:
+        # One loader lets validation and reflection share per-case results.
+        validation_loader = None
+    else:
+        validation_loader = await resolve_dataset(valset, name="valset")
 
     state = GepaState(
         config=config,
         training_set=training_loader,
         validation_set=validation_loader,
     )
+    cache_manager = getattr(adapter, "cache_manager", None)
+    if cache_manager is not None:
+        cache_manager.set_run_id(state.run_id)
     run_output = None
     try:
         with OptimizationProgress(
@@ -96,19 +102,38 @@ async def optimize(
             description="GEPA optimize",
             enabled=show_progress,
         ) as progress_bar:
-            previous_node_name: str | None = None
-            async with resolved_graph.iter(state=state, deps=resolved_deps) as run:
-                async for event in run:
-                    current_node_name = _describe_event(resolved_graph, event)
+            if config.runtime == "steady_state":
+                from .steady_state import run_steady_state
+
+                def on_step(step: str) -> None:
                     progress_bar.update(
                         state.total_evaluations,
-                        current_node=current_node_name,
-                        previous_node=previous_node_name,
+                        previous_node=step,
                         best_score=state.best_score,
                     )
-                    if current_node_name:
-                        previous_node_name = current_node_name
-                run_output = run.output
+                    if cache_manager is not None:
+                        cache_manager.emit_metrics(node=step)
+
+                run_output = await run_steady_state(
+                    state, resolved_deps, on_step=on_step
+                )
+            else:
+                previous_node_name: str | None = None
+                async with resolved_graph.iter(state=state, deps=resolved_deps) as run:
+                    async for event in run:
+                        current_node_name = _describe_event(resolved_graph, event)
+                        progress_bar.update(
+                            state.total_evaluations,
+                            current_node=current_node_name,
+                            previous_node=previous_node_name,
+                            best_score=state.best_score,
+                        )
+                        if cache_manager is not None and previous_node_name:
+                            # The previous step has finished; report its cache activity.
+                            cache_manager.emit_metrics(node=previous_node_name)
+                        if current_node_name:
+                            previous_node_name = current_node_name
+                    run_output = run.output
             progress_bar.update(
                 state.total_evaluations,
                 best_score=state.best_score,
@@ -123,6 +148,10 @@ async def optimize(
             total_evaluations=state.total_evaluations,
         )
         return GepaResult.from_state(state)
+    finally:
+        if cache_manager is not None:
+            # Persist write-behind cache entries before returning.
+            await cache_manager.aflush()
 
     if run_output is None:
         raise RuntimeError("GEPA graph run did not complete.")
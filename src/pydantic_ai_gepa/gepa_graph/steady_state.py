@@ -0,0 +1,238 @@
+"""Steady-state runtime - overlaps candidate validation with reflection.
+
+The graph runtime validates every accepted candidate before the next
+reflection starts, although reflection only needs minibatch data. This runtime
+hands accepted candidates to a pool of validation workers and keeps reflecting
+from the current Pareto state.
+
+Workers never touch ``GepaState``. The loop is the single writer: it folds
+validation results in acceptance order, and only at iteration boundaries fixed
+in advance. A candidate accepted in iteration ``k`` is applied right before
+iteration ``k + 1 + validation_workers`` starts, after waiting for it if
+needed. Every iteration therefore sees the same state regardless of how long
+the rollouts took, and a seeded run is reproducible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import logfire
+from opentelemetry import context as otel_context, trace
+from opentelemetry.trace import SpanContext
+from pydantic_graph.beta import StepContext
+
+from .deps import GepaDeps
+from .evaluation import EvaluationResults
+from .models import GepaResult, GepaState
+from .steps import StopSignal, continue_step, evaluate_step, merge_step, start_step
+from .steps.evaluate import apply_validation, validate_detached
+from .steps.reflect import run_reflection
+
+# Enclosing span name -> (attribute naming the candidate, trace subdirectory).
+_TRACE_OWNERS = {
+    "evaluate first minibatch": ("parent_idx", "traces"),
+    "propose new texts": ("parent_idx", "reflector_traces"),
+    "validate candidate": ("candidate_idx", "traces"),
+}
+
+
+@dataclass(slots=True)
+class _PendingValidation:
+    iteration: int
+    candidate_idx: int
+    task: asyncio.Task[EvaluationResults[str]]
+
+
+class _ValidationPool:
+    """Background validations, retired by the writer in submission order."""
+
+    def __init__(self, state: GepaState, deps: GepaDeps) -> None:
+        self._state = state
+        self._deps = deps
+        self._slots = asyncio.Semaphore(state.config.validation_workers)
+        self._queue: deque[_PendingValidation] = deque()
+        self.open_traces: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, iteration: int) -> None:
+        """Start validating every queued candidate not already in flight."""
+        launched = {pending.candidate_idx for pending in self._queue}
+        for candidate_idx in self._state.pending_validation:
+            if candidate_idx in launched:
+                continue
+            task = asyncio.create_task(
+                self._validate(
+                    candidate_idx, trace.get_current_span().get_span_context()
+                )
+            )
+            self._queue.append(_PendingValidation(iteration, candidate_idx, task))
+
+    def reserved_evaluations(self) -> int:
+        """Evaluations in-flight validations will charge once applied."""
+        loader = self._state.validation_set
+        return len(self._queue) * (len(loader) if loader is not None else 0)
+
+    async def retire(self, *, upto: int | None = None) -> None:
+        """Apply validations submitted at or before ``upto`` (all when ``None``)."""
+        while self._queue and (upto is None or self._queue[0].iteration <= upto):
+            pending = self._queue[0]
+            results = await pending.task
+            self._queue.popleft()
+            candidate = self._state.candidates[pending.candidate_idx]
+            apply_validation(self._state, self._deps, candidate, results)
+            if pending.candidate_idx in self._state.pending_validation:
+                self._state.pending_validation.remove(pending.candidate_idx)
+
+    async def cancel(self) -> None:
+        for pending in self._queue:
+            pending.task.cancel()
+        await asyncio.gather(
+            *(pending.task for pending in self._queue), return_exceptions=True
+        )
+        self._queue.clear()
+
+    async def _validate(
+        self, candidate_idx: int, submitted_from: SpanContext
+    ) -> EvaluationResults[str]:
+        async with self._slots:
+            candidate = self._state.candidates[candidate_idx]
+            # Root the validation in its own trace, linked back to the loop, so
+            # its spans can be told apart from the writer's while it runs.
+            token = otel_context.attach(otel_context.Context())
+            try:
+                with logfire.span(
+                    "validate candidate",
+                    candidate_idx=candidate_idx,
+                    _links=[(submitted_from, None)] if submitted_from.is_valid else (),
+                ):
+                    trace_id = trace.get_current_span().get_span_context().trace_id
+                    self.open_traces.add(trace_id)
+                    try:
+                        return await validate_detached(
+                            self._state, self._deps, candidate
+                        )
+                    finally:
+                        self.open_traces.discard(trace_id)
+            finally:
+                otel_context.detach(token)
+
+
+async def run_steady_state(
+    state: GepaState,
+    deps: GepaDeps,
+    *,
+    on_step: Callable[[str], None] | None = None,
+) -> GepaResult:
+    """Run GEPA to completion with background validation.
+
+    Args:
+        state: Fresh or checkpoint-restored state; ``config.runtime`` is not consulted.
+        deps: Dependency bundle shared with the graph runtime.
+        on_step: Called with the name of every step the loop has just finished.
+    """
+    ctx = StepContext(state=state, deps=deps, inputs=None)
+    pool = _ValidationPool(state, deps)
+    lag = state.config.validation_workers
+
+    def finished(step: str) -> None:
+        _route_traces(deps, state, open_traces=pool.open_traces)
+        if on_step is not None:
+            on_step(step)
+
+    await start_step(ctx)
+    finished("StartStep")
+    # Selection needs a validated seed, so the first validation runs inline.
+    await evaluate_step(ctx)
+    finished("EvaluateStep")
+    try:
+        while True:
+            await pool.retire(upto=state.iteration - lag)
+            reserved = pool.reserved_evaluations()
+            if reserved and (
+                state.total_evaluations + reserved >= state.config.max_evaluations
+            ):
+                # Settle the budget before deciding whether to go on.
+                await pool.retire()
+            action = await continue_step(ctx)
+            if isinstance(action, StopSignal):
+                break
+            if action == "merge":
+                await merge_step(ctx)
+                finished("MergeStep")
+            else:
+                await run_reflection(state, deps, defer_traces=True)
+                finished("ReflectStep")
+            pool.submit(state.iteration)
+            logfire.debug(
+                "SteadyState iteration finished",
+                iteration=state.iteration,
+                validations_in_flight=len(pool),
+                total_evaluations=state.total_evaluations,
+            )
+        await pool.retire()
+    finally:
+        await pool.cancel()
+    finished("EvaluateStep")
+    return GepaResult.from_state(state)
+
+
+def _route_traces(
+    deps: GepaDeps,
+    state: GepaState,
+    *,
+    open_traces: set[int],
+) -> None:
+    """Write finished spans under the candidate whose work produced them.
+
+    Each span is attributed through its nearest enclosing owner span (see
+    ``_TRACE_OWNERS``). Spans of a validation that is still running go back to
+    the exporter for a later pass; spans outside any owner are dropped.
+    """
+    exporter = deps.memory_exporter
+    if exporter is None:
+        return
+    spans = exporter.get_finished_spans()
+    exporter.clear()
+    if not spans:
+        return
+    from ..proposal.trace_store import span_to_jsonl_line
+
+    by_id = {span.context.span_id: span for span in spans if span.context}
+    lines: dict[tuple[int, str], list[str]] = {}
+    unfinished = []
+    for span in spans:
+        if span.context and span.context.trace_id in open_traces:
+            unfinished.append(span)
+            continue
+        owner = span
+        while owner is not None and (owner is span or owner.name not in _TRACE_OWNERS):
+            parent_ctx = owner.parent
+            owner = by_id.get(parent_ctx.span_id) if parent_ctx else None
+        if owner is None or not owner.attributes:
+            continue
+        attribute, subdir = _TRACE_OWNERS[owner.name]
+        candidate_idx = owner.attributes.get(attribute)
+        if isinstance(candidate_idx, int):
+            lines.setdefault((candidate_idx, subdir), []).append(
+                span_to_jsonl_line(span)
+            )
+
+    for (candidate_idx, subdir), candidate_lines in lines.items():
+        target_dir = Path(
+            f".gepa_cache/runs/{state.run_id}/candidates/{candidate_idx}/{subdir}"
+        )
+        target_dir.mkdir(parents=True, exist_ok=True)
+        with open(target_dir / "traces.jsonl", "a", encoding="utf-8") as f:
+            f.writelines(candidate_lines)
+    if unfinished:
+        exporter.export(unfinished)
+
+
+__all__ = ["run_steady_state"]
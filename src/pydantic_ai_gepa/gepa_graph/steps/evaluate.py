@@ -1,37 +1,69 @@
-"""Evaluate step - runs full validation for the latest candidate."""
+"""Evaluate step - validates the latest candidate (fully or sparsely)."""
 
 from __future__ import annotations
 
-from typing import Any, Sequence
+import math
+import random
+from contextlib import aclosing
+from typing import Any, Collection, Sequence
 
 import logfire
 from pydantic_graph.beta import StepContext
 
 from pydantic_evals import Case
+from ..datasets import DataLoader, data_id_for_instance
 from ..deps import GepaDeps
-from ..evaluation import EvaluationResults
+from ..evaluation import EvaluationResults, EvaluationSample
+from ..evaluation.pareto import SCORE_EPSILON
 from ..models import CandidateProgram, GepaState
 
 
 async def evaluate_step(ctx: StepContext[GepaState, GepaDeps, None]) -> None:
-    """Evaluate the most recent candidate on the validation set."""
+    """Evaluate newly accepted candidates on the validation set.
+
+    Candidates queued in ``GepaState.pending_validation`` are validated in
+    acceptance order; with an empty queue, the most recent candidate is.
+    """
 
+    state = ctx.state
+    queued = list(state.pending_validation) or [_current_candidate(state).idx]
+    for candidate_idx in queued:
+        await _evaluate_candidate(ctx, state.candidates[candidate_idx])
+        if candidate_idx in state.pending_validation:
+            state.pending_validation.remove(candidate_idx)
+
+    return None
+
+
+async def _evaluate_candidate(
+    ctx: StepContext[GepaState, GepaDeps, None],
+    candidate: CandidateProgram,
+) -> None:
     state = ctx.state
     previous_best_idx = state.best_candidate_idx
     previous_best_score = state.best_score
-    candidate = _current_candidate(state)
-    validation_batch = await _get_validation_batch(state)
+    loader = _validation_loader(state)
+    sparse = state.config.validation_policy == "sparse"
 
+    candidate.validation_raced_out = False
     with logfire.span(
         "evaluate candidate",
         candidate_idx=candidate.idx,
-        validation_batch_size=len(validation_batch),
+        validation_set_size=len(loader),
+        validation_policy=state.config.validation_policy,
     ):
-        results = await ctx.deps.evaluator.evaluate_batch(
-            candidate=candidate,
-            batch=validation_batch,
-            adapter=ctx.deps.adapter,
-            max_concurrent=state.config.max_concurrent_evaluations,
+        if sparse:
+            scores = await _validate_sparse(ctx, candidate, loader)
+        else:
+            scores = await _validate_full(ctx, candidate, loader)
+
+    if candidate.validation_raced_out:
+        logfire.info(
+            "EvaluateStep stopped validation early",
+            candidate_idx=candidate.idx,
+            evaluated=len(scores),
+            skipped=len(loader) - len(scores),
+            best_score=state.best_score,
         )
 
     # Serialize traces to disk if memory_exporter is available
@@ -54,23 +86,83 @@ async def evaluate_step(ctx: StepContext[GepaState, GepaDeps, None]) -> None:
 
         ctx.deps.memory_exporter.clear()
 
-    state.record_evaluation_errors(
-        candidate_idx=candidate.idx,
-        stage="validation",
-        data_ids=results.data_ids,
-        outputs=results.outputs,
+    _finish_validation(
+        state,
+        ctx.deps,
+        candidate,
+        scores,
+        complete=not sparse or candidate.coverage >= len(loader),
+        previous_best_idx=previous_best_idx,
+        previous_best_score=previous_best_score,
+    )
+
+
+async def validate_detached(
+    state: GepaState,
+    deps: GepaDeps,
+    candidate: CandidateProgram,
+) -> EvaluationResults[str]:
+    """Score ``candidate`` on the whole validation set without touching state.
+
+    Used by the steady-state runtime, whose single writer folds the results in
+    later with :func:`apply_validation`.
+    """
+    loader = _validation_loader(state)
+    batch = await loader.fetch(list(await loader.all_ids()))
+    return await deps.evaluator.evaluate_batch(
+        candidate=candidate,
+        batch=batch,
+        adapter=deps.adapter,
+        max_concurrent=state.config.max_concurrent_evaluations,
+        data_ids=[
+            data_id_for_instance(case, index) for index, case in enumerate(batch)
+        ],
+    )
+
+
+def apply_validation(
+    state: GepaState,
+    deps: GepaDeps,
+    candidate: CandidateProgram,
+    results: EvaluationResults[str],
+) -> None:
+    """Fold results from :func:`validate_detached` into state."""
+    previous_best_idx = state.best_candidate_idx
+    previous_best_score = state.best_score
+    candidate.validation_raced_out = False
+    for data_id, score, output in results:
+        _apply_sample(state, deps, candidate, EvaluationSample(data_id, score, output))
+    _finish_validation(
+        state,
+        deps,
+        candidate,
+        list(results.scores),
+        complete=True,
+        previous_best_idx=previous_best_idx,
+        previous_best_score=previous_best_score,
     )
-    validation_total, validation_avg = _summarize_scores(results.scores)
+
+
+def _finish_validation(
+    state: GepaState,
+    deps: GepaDeps,
+    candidate: CandidateProgram,
+    scores: Sequence[float],
+    *,
+    complete: bool,
+    previous_best_idx: int | None,
+    previous_best_score: float | None,
+) -> None:
+    validation_total, validation_avg = _summarize_scores(scores)
     logfire.debug(
         "EvaluateStep validation results",
         candidate_idx=candidate.idx,
         validation_total=validation_total,
         validation_average=validation_avg,
-        evaluation_count=len(results.scores),
+        evaluation_count=len(scores),
+        coverage=candidate.coverage,
     )
 
-    _apply_results(candidate, results)
-    ctx.deps.pareto_manager.update_fronts(state, candidate.idx, results)
     state.recompute_best_candidate()
     new_best_idx = state.best_candidate_idx
     new_best_score = state.best_score
@@ -89,11 +181,11 @@ async def evaluate_step(ctx: StepContext[GepaState, GepaDeps, None]) -> None:
             best_candidate_idx=new_best_idx,
             best_score=new_best_score,
         )
-    state.total_evaluations += len(results.data_ids)
-    state.full_validations += 1
-    _hydrate_missing_components(candidate, ctx.deps)
-
-    return None
+    if candidate.validation_raced_out:
+        state.raced_validations += 1
+    elif complete:
+        state.full_validations += 1
+    _hydrate_missing_components(candidate, deps)
 
 
 def _current_candidate(state: GepaState) -> CandidateProgram:
@@ -102,25 +194,199 @@ def _current_candidate(state: GepaState) -> CandidateProgram:
     return state.candidates[-1]
 
 
-async def _get_validation_batch(state: GepaState) -> list[Case[Any, Any, Any]]:
+def _validation_loader(state: GepaState) -> DataLoader[Any, Case[Any, Any, Any]]:
     loader = state.validation_set
     if loader is None or len(loader) == 0:
         raise ValueError(
             "GepaState.validation_set must be populated before evaluation."
         )
+    return loader
+
+
+async def _validate_full(
+    ctx: StepContext[GepaState, GepaDeps, None],
+    candidate: CandidateProgram,
+    loader: DataLoader[Any, Case[Any, Any, Any]],
+) -> list[float]:
+    batch = await loader.fetch(list(await loader.all_ids()))
+    racing = ctx.state.config.validation_racing and ctx.state.best_score is not None
+    return await _stream_validation(
+        ctx,
+        candidate,
+        batch,
+        [data_id_for_instance(case, index) for index, case in enumerate(batch)],
+        racing=racing,
+    )
+
+
+async def _validate_sparse(
+    ctx: StepContext[GepaState, GepaDeps, None],
+    candidate: CandidateProgram,
+    loader: DataLoader[Any, Case[Any, Any, Any]],
+) -> list[float]:
+    """Score a spread-out subset, widening it while the candidate keeps up.
+
+    Every candidate walks the same stratified order, so coverages are nested
+    prefixes and any two candidates can be compared on the smaller one.
+    """
+    config = ctx.state.config
     ids = list(await loader.all_ids())
-    return await loader.fetch(ids)
+    order = _stratified_order(len(ids), config.seed)
+    target = max(1, math.ceil(config.sparse_validation_fraction * len(ids)))
+    scored_upto = 0
+    scores: list[float] = []
+    while True:
+        positions = order[scored_upto:target]
+        cases = await loader.fetch([ids[position] for position in positions])
+        pending = [
+            (data_id_for_instance(case, position), case)
+            for position, case in zip(positions, cases)
+        ]
+        pending = [
+            (data_id, case)
+            for data_id, case in pending
+            if data_id not in candidate.validation_scores
+        ]
+        if pending:
+            scores += await _stream_validation(
+                ctx,
+                candidate,
+                [case for _, case in pending],
+                [data_id for data_id, _ in pending],
+                racing=False,
+            )
+        scored_upto = target
+        if target >= len(ids) or not _keeps_up(ctx.state, candidate):
+            return scores
+        target = min(
+            len(ids),
+            max(target + 1, math.ceil(target * config.sparse_validation_growth)),
+        )
+
+
+async def _stream_validation(
+    ctx: StepContext[GepaState, GepaDeps, None],
+    candidate: CandidateProgram,
+    batch: Sequence[Case[Any, Any, Any]],
+    data_ids: Sequence[str],
+    *,
+    racing: bool,
+) -> list[float]:
+    state = ctx.state
+    pending = set(data_ids)
+    scores: list[float] = []
+    # Fold each case into the candidate, Pareto fronts, error log and budget
+    # as soon as it finishes instead of waiting for the slowest one. Cases are
+    # dispatched in order, so a raced-out pass covers (roughly) a prefix.
+    stream = ctx.deps.evaluator.evaluate_stream(
+        candidate=candidate,
+        batch=batch,
+        adapter=ctx.deps.adapter,
+        max_concurrent=state.config.max_concurrent_evaluations,
+        data_ids=data_ids,
+    )
+    async with aclosing(stream):
+        async for sample in stream:
+            _apply_sample(state, ctx.deps, candidate, sample)
+            scores.append(sample.score)
+            pending.discard(sample.data_id)
+            if racing and pending and _cannot_win(state, candidate, pending):
+                candidate.validation_raced_out = True
+                break
+    return scores
+
+
+def _stratified_order(count: int, seed: int) -> list[int]:
+    """Dataset positions ordered so every prefix is spread across the dataset.
+
+    Positions are sorted by their bit-reversed value (0, n/2, n/4, 3n/4, ...)
+    and rotated by a seeded offset, so a prefix of length ``k`` takes about one
+    case from each of ``k`` equal slices of the validation set.
+    """
+    if count == 0:
+        return []
+    bits = max(1, (count - 1).bit_length())
+    offset = random.Random(seed).randrange(count)
+    spread = sorted(range(count), key=lambda position: _bit_reverse(position, bits))
+    return [(position + offset) % count for position in spread]
 
 
-def _apply_results(
-    candidate: CandidateProgram, results: EvaluationResults[str]
+def _bit_reverse(value: int, bits: int) -> int:
+    return int(format(value, f"0{bits}b")[::-1], 2)
+
+
+def _keeps_up(state: GepaState, candidate: CandidateProgram) -> bool:
+    """Whether ``candidate`` matches the best candidate on their shared cases."""
+    best = state.get_best_candidate()
+    if best is None or best is candidate:
+        return True
+    shared = candidate.validation_scores.keys() & best.validation_scores.keys()
+    if not shared:
+        return True
+    candidate_total = sum(candidate.validation_scores[data_id] for data_id in shared)
+    best_total = sum(best.validation_scores[data_id] for data_id in shared)
+    return candidate_total + SCORE_EPSILON * len(shared) >= best_total
+
+
+def _apply_sample(
+    state: GepaState,
+    deps: GepaDeps,
+    candidate: CandidateProgram,
+    sample: EvaluationSample,
 ) -> None:
-    for data_id, score, output in results:
-        candidate.record_validation(
-            data_id=data_id,
-            score=score,
-            output=output,
+    state.record_evaluation_errors(
+        candidate_idx=candidate.idx,
+        stage="validation",
+        data_ids=[sample.data_id],
+        outputs=[sample.output],
+    )
+    candidate.record_validation(
+        data_id=sample.data_id,
+        score=sample.score,
+        output=sample.output,
+    )
+    deps.pareto_manager.record_result(
+        state, candidate.idx, sample.data_id, sample.score, sample.output
+    )
+    if state.shares_case_ids():
+        state.case_results.record(
+            candidate.idx, sample.data_id, sample.score, sample.output
         )
+    state.total_evaluations += 1
+
+
+def _cannot_win(
+    state: GepaState,
+    candidate: CandidateProgram,
+    pending: Collection[str],
+) -> bool:
+    """Whether ``candidate`` is provably out of the race for best and Pareto.
+
+    Scores are bounded by ``perfect_score``, so even perfect results on every
+    pending case must leave the average below ``best_score``, every pending
+    Pareto entry must already hold a perfect score (the best the candidate
+    could do there is tie), and the candidate must not already be sole best on
+    an instance it has covered.
+    """
+    best_score = state.best_score
+    if best_score is None:
+        return False
+    perfect = state.config.perfect_score
+    total = len(candidate.validation_scores) + len(pending)
+    upper_bound = (
+        sum(candidate.validation_scores.values()) + perfect * len(pending)
+    ) / total
+    if upper_bound >= best_score:
+        return False
+    for data_id in pending:
+        entry = state.pareto_front.get(data_id)
+        if entry is None or entry.best_score < perfect:
+            return False
+    return not any(
+        state.pareto_front[data_id].candidate_indices == {candidate.idx}
+        for data_id in candidate.validation_scores
+        if data_id in state.pareto_front
+    )
 
 
 def _summarize_scores(scores: Sequence[float]) -> tuple[float, float]:
@@ -154,4 +420,4 @@ def _hydrate_missing_components(
     deps.seed_candidate = updated_seed
 
 
-__all__ = ["evaluate_step"]
+__all__ = ["apply_validation", "evaluate_step", "validate_detached"]
@@ -95,7 +95,11 @@ async def merge_step(ctx: StepContext[GepaState, GepaDeps, None]) -> IterationAc
     merged_total = sum(merged_results.scores)
     baseline_total = max(sum(parent1_scores), sum(parent2_scores))
     if merged_total >= baseline_total:
-        state.add_candidate(merged_candidate)
+        merged_candidate = state.add_candidate(merged_candidate)
+        if state.shares_case_ids():
+            for data_id, score, output in merged_results:
+                state.case_results.record(merged_candidate.idx, data_id, score, output)
+        state.pending_validation.append(merged_candidate.idx)
         state.last_accepted = True
         if state.merge_scheduled > 0:
             state.merge_scheduled -= 1
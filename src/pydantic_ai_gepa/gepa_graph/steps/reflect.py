@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import difflib
 import hashlib
 import inspect
 import re
-from typing import Any, Mapping, Sequence, cast
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence, cast
 
 import logfire
 from pydantic_graph.beta import StepContext
@@ -23,9 +25,16 @@ from ...adapter import (
 )
 from ...evaluation_models import EvaluationBatch
 from pydantic_evals import Case
+from ..datasets import data_id_for_instance
 from ..deps import GepaDeps
 from ..evaluation import EvaluationResults
-from ..models import CandidateMap, CandidateProgram, ComponentValue, GepaState
+from ..models import (
+    CandidateMap,
+    CandidateProgram,
+    CaseResult,
+    ComponentValue,
+    GepaState,
+)
 from ..proposal.instruction import ProposalResult
 from ...skill_components import (
     apply_candidate_to_skills,
@@ -41,7 +50,7 @@ from ...skills.models import (
     SkillSummary,
 )
 from ...skills.search import LocalSkillsSearchProvider
-from ...types import DEFAULT_MAX_SPAWNED_AGENTS
+from ...types import DEFAULT_MAX_SPAWNED_AGENTS, RolloutOutput, Trajectory
 from .continue_step import IterationAction
 
 _IMPROVEMENT_EPSILON = 1e-9
@@ -56,36 +65,257 @@ def _hash_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+@dataclass(slots=True)
+class _Lane:
+    """One parent -> reflection -> minibatch evaluation, run beside others."""
+
+    index: int
+    parent_idx: int
+    parent: CandidateProgram
+    minibatch: list[Case[Any, Any, Any]]
+    parent_results: EvaluationResults[str] | None = None
+    # Minibatch positions served from GepaState.case_results instead of a rollout.
+    parent_reused: frozenset[int] = frozenset()
+    components_to_update: Sequence[str] | None = None
+    components_for_dataset: Sequence[str] = ()
+    component_toolsets: list[AbstractToolset[None]] = field(default_factory=list)
+    candidate: CandidateProgram | None = None
+    candidate_results: EvaluationResults[str] | None = None
+
+
 async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> IterationAction:
-    """Generate and evaluate reflective mutations for the current candidate."""
+    """Generate and evaluate reflective mutations for the current candidate.
+
+    With ``enable_parallel_reflection`` and ``reflection_parallelism`` above
+    one, several lanes run per iteration. Parents, minibatches and components
+    are chosen lane by lane so seeded selectors stay deterministic; the
+    minibatch evaluations and reflection calls then run concurrently, and
+    improved candidates are accepted in lane order and queued in
+    ``GepaState.pending_validation``.
+    """
+
+    return await run_reflection(ctx.state, ctx.deps)
+
+
+async def run_reflection(
+    state: GepaState,
+    deps: GepaDeps,
+    *,
+    defer_traces: bool = False,
+) -> IterationAction:
+    """Run one iteration's reflection lanes against ``state``.
+
+    With ``defer_traces`` the finished spans are left in the memory exporter
+    for the caller to route, as the steady-state runtime does while background
+    validations are still producing spans of their own.
+    """
+    lanes: list[_Lane] = []
+    for index in range(_lane_count(state)):
+        parent_idx, parent = _select_parent(state, deps)
+        minibatch = await _sample_minibatch(state, deps)
+        lanes.append(
+            _Lane(
+                index=index,
+                parent_idx=parent_idx,
+                parent=parent,
+                minibatch=minibatch,
+            )
+        )
+    parallel = len(lanes) > 1
+    flush_traces = not (parallel or defer_traces)
+    if parallel:
+        # Lanes sharing a parent must not edit the same example bank.
+        for lane in lanes:
+            if lane.parent.example_bank is not None:
+                lane.parent = lane.parent.model_copy(
+                    update={"example_bank": lane.parent.example_bank.copy()}
+                )
+
+    await asyncio.gather(
+        *(
+            _evaluate_parent(deps, state, lane, flush_traces=flush_traces)
+            for lane in lanes
+        )
+    )
+    if parallel and not defer_traces:
+        _route_spans(deps, state, span_name="evaluate first minibatch", subdir="traces")
+
+    reflecting = [lane for lane in lanes if _record_parent_results(state, lane)]
+    if not reflecting:
+        state.last_accepted = False
+        return "continue"
+
+    reflection_model = _resolve_model(deps)
+    for lane in reflecting:
+        await _prepare_reflection(state, deps, lane, reflection_model)
+
+    await asyncio.gather(
+        *(
+            _propose_and_evaluate(
+                deps, state, lane, reflection_model, flush_traces=flush_traces
+            )
+            for lane in reflecting
+        )
+    )
+    if parallel and not defer_traces:
+        _route_spans(
+            deps, state, span_name="propose new texts", subdir="reflector_traces"
+        )
 
-    state = ctx.state
-    deps = ctx.deps
+    accepted = [
+        candidate
+        for lane in reflecting
+        if (candidate := _accept_if_improved(state, lane)) is not None
+    ]
+    state.last_accepted = bool(accepted)
+    if not accepted:
+        return "continue"
+    for candidate in accepted:
+        state.pending_validation.append(candidate.idx)
+        state.schedule_merge(state.config.merges_per_accept)
+    return "evaluate"
+
+
+def _lane_count(state: GepaState) -> int:
+    config = state.config
+    if not config.enable_parallel_reflection or config.reflection_parallelism <= 1:
+        return 1
+    # Each lane spends up to two minibatch evaluations; don't open lanes the
+    # remaining budget cannot pay for.
+    affordable = state.budget_remaining() // (2 * config.minibatch_size)
+    return max(1, min(config.reflection_parallelism, affordable))
 
-    parent_idx, parent = _select_parent(state, deps)
-    minibatch = await _sample_minibatch(state, deps)
+
+async def _evaluate_parent(
+    deps: GepaDeps,
+    state: GepaState,
+    lane: _Lane,
+    *,
+    flush_traces: bool,
+) -> None:
+    stored = _stored_parent_results(state, lane)
+    missing = [
+        position for position in range(len(lane.minibatch)) if position not in stored
+    ]
     with logfire.span(
         "evaluate first minibatch",
-        parent_idx=parent_idx,
-        component_versions=_component_versions(parent),
-        minibatch_size=len(minibatch),
+        parent_idx=lane.parent_idx,
+        component_versions=_component_versions(lane.parent),
+        minibatch_size=len(lane.minibatch),
+        reused=len(stored),
+        lane=lane.index,
     ):
-        parent_results = await _evaluate_minibatch(
-            deps=deps,
-            state=state,
-            candidate=parent,
-            batch=minibatch,
-            capture_traces=True,
-        )
+        fresh = None
+        if missing:
+            fresh = await _evaluate_minibatch(
+                deps=deps,
+                state=state,
+                candidate=lane.parent,
+                batch=[lane.minibatch[position] for position in missing],
+                data_ids=[
+                    data_id_for_instance(lane.minibatch[position], position)
+                    for position in missing
+                ],
+                capture_traces=True,
+                flush_traces=flush_traces,
+            )
+    lane.parent_reused = frozenset(stored)
+    lane.parent_results = _merge_parent_results(lane.minibatch, stored, fresh)
+
+
+def _stored_parent_results(state: GepaState, lane: _Lane) -> dict[int, CaseResult]:
+    """Stored parent results usable for the lane's minibatch, by position.
+
+    Reflection needs traces, so only traced results count, unless every case
+    is stored and perfect: reflection will then be skipped anyway.
+    """
+    if not state.config.reuse_case_results:
+        return {}
+    stored: dict[int, CaseResult] = {}
+    for position, case in enumerate(lane.minibatch):
+        if not case.name:
+            # Unnamed cases have no id that is stable across minibatches.
+            continue
+        result = state.case_results.get(lane.parent_idx, case.name)
+        if result is not None:
+            stored[position] = result
+    if len(stored) == len(lane.minibatch) and _should_skip_perfect(
+        [result.score for result in stored.values()], state
+    ):
+        return stored
+    return {
+        position: result
+        for position, result in stored.items()
+        if result.trajectory is not None
+    }
+
+
+def _merge_parent_results(
+    batch: Sequence[Case[Any, Any, Any]],
+    stored: Mapping[int, CaseResult],
+    fresh: EvaluationResults[str] | None,
+) -> EvaluationResults[str]:
+    if fresh is not None and not stored:
+        return fresh
+    fresh_trajectories = (
+        fresh.trajectories
+        if fresh is not None and fresh.trajectories is not None
+        else [None] * (len(fresh) if fresh is not None else 0)
+    )
+    rows = iter(
+        zip(fresh.data_ids, fresh.scores, fresh.outputs, fresh_trajectories)
+        if fresh is not None
+        else ()
+    )
+    data_ids: list[str] = []
+    scores: list[float] = []
+    outputs: list[RolloutOutput[Any]] = []
+    trajectories: list[Trajectory | None] = []
+    for position, case in enumerate(batch):
+        result = stored.get(position)
+        if result is None:
+            data_id, score, output, trajectory = next(rows)
+        else:
+            data_id = data_id_for_instance(case, position)
+            score, output, trajectory = result.score, result.output, result.trajectory
+        data_ids.append(data_id)
+        scores.append(score)
+        outputs.append(output)
+        trajectories.append(trajectory)
+    return EvaluationResults(
+        data_ids=data_ids,
+        scores=scores,
+        outputs=outputs,
+        trajectories=trajectories,
+    )
 
+
+def _record_parent_results(state: GepaState, lane: _Lane) -> bool:
+    """Fold a lane's parent minibatch into state; return whether to reflect."""
+    parent_idx = lane.parent_idx
+    parent_results = lane.parent_results
+    assert parent_results is not None
+    fresh = [
+        position
+        for position in range(len(parent_results))
+        if position not in lane.parent_reused
+    ]
     state.record_evaluation_errors(
         candidate_idx=parent_idx,
         stage="reflection_parent",
-        data_ids=parent_results.data_ids,
-        outputs=parent_results.outputs,
+        data_ids=[parent_results.data_ids[position] for position in fresh],
+        outputs=[parent_results.outputs[position] for position in fresh],
     )
-    _record_minibatch(parent, parent_results)
-    _increment_budget(state, parent_results)
+    _record_minibatch(state.candidates[parent_idx], parent_results)
+    _store_case_results(state, parent_idx, lane.minibatch, parent_results, fresh)
+    state.total_evaluations += len(fresh)
+    if lane.parent_reused:
+        logfire.debug(
+            "ReflectStep reused stored parent results",
+            parent_idx=parent_idx,
+            reused=len(lane.parent_reused),
+            evaluated=len(fresh),
+        )
     parent_total, parent_avg = _summarize_scores(parent_results.scores)
 
     logfire.debug(
@@ -96,14 +326,6 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
         minibatch_average=parent_avg,
     )
 
-    if not parent_results.has_trajectories():
-        logfire.info(
-            "ReflectStep skipping reflection due to missing trajectories",
-            parent_idx=parent_idx,
-        )
-        state.last_accepted = False
-        return "continue"
-
     if _should_skip_perfect(parent_results.scores, state):
         logfire.info(
             "ReflectStep skipping reflection due to perfect minibatch",
@@ -111,11 +333,28 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
             threshold=state.config.perfect_score,
             minibatch_total=parent_total,
         )
-        state.last_accepted = False
-        return "continue"
+        return False
 
-    reflection_model = _resolve_model(deps)
-    components_to_update: Sequence[str] | None
+    if not parent_results.has_trajectories():
+        logfire.info(
+            "ReflectStep skipping reflection due to missing trajectories",
+            parent_idx=parent_idx,
+        )
+        return False
+    return True
+
+
+async def _prepare_reflection(
+    state: GepaState,
+    deps: GepaDeps,
+    lane: _Lane,
+    reflection_model: Model | KnownModelName | str,
+) -> None:
+    """Build the reflector's toolsets and pick the components to update."""
+    parent_idx = lane.parent_idx
+    parent = lane.parent
+    parent_results = lane.parent_results
+    assert parent_results is not None
     # The reflector's tool catalog is built here: journal tools (when a
     # journal is configured), trace tools (always), the component-selection
     # toolset (when the reflection selector is in use), and finally any
@@ -167,6 +406,7 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
             )
         )
 
+    components_to_update: Sequence[str] | None
     if state.config.component_selector == "reflection":
         components_to_update = None
         components_for_dataset = list(parent.components.keys())
@@ -199,13 +439,32 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
         components_to_update=components_to_update,
         candidate_component_count=len(parent.components),
     )
+    lane.components_to_update = components_to_update
+    lane.components_for_dataset = components_for_dataset
+    lane.component_toolsets = component_toolsets
+
+
+async def _propose_and_evaluate(
+    deps: GepaDeps,
+    state: GepaState,
+    lane: _Lane,
+    reflection_model: Model | KnownModelName | str,
+    *,
+    flush_traces: bool,
+) -> None:
+    """Ask the reflector for new texts and score them on the lane's minibatch."""
+    parent_idx = lane.parent_idx
+    parent = lane.parent
+    parent_results = lane.parent_results
+    components_to_update = lane.components_to_update
+    assert parent_results is not None
 
     reflective_dataset = _build_reflective_dataset(
         deps=deps,
         state=state,
         candidate=parent,
         eval_results=parent_results,
-        components=components_for_dataset,
+        components=lane.components_for_dataset,
     )
     with logfire.span(
         "propose new texts",
@@ -213,6 +472,7 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
         model=reflection_model,
         selector=state.config.component_selector,
         components_to_update=components_to_update,
+        lane=lane.index,
     ):
         proposal_result = await _propose_new_texts(
             deps=deps,
@@ -222,11 +482,11 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
             components=components_to_update,
             model=reflection_model,
             model_settings=deps.model_settings,
-            component_toolsets=component_toolsets if component_toolsets else None,
+            component_toolsets=lane.component_toolsets or None,
         )
 
         # Capture and save the Reflector's own trace data (tool calls, reasoning)
-        if deps.memory_exporter is not None:
+        if flush_traces and deps.memory_exporter is not None:
             from pathlib import Path
 
             spans = deps.memory_exporter.get_finished_spans()
@@ -262,7 +522,6 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
             )
 
     if not proposal_result.texts:
-        state.last_accepted = False
         logfire.info(
             "ReflectStep skipping candidate evaluation due to no-op proposal",
             parent_idx=parent_idx,
@@ -271,7 +530,7 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
                 list(components_to_update) if components_to_update is not None else None
             ),
         )
-        return "continue"
+        return
 
     new_candidate = _create_candidate(
         state=state,
@@ -296,14 +555,26 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
         "evaluate new candidate",
         candidate_idx=new_candidate.idx,
         parent_idx=parent_idx,
+        lane=lane.index,
     ):
-        new_results = await _evaluate_minibatch(
+        lane.candidate_results = await _evaluate_minibatch(
             deps=deps,
             state=state,
             candidate=new_candidate,
-            batch=minibatch,
+            batch=lane.minibatch,
             capture_traces=False,
         )
+    lane.candidate = new_candidate
+
+
+def _accept_if_improved(state: GepaState, lane: _Lane) -> CandidateProgram | None:
+    """Record a lane's candidate results and add it to state if it improved."""
+    new_candidate = lane.candidate
+    new_results = lane.candidate_results
+    parent_results = lane.parent_results
+    if new_candidate is None or new_results is None or parent_results is None:
+        return None
+    parent_idx = lane.parent_idx
 
     state.record_evaluation_errors(
         candidate_idx=new_candidate.idx,
@@ -313,6 +584,7 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
     )
     _record_minibatch(new_candidate, new_results)
     _increment_budget(state, new_results)
+    parent_total, _ = _summarize_scores(parent_results.scores)
     new_total, new_avg = _summarize_scores(new_results.scores)
     logfire.debug(
         "ReflectStep candidate minibatch results",
@@ -327,6 +599,15 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
         baseline_scores=parent_results.scores,
         new_scores=new_results.scores,
     )
+    if improved:
+        new_candidate = state.add_candidate(new_candidate)
+        _store_case_results(
+            state,
+            new_candidate.idx,
+            lane.minibatch,
+            new_results,
+            range(len(new_results)),
+        )
     decision_payload = dict(
         parent_idx=parent_idx,
         candidate_idx=new_candidate.idx,
@@ -335,22 +616,63 @@ async def reflect_step(ctx: StepContext[GepaState, GepaDeps, None]) -> Iteration
         improvement=improved,
     )
     if improved:
-        state.add_candidate(new_candidate)
-        state.last_accepted = True
-        state.schedule_merge(state.config.merges_per_accept)
         logfire.info(
             "ReflectStep accepted candidate",
             **cast(dict[str, Any], decision_payload),
         )
-        return "evaluate"
+        return new_candidate
 
-    state.last_accepted = False
     logfire.info(
         "ReflectStep rejected candidate",
         failure_reason="not_strict_improvement",
         **cast(dict[str, Any], decision_payload),
     )
-    return "continue"
+    return None
+
+
+def _route_spans(
+    deps: GepaDeps,
+    state: GepaState,
+    *,
+    span_name: str,
+    subdir: str,
+) -> None:
+    """Write finished spans under the parent of the lane that produced them.
+
+    Concurrent lanes share one exporter, so each span is attributed by walking
+    up to its enclosing ``span_name`` span, which carries ``parent_idx``.
+    Spans outside any lane are dropped.
+    """
+    if deps.memory_exporter is None:
+        return
+    spans = deps.memory_exporter.get_finished_spans()
+    deps.memory_exporter.clear()
+    if not spans:
+        return
+    from pathlib import Path
+
+    from ..proposal.trace_store import span_to_jsonl_line
+
+    by_id = {span.context.span_id: span for span in spans if span.context}
+    lines: dict[int, list[str]] = {}
+    for span in spans:
+        owner = span
+        while owner is not None and owner.name != span_name:
+            parent_ctx = owner.parent
+            owner = by_id.get(parent_ctx.span_id) if parent_ctx else None
+        if owner is None or owner is span or not owner.attributes:
+            continue
+        parent_idx = owner.attributes.get("parent_idx")
+        if isinstance(parent_idx, int):
+            lines.setdefault(parent_idx, []).append(span_to_jsonl_line(span))
+
+    for parent_idx, parent_lines in lines.items():
+        target_dir = Path(
+            f".gepa_cache/runs/{state.run_id}/candidates/{parent_idx}/{subdir}"
+        )
+        target_dir.mkdir(parents=True, exist_ok=True)
+        with open(target_dir / "traces.jsonl", "a", encoding="utf-8") as f:
+            f.writelines(parent_lines)
 
 
 def _select_parent(
@@ -392,6 +714,8 @@ async def _evaluate_minibatch(
     candidate: CandidateProgram,
     batch: Sequence[Case[Any, Any, Any]],
     capture_traces: bool,
+    flush_traces: bool = True,
+    data_ids: Sequence[str] | None = None,
 ) -> EvaluationResults[str]:
     results = await deps.evaluator.evaluate_batch(
         candidate=candidate,
@@ -399,8 +723,9 @@ async def _evaluate_minibatch(
         adapter=deps.adapter,
         capture_traces=capture_traces,
         max_concurrent=state.config.max_concurrent_evaluations,
+        data_ids=data_ids,
     )
-    if capture_traces and deps.memory_exporter is not None:
+    if capture_traces and flush_traces and deps.memory_exporter is not None:
         from pathlib import Path
 
         spans = deps.memory_exporter.get_finished_spans()
@@ -426,6 +751,27 @@ def _record_minibatch(
     candidate.minibatch_scores = list(results.scores)
 
 
+def _store_case_results(
+    state: GepaState,
+    candidate_idx: int,
+    batch: Sequence[Case[Any, Any, Any]],
+    results: EvaluationResults[str],
+    positions: Iterable[int],
+) -> None:
+    """Keep results for named cases, the only ones with a stable data id."""
+    trajectories = results.trajectories
+    for position in positions:
+        if not batch[position].name:
+            continue
+        state.case_results.record(
+            candidate_idx,
+            results.data_ids[position],
+            results.scores[position],
+            results.outputs[position],
+            trajectories[position] if trajectories is not None else None,
+        )
+
+
 def _increment_budget(
     state: GepaState,
     results: EvaluationResults[str],
@@ -869,4 +1215,4 @@ def _component_versions(candidate: CandidateProgram) -> Mapping[str, str]:
     return {name: component.text for name, component in candidate.components.items()}
 
 
-__all__ = ["reflect_step"]
+__all__ = ["reflect_step", "run_reflection"]
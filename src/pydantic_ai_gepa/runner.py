@@ -397,6 +397,8 @@ async def optimize_agent(
         training_set=train_loader,
         validation_set=val_loader,
     )
+    if cache_manager is not None:
+        cache_manager.set_run_id(state.run_id)
 
     gepa_result: GepaResult | None = None
     try:
@@ -416,6 +418,9 @@ async def optimize_agent(
                         previous_node=previous_node_name,
                         best_score=state.best_score,
                     )
+                    if cache_manager is not None and previous_node_name:
+                        # The previous step has finished; report its cache activity.
+                        cache_manager.emit_metrics(node=previous_node_name)
                     if current_node_name:
                         previous_node_name = current_node_name
                 run_output = run.output
@@ -450,6 +455,10 @@ async def optimize_agent(
             exception=exc,
         )
         return _fallback_result(normalized_seed_candidate)
+    finally:
+        if cache_manager is not None:
+            # Persist write-behind cache entries before returning.
+            await cache_manager.aflush()
 
     if gepa_result is None:
         raise RuntimeError("GEPA optimization did not produce a result.")
@@ -0,0 +1,132 @@
+"""End-to-end tests for `gepa cache`."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from pydantic_ai_gepa.cache import EntryTags, SQLiteBackend
+from pydantic_ai_gepa.cli import app as gepa_app
+
+
+def _run(*argv: str) -> object:
+    return CliRunner().invoke(gepa_app, ["--no-dotenv", *argv])
+
+
+def _seed_cache(cache_dir: Path) -> None:
+    backend = SQLiteBackend(cache_dir / "cache.sqlite3")
+    try:
+        backend.put_many(
+            {"a1": b"x" * 100, "a2": b"x" * 100},
+            {
+                "a1": EntryTags(key_type="agent_run", model="m1", run_id="run-a"),
+                "a2": EntryTags(key_type="metric", model="m1", run_id="run-a"),
+            },
+        )
+        backend.put("b1", b"y" * 50, EntryTags(key_type="metric", model="m2"))
+    finally:
+        backend.close()
+
+
+def test_stats_groups_usage_by_run_and_model(tmp_path: Path) -> None:
+    _seed_cache(tmp_path)
+
+    result = _run("cache", "stats", "--cache-dir", str(tmp_path))
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert payload["num_entries"] == 3
+    assert payload["total_bytes"] == 250
+    by_run = {group["run_id"]: group["num_entries"] for group in payload["groups"]}
+    assert by_run == {"run-a": 2, None: 1}
+
+    result = _run(
+        "cache",
+        "stats",
+        "--cache-dir",
+        str(tmp_path),
+        "--by",
+        "model",
+        "--format",
+        "tsv",
+    )
+    assert result.exit_code == 0, result.output
+    lines = result.output.strip().splitlines()
+    assert lines[0] == "model\tnum_entries\ttotal_bytes\tlast_accessed_at"
+    assert [line.split("\t")[:3] for line in lines[1:]] == [
+        ["m1", "2", "200"],
+        ["m2", "1", "50"],
+    ]
+
+
+def test_gc_dry_run_then_prune(tmp_path: Path) -> None:
+    _seed_cache(tmp_path)
+
+    result = _run(
+        "cache", "gc", "--cache-dir", str(tmp_path), "--max-bytes", "100", "--dry-run"
+    )
+    assert result.exit_code == 0, result.output
+    preview = json.loads(result.output)
+    assert preview["dry_run"] is True
+    assert preview["evicted_entries"] == 2
+    assert preview["remaining_bytes"] == 50
+
+    result = _run("cache", "gc", "--cache-dir", str(tmp_path), "--max-bytes", "100")
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["remaining_entries"] == 1
+
+    result = _run("cache", "gc", "--cache-dir", str(tmp_path), "--ttl", "7d")
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["evicted_entries"] == 0
+
+
+def test_gc_requires_a_limit(tmp_path: Path) -> None:
+    result = _run("cache", "gc", "--cache-dir", str(tmp_path))
+    assert result.exit_code == 2
+
+
+def test_stats_reports_missing_cache_dir(tmp_path: Path) -> None:
+    result = _run("cache", "stats", "--cache-dir", str(tmp_path / "missing"))
+    assert result.exit_code == 1
+
+
+def test_export_and_import_bundle(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    _seed_cache(source)
+    bundle = tmp_path / "run-a.tar"
+
+    result = _run(
+        "cache", "export", str(bundle), "--cache-dir", str(source), "--run", "run-a"
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["entries"] == 2
+
+    target = tmp_path / "target"
+    result = _run("cache", "import", str(bundle), "--cache-dir", str(target))
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["entries"] == 2
+
+    backend = SQLiteBackend(target / "cache.sqlite3")
+    try:
+        assert backend.get_many(["a1", "a2", "b1"]) == {
+            "a1": b"x" * 100,
+            "a2": b"x" * 100,
+        }
+        assert dict(backend.iter_entries())["a1"] == EntryTags(
+            key_type="agent_run", model="m1", run_id="run-a"
+        )
+    finally:
+        backend.close()
+
+    result = _run("cache", "import", str(bundle), "--cache-dir", str(target))
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["skipped_entries"] == 2
+
+
+def test_import_rejects_non_bundle(tmp_path: Path) -> None:
+    bogus = tmp_path / "bogus.tar"
+    bogus.write_bytes(b"not a tarball")
+    result = _run("cache", "import", str(bogus), "--cache-dir", str(tmp_path / "c"))
+    assert result.exit_code == 1
+    assert "Not a cache bundle" in result.output
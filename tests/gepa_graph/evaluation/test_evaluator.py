@@ -170,3 +170,124 @@ async def test_parallel_evaluator_collects_trajectories() -> None:
 
     assert result.trajectories is not None
     assert len(result.trajectories) == len(batch)
+
+
+class _ChunkedAdapter(_RecordingAdapter):
+    def __init__(self) -> None:
+        super().__init__(delay=0.02)
+        self.chunks: list[list[str]] = []
+
+    async def evaluate(
+        self, batch, candidate, capture_traces, example_bank=None, *, limiter=None
+    ):
+        assert limiter is not None
+        self.chunks.append([case.name for case in batch])
+
+        async def run_case(case):
+            async with limiter:
+                self.inflight += 1
+                self.max_inflight = max(self.max_inflight, self.inflight)
+                try:
+                    await asyncio.sleep(self._delay)
+                finally:
+                    self.inflight -= 1
+            return case.name
+
+        names = await asyncio.gather(*(run_case(case) for case in batch))
+        return EvaluationBatch(
+            outputs=[RolloutOutput.from_success(name) for name in names],
+            scores=[float(name) for name in names],
+            trajectories=(
+                [
+                    None
+                    if name == "1"
+                    else AgentAdapterTrajectory(messages=[], final_output=name)
+                    for name in names
+                ]
+                if capture_traces
+                else None
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_parallel_evaluator_chunks_batched_adapters() -> None:
+    evaluator = ParallelEvaluator(chunk_size=2)
+    adapter = _ChunkedAdapter()
+    batch = [_make_data_inst(str(i)) for i in range(5)]
+
+    result = await evaluator.evaluate_batch(
+        candidate=_make_candidate(),
+        batch=batch,
+        adapter=adapter,
+        max_concurrent=3,
+        capture_traces=True,
+    )
+
+    assert adapter.chunks == [["0", "1"], ["2", "3"], ["4"]]
+    assert adapter.max_inflight == 3
+    assert result.data_ids == ["0", "1", "2", "3", "4"]
+    assert result.scores == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert result.trajectories is not None
+    assert [trace is None for trace in result.trajectories] == [
+        False,
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+class _DelayedAdapter(_RecordingAdapter):
+    def __init__(self, delays: dict[str, float]) -> None:
+        super().__init__()
+        self._delays = delays
+        self.finished: list[str] = []
+
+    async def evaluate(self, batch, candidate, capture_traces, example_bank=None):
+        name = batch[0].name
+        await asyncio.sleep(self._delays[name])
+        self.finished.append(name)
+        return EvaluationBatch(
+            outputs=[RolloutOutput.from_success(name)],
+            scores=[float(name)],
+        )
+
+
+@pytest.mark.asyncio
+async def test_evaluate_stream_yields_in_completion_order() -> None:
+    evaluator = ParallelEvaluator()
+    adapter = _DelayedAdapter({"0": 0.06, "1": 0.0, "2": 0.03})
+    batch = [_make_data_inst(str(i)) for i in range(3)]
+
+    streamed = [
+        sample
+        async for sample in evaluator.evaluate_stream(
+            candidate=_make_candidate(), batch=batch, adapter=adapter
+        )
+    ]
+    result = await evaluator.evaluate_batch(
+        candidate=_make_candidate(), batch=batch, adapter=adapter
+    )
+
+    assert [sample.data_id for sample in streamed] == ["1", "2", "0"]
+    assert [sample.score for sample in streamed] == [1.0, 2.0, 0.0]
+    assert all(sample.trajectory is None for sample in streamed)
+    assert result.data_ids == ["0", "1", "2"]
+    assert result.scores == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_stream_cancels_pending_cases_when_closed() -> None:
+    evaluator = ParallelEvaluator()
+    adapter = _DelayedAdapter({"0": 0.0, "1": 5.0, "2": 5.0})
+    batch = [_make_data_inst(str(i)) for i in range(3)]
+
+    stream = evaluator.evaluate_stream(
+        candidate=_make_candidate(), batch=batch, adapter=adapter
+    )
+    first = await anext(stream)
+    await stream.aclose()
+
+    assert first.data_id == "0"
+    assert adapter.finished == ["0"]
@@ -119,3 +119,27 @@ def test_find_dominators_filters_dominated_candidates() -> None:
     dominators = manager.find_dominators(state)
 
     assert set(dominators) == {0, 1}
+
+
+def test_find_dominators_is_coverage_aware() -> None:
+    state = _make_state()
+    wide = _candidate(0, "A", 0)
+    narrow = _candidate(1, "B", 1)
+    for data_id, score in {"0": 0.9, "1": 0.2, "2": 0.2}.items():
+        wide.record_validation(
+            data_id=data_id, score=score, output=RolloutOutput.from_success("a")
+        )
+    narrow.record_validation(
+        data_id="0", score=0.5, output=RolloutOutput.from_success("b")
+    )
+    state.add_candidate(wide, auto_assign_idx=False)
+    state.add_candidate(narrow, auto_assign_idx=False)
+    manager = ParetoFrontManager()
+
+    assert manager.find_dominators(state) == [0]
+
+    # Better on its one instance, but unscored elsewhere: it cannot dominate.
+    narrow.record_validation(
+        data_id="0", score=1.0, output=RolloutOutput.from_success("b")
+    )
+    assert manager.find_dominators(state) == [0, 1]
@@ -32,3 +32,27 @@ def test_config_validation_errors() -> None:
     # component_selector is a constrained literal
     with pytest.raises(ValidationError):
         GepaConfig(component_selector="bogus")  # type: ignore[arg-type]
+
+
+def test_config_validates_sparse_schedule() -> None:
+    with pytest.raises(ValidationError):
+        GepaConfig(sparse_validation_fraction=0)
+
+    with pytest.raises(ValidationError):
+        GepaConfig(sparse_validation_fraction=1.5)
+
+    with pytest.raises(ValidationError):
+        GepaConfig(sparse_validation_growth=1.0)
+
+
+def test_config_rejects_adaptive_validation_in_steady_state() -> None:
+    with pytest.raises(ValidationError):
+        GepaConfig(runtime="steady_state", validation_policy="sparse")
+
+    with pytest.raises(ValidationError):
+        GepaConfig(runtime="steady_state", validation_racing=True)
+
+    with pytest.raises(ValidationError):
+        GepaConfig(runtime="steady_state", validation_workers=0)
+
+    assert GepaConfig(runtime="steady_state").validation_workers == 2
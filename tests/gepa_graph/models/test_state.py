@@ -110,3 +110,39 @@ def test_state_recompute_best_candidate() -> None:
     assert best is cand_b
     assert state.best_candidate_idx == 1
     assert state.best_score == pytest.approx(0.85)
+
+
+def test_state_recompute_best_candidate_compares_shared_coverage() -> None:
+    config = GepaConfig()
+    training_set = [_make_data_inst("1"), _make_data_inst("2"), _make_data_inst("3")]
+    state = GepaState(config=config, training_set=ListDataLoader(training_set))
+
+    full = CandidateProgram(
+        idx=0,
+        components={"system": ComponentValue(name="system", text="A")},
+        creation_type="seed",
+        discovered_at_iteration=0,
+        discovered_at_evaluation=0,
+    )
+    for data_id, score in {"1": 0.9, "2": 0.1, "3": 0.1}.items():
+        full.record_validation(
+            data_id=data_id, score=score, output=RolloutOutput.from_success("A")
+        )
+    sparse = CandidateProgram(
+        idx=1,
+        components={"system": ComponentValue(name="system", text="B")},
+        creation_type="reflection",
+        parent_indices=[0],
+        discovered_at_iteration=1,
+        discovered_at_evaluation=1,
+    )
+    # Higher average than ``full``, but only over an instance where it is worse.
+    sparse.record_validation(
+        data_id="1", score=0.5, output=RolloutOutput.from_success("B")
+    )
+
+    state.add_candidate(full, auto_assign_idx=False)
+    state.add_candidate(sparse, auto_assign_idx=False)
+
+    assert state.recompute_best_candidate() is full
+    assert state.best_score == pytest.approx(1.1 / 3)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any, cast
@@ -659,3 +660,106 @@ async def test_reflect_step_forwards_reflection_config_additional_toolsets() ->
     seen = captured_toolsets[-1]
     assert seen is not None, "component_toolsets should be non-empty"
     assert extra_toolset in seen, "additional_toolsets entry must reach proposer"
+
+
+class _LaneProposalGenerator(_StubProposalGenerator):
+    """Later lanes answer first, so completion order is the reverse of lanes."""
+
+    def __init__(self, lanes: int) -> None:
+        super().__init__({})
+        self._lanes = lanes
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def propose_texts(self, *, candidate, components, **kwargs) -> ProposalResult:
+        lane = self.calls
+        self.calls += 1
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(0.01 * (self._lanes - lane))
+        finally:
+            self.inflight -= 1
+        return ProposalResult(
+            texts={name: f"lane-{lane}" for name in components or []},
+            component_metadata={},
+            reasoning=None,
+        )
+
+
+class _TextScoredEvaluator(ParallelEvaluator):
+    def __init__(self, scores: dict[str, float]) -> None:
+        self._scores = scores
+        self.calls = 0
+
+    async def evaluate_batch(self, *, candidate, batch, capture_traces=False, **kwargs):
+        self.calls += 1
+        score = self._scores[candidate.components["instructions"].text]
+        results = _eval_results([score] * len(batch))
+        if not capture_traces:
+            results.trajectories = None
+        return results
+
+
+@pytest.mark.asyncio
+async def test_reflect_step_runs_parallel_lanes_and_accepts_in_lane_order() -> None:
+    config = GepaConfig(
+        max_evaluations=100,
+        minibatch_size=2,
+        merges_per_accept=1,
+        reflection_parallelism=3,
+    )
+    state = _make_state(config=config)
+    minibatch = await _training_examples(state)
+    evaluator = _TextScoredEvaluator(
+        {"Seed instructions": 0.5, "lane-0": 0.9, "lane-1": 0.4, "lane-2": 0.8}
+    )
+    batch_sampler = _StubBatchSampler(minibatch)
+    generator = _LaneProposalGenerator(lanes=3)
+    deps = _make_deps(
+        adapter=cast(Adapter[str, str, dict[str, str]], _StubAdapter()),
+        evaluator=evaluator,
+        batch_sampler=batch_sampler,
+        proposal_generator=generator,
+    )
+    deps.component_selector = AllComponentSelector()
+
+    result = await reflect_step(_ctx(state, deps))
+
+    assert result == "evaluate"
+    assert generator.max_inflight == 3
+    assert batch_sampler.calls == 3
+    assert evaluator.calls == 6
+    assert [c.components["instructions"].text for c in state.candidates] == [
+        "Seed instructions",
+        "lane-0",
+        "lane-2",
+    ]
+    assert state.pending_validation == [1, 2]
+    assert state.merge_scheduled == 2
+    assert state.total_evaluations == 12
+
+
+@pytest.mark.asyncio
+async def test_reflect_step_caps_lanes_by_remaining_budget() -> None:
+    config = GepaConfig(
+        max_evaluations=10,
+        minibatch_size=2,
+        reflection_parallelism=4,
+    )
+    state = _make_state(config=config)
+    state.total_evaluations = 4
+    minibatch = await _training_examples(state)
+    evaluator = _TextScoredEvaluator({"Seed instructions": 0.5, "lane-0": 0.9})
+    batch_sampler = _StubBatchSampler(minibatch)
+    deps = _make_deps(
+        adapter=cast(Adapter[str, str, dict[str, str]], _StubAdapter()),
+        evaluator=evaluator,
+        batch_sampler=batch_sampler,
+        proposal_generator=_LaneProposalGenerator(lanes=1),
+    )
+
+    await reflect_step(_ctx(state, deps))
+
+    assert batch_sampler.calls == 1
+    assert state.pending_validation == [1]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Sequence, cast
 
@@ -411,3 +412,201 @@ async def test_continue_step_defaults_to_reflect() -> None:
 
     assert next_node == "reflect"
     assert state.iteration == 1
+
+
+class _StagedAdapter(_FakeAdapter):
+    """Holds case ``1`` until case ``0`` shows up in the Pareto front."""
+
+    def __init__(self, state: GepaState) -> None:
+        super().__init__()
+        self.state = state
+        self.seen_before_release: dict[str, object] = {}
+
+    async def evaluate(self, batch, candidate, capture_traces, example_bank=None):
+        if batch[0].name == "1":
+            while "0" not in self.state.pareto_front:
+                await asyncio.sleep(0)
+            self.seen_before_release = {
+                "total_evaluations": self.state.total_evaluations,
+                "errors": len(self.state.evaluation_errors),
+            }
+            return await super().evaluate(batch, candidate, capture_traces)
+        return _FakeEvaluationBatch(
+            outputs=[RolloutOutput.from_error(RuntimeError("boom"))],
+            scores=[0.0],
+        )
+
+
+@pytest.mark.asyncio
+async def test_evaluate_step_records_results_as_cases_finish() -> None:
+    state = _make_state(num_instances=2)
+    state.iteration = 0
+    candidate = CandidateProgram(
+        idx=0,
+        components={"instructions": ComponentValue(name="instructions", text="test")},
+        creation_type="seed",
+        discovered_at_iteration=0,
+        discovered_at_evaluation=0,
+    )
+    state.add_candidate(candidate)
+    adapter = _StagedAdapter(state)
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], adapter)
+
+    await evaluate_step(_ctx(state, deps))
+
+    assert adapter.seen_before_release == {"total_evaluations": 1, "errors": 1}
+    assert state.total_evaluations == 2
+    assert candidate.validation_scores == {"0": 0.0, "1": 0.5}
+
+
+class _OrderedAdapter(_FakeAdapter):
+    """Finishes cases in validation-set order and records which ones ran."""
+
+    def __init__(self, scores: dict[str, float]) -> None:
+        super().__init__()
+        self.scores = scores
+        self.evaluated: list[str] = []
+
+    async def evaluate(self, batch, candidate, capture_traces, example_bank=None):
+        name = batch[0].name
+        await asyncio.sleep(0.001 * int(name))
+        self.evaluated.append(name)
+        return await super().evaluate(batch, candidate, capture_traces)
+
+
+def _racing_state(num_instances: int) -> GepaState:
+    state = _make_state(
+        num_instances=num_instances,
+        config=GepaConfig(
+            max_evaluations=100,
+            validation_racing=True,
+            max_concurrent_evaluations=1,
+        ),
+    )
+    state.iteration = 0
+    for idx in range(2):
+        state.add_candidate(
+            CandidateProgram(
+                idx=idx,
+                components={
+                    "instructions": ComponentValue(name="instructions", text=f"c{idx}")
+                },
+                creation_type="seed" if idx == 0 else "reflection",
+                discovered_at_iteration=0,
+                discovered_at_evaluation=0,
+            )
+        )
+    return state
+
+
+async def _seed_best(state: GepaState, scores: dict[str, float]) -> None:
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], _OrderedAdapter(scores))
+    champion = state.candidates.pop()
+    await evaluate_step(_ctx(state, deps))
+    state.candidates.append(champion)
+
+
+@pytest.mark.asyncio
+async def test_evaluate_step_races_out_candidate_that_cannot_win() -> None:
+    state = _racing_state(num_instances=5)
+    await _seed_best(state, {str(i): 1.0 for i in range(5)})
+    adapter = _OrderedAdapter({str(i): 0.0 for i in range(5)})
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], adapter)
+
+    await evaluate_step(_ctx(state, deps))
+
+    challenger = state.candidates[1]
+    assert adapter.evaluated == ["0"]
+    assert challenger.validation_raced_out
+    assert challenger.validation_scores == {"0": 0.0}
+    assert state.total_evaluations == 6
+    assert (state.full_validations, state.raced_validations) == (1, 1)
+    assert state.best_candidate_idx == 0
+    assert deps.pareto_manager.find_dominators(state) == [0]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_step_racing_keeps_potential_pareto_winners() -> None:
+    state = _racing_state(num_instances=4)
+    # The champion is imperfect on case 3, so the challenger could still
+    # become sole best there and has to be evaluated in full.
+    await _seed_best(state, {"0": 1.0, "1": 1.0, "2": 1.0, "3": 0.5})
+    adapter = _OrderedAdapter({str(i): 0.0 for i in range(4)})
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], adapter)
+
+    await evaluate_step(_ctx(state, deps))
+
+    challenger = state.candidates[1]
+    assert adapter.evaluated == ["0", "1", "2", "3"]
+    assert not challenger.validation_raced_out
+    assert state.full_validations == 2
+
+
+def _sparse_state(num_instances: int) -> GepaState:
+    state = _racing_state(num_instances)
+    state.config = GepaConfig(
+        max_evaluations=100,
+        validation_policy="sparse",
+        sparse_validation_fraction=0.25,
+        sparse_validation_growth=2.0,
+    )
+    return state
+
+
+@pytest.mark.asyncio
+async def test_sparse_validation_grows_coverage_while_candidate_keeps_up() -> None:
+    state = _sparse_state(num_instances=8)
+    await _seed_best(state, {str(i): 0.5 for i in range(8)})
+    assert state.candidates[0].coverage == 8
+    assert state.full_validations == 1
+
+    adapter = _OrderedAdapter({str(i): 0.6 for i in range(8)})
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], adapter)
+    await evaluate_step(_ctx(state, deps))
+
+    challenger = state.candidates[1]
+    assert challenger.coverage == 8
+    assert sorted(adapter.evaluated) == [str(i) for i in range(8)]
+    assert state.best_candidate_idx == 1
+    assert state.full_validations == 2
+
+
+@pytest.mark.asyncio
+async def test_sparse_validation_stops_on_a_spread_out_subset() -> None:
+    state = _sparse_state(num_instances=8)
+    await _seed_best(state, {str(i): 0.5 for i in range(8)})
+
+    adapter = _OrderedAdapter({str(i): 0.4 for i in range(8)})
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], adapter)
+    await evaluate_step(_ctx(state, deps))
+
+    challenger = state.candidates[1]
+    covered = sorted(int(data_id) for data_id in challenger.validation_scores)
+    assert len(covered) == 2
+    # The initial subset is spread across the set rather than a prefix.
+    assert abs(covered[1] - covered[0]) == 4
+    assert state.total_evaluations == 10
+    assert state.best_candidate_idx == 0
+    assert state.full_validations == 1
+
+
+@pytest.mark.asyncio
+async def test_evaluate_step_validates_pending_candidates_in_order() -> None:
+    state = _racing_state(num_instances=2)
+    state.pending_validation = [0, 1]
+    adapter = _OrderedAdapter({"0": 0.5, "1": 0.5})
+    deps = _make_deps()
+    deps.adapter = cast(Adapter[str, str, dict[str, str]], adapter)
+
+    await evaluate_step(_ctx(state, deps))
+
+    assert [c.coverage for c in state.candidates] == [2, 2]
+    assert state.pending_validation == []
+    assert state.full_validations == 2
+    assert state.total_evaluations == 4
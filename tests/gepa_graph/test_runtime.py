@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import asyncio
-from typing import cast
+import random
+from typing import Any, cast
 
 import pytest
 
 from pydantic_ai_gepa.adapter import Adapter
-from pydantic_ai_gepa.gepa_graph import GepaConfig, optimize
+from pydantic_ai_gepa.gepa_graph import GepaConfig, GepaResult, create_deps, optimize
+from pydantic_ai_gepa.gepa_graph.proposal import ProposalResult
 from pydantic_ai_gepa.types import ReflectionConfig
 from tests.gepa_graph.utils import AdapterStub, make_dataset
 
@@ -58,3 +60,93 @@ async def test_optimize_supports_async_dataset_loader() -> None:
     )
 
     assert result.best_score is not None
+
+
+class _JitteredAdapter(AdapterStub):
+    """Scores grow with every ``+`` in the instructions; latency is random."""
+
+    def __init__(self, jitter_seed: int) -> None:
+        super().__init__()
+        self._rng = random.Random(jitter_seed)
+        self._running: dict[str, int] = {}
+        self.max_candidates_in_flight = 0
+
+    async def evaluate(self, batch, candidate, capture_traces, example_bank=None):
+        text = candidate["instructions"].text
+        self._running[text] = self._running.get(text, 0) + 1
+        self.max_candidates_in_flight = max(
+            self.max_candidates_in_flight, len(self._running)
+        )
+        try:
+            await asyncio.sleep(self._rng.uniform(0, 0.01))
+            result = await super().evaluate(batch, candidate, capture_traces)
+        finally:
+            self._running[text] -= 1
+            if not self._running[text]:
+                del self._running[text]
+        result.scores = [
+            min(1.0, 0.1 * (text.count("+") + int(case.name[-1]) % 2)) for case in batch
+        ]
+        return result
+
+
+class _AppendingProposalGenerator:
+    async def propose_texts(self, *, candidate, components, **kwargs):
+        return ProposalResult(
+            texts={
+                component: candidate.components[component].text + "+"
+                for component in components
+            },
+            component_metadata={},
+            reasoning=None,
+        )
+
+
+async def _run_steady_state(jitter_seed: int) -> tuple[GepaResult, _JitteredAdapter]:
+    adapter = _JitteredAdapter(jitter_seed)
+    config = GepaConfig(
+        max_evaluations=80,
+        minibatch_size=2,
+        seed=5,
+        runtime="steady_state",
+        validation_workers=2,
+        reflection_config=ReflectionConfig(model="reflection-model"),
+    )
+    deps = create_deps(cast(Adapter[str, str, dict[str, str]], adapter), config)
+    deps.proposal_generator = cast(Any, _AppendingProposalGenerator())
+    dataset = make_dataset(4)
+    result = await optimize(
+        adapter=cast(Adapter[str, str, dict[str, str]], adapter),
+        config=config,
+        trainset=dataset,
+        deps=deps,
+    )
+    return result, adapter
+
+
+@pytest.mark.asyncio
+async def test_optimize_steady_state_overlaps_validation_reproducibly() -> None:
+    first, first_adapter = await _run_steady_state(jitter_seed=1)
+    second, _ = await _run_steady_state(jitter_seed=2)
+
+    def summary(result: GepaResult):
+        return [
+            (
+                candidate.idx,
+                candidate.components["instructions"].text,
+                candidate.parent_indices,
+                sorted(candidate.validation_scores.items()),
+            )
+            for candidate in result.candidates
+        ]
+
+    assert first.stopped is True
+    assert first.best_score is not None and first.original_score is not None
+    assert first.best_score > first.original_score
+    # Every accepted candidate is validated before the run returns.
+    assert all(candidate.validation_scores for candidate in first.candidates)
+    assert first.total_evaluations <= 80 + len(make_dataset(4))
+    assert first_adapter.max_candidates_in_flight >= 2
+    assert summary(first) == summary(second)
+    assert first.total_evaluations == second.total_evaluations
+    assert first.best_candidate_idx == second.best_candidate_idx
@@ -12,7 +12,15 @@ from typing import Any
 from pydantic_ai import Agent
 from pydantic_ai.models.test import TestModel
 
-from pydantic_ai_gepa.cache import CacheManager, create_cached_metric
+from pydantic_ai_gepa.cache import (
+    BackendStats,
+    CacheManager,
+    EntryTags,
+    EvictionResult,
+    SQLiteBackend,
+    create_cached_metric,
+)
+from pydantic_ai_gepa.cache.memory import MemoryTier
 from pydantic_ai_gepa.gepa_graph.models import ComponentValue
 from pydantic_ai_gepa.gepa_graph.proposal.instruction import (
     ComponentUpdate,
@@ -493,9 +501,12 @@ def test_cache_agent_runs():
         assert cached_trajectory is not None
         assert cached_trajectory.final_output == "Agent result"
 
-        # Different capture_traces value should miss
+        # A traced entry serves untraced lookups without the trajectory
         result = cache.get_cached_agent_run(case, 0, candidate, capture_traces=False)
-        assert result is None
+        assert result is not None
+        cached_trajectory, cached_output = result
+        assert cached_trajectory is None
+        assert cached_output.result == "Agent result"
 
         # Cache without traces
         cache.cache_agent_run(
@@ -578,3 +589,681 @@ def test_cache_key_stability():
         # Should still get cache hit
         result = cache.get_cached_metric_result(case2, 0, output, candidate1)
         assert result == MetricResult(score=0.9, feedback="Good")
+
+
+def test_sqlite_backend_batched_operations(tmp_path):
+    """SQLite backend supports batched reads/writes and reports stats."""
+    backend = SQLiteBackend(tmp_path / "cache.sqlite3")
+    try:
+        backend.put_many({"a": b"1", "b": b"22", "c": b"333"})
+        backend.put("a", b"4444")
+
+        assert backend.get("a") == b"4444"
+        assert backend.get("missing") is None
+        assert backend.get_many(["a", "c", "missing"]) == {"a": b"4444", "c": b"333"}
+        assert backend.stats() == BackendStats(num_entries=3, total_bytes=9)
+
+        assert backend.delete_many(["b", "missing"]) == 1
+        assert sorted(backend.iter_keys()) == ["a", "c"]
+    finally:
+        backend.close()
+
+
+def test_sqlite_cache_reads_legacy_pickle_entries(tmp_path):
+    """Entries written by the pickle-directory layout survive the switch to SQLite."""
+    case = _prompt_case("Legacy prompt", name="legacy")
+    output = RolloutOutput.from_success("Legacy result")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Legacy"),
+    }
+    metric_result = MetricResult(score=0.5, feedback="legacy")
+
+    legacy = CacheManager(cache_dir=tmp_path, backend="pickle")
+    legacy.cache_metric_result(case, None, output, candidate, metric_result)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        assert isinstance(cache.backend, SQLiteBackend)
+        cached = cache.get_cached_metric_result(case, None, output, candidate)
+        assert cached is not None
+        assert cached.score == 0.5
+        assert cache.get_cache_stats()["num_cached_results"] == 1
+
+        cache.compact_cache()
+
+        assert list(tmp_path.glob("*.pkl")) == []
+        cached = cache.get_cached_metric_result(case, None, output, candidate)
+        assert cached is not None
+        assert cached.feedback == "legacy"
+        stats = cache.get_cache_stats()
+        assert stats["backend"] == "sqlite"
+        assert stats["num_cached_results"] == 1
+    finally:
+        cache.close()
+
+
+def test_cache_manager_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cache backend"):
+        CacheManager(cache_dir=tmp_path, backend="segments")  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_async_cache_write_behind(tmp_path):
+    """Async puts are queued, served immediately, and persisted by aflush."""
+    case = _prompt_case("Async prompt", name="async-1")
+    output = RolloutOutput.from_success("Async result")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Async"),
+    }
+    trajectory = AgentAdapterTrajectory(
+        messages=[], final_output="Async result", error=None
+    )
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        await cache.acache_agent_run(
+            case, 0, candidate, trajectory, output, capture_traces=True
+        )
+        await cache.acache_metric_result(
+            case, 0, output, candidate, MetricResult(score=0.75, feedback="ok")
+        )
+        # Mutations after queueing must not leak into the cached trajectory.
+        trajectory.metric_feedback = "attached later"
+
+        cached_run = await cache.aget_cached_agent_run(
+            case, 0, candidate, capture_traces=True
+        )
+        assert cached_run is not None
+        cached_trajectory, cached_output = cached_run
+        assert cached_output.result == "Async result"
+        assert cached_trajectory is not None
+        assert cached_trajectory.metric_feedback is None
+
+        await cache.aflush()
+        assert cache._pending == {}
+    finally:
+        cache.close()
+
+    reopened = CacheManager(cache_dir=tmp_path)
+    try:
+        cached_metric = await reopened.aget_cached_metric_result(
+            case, 0, output, candidate
+        )
+        assert cached_metric is not None
+        assert cached_metric.score == 0.75
+        # Output, trajectory and metric entries.
+        assert reopened.get_cache_stats()["num_cached_results"] == 3
+    finally:
+        reopened.close()
+
+
+def test_cache_key_memoizes_case_fingerprints(tmp_path):
+    """Fingerprints are reused per case object without changing the keys."""
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        candidate = {"instructions": "Be brief"}
+        output = RolloutOutput.from_success("result")
+        case = _prompt_case("Prompt", name="memo", metadata={"k": "v"})
+        twin = _prompt_case("Prompt", name="memo", metadata={"k": "v"})
+
+        first = cache._generate_cache_key(case, 0, output, candidate, "metric")
+        second = cache._generate_cache_key(case, 0, output, candidate, "metric")
+        assert first == second
+        assert len(cache._case_fingerprints) == 1
+
+        # Equal content in a different object yields the same key.
+        assert cache._generate_cache_key(twin, 0, output, candidate) == first
+        assert len(cache._case_fingerprints) == 2
+
+        del twin
+        assert len(cache._case_fingerprints) == 1
+    finally:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_agent_runs_share_one_execution(tmp_path):
+    """Single-flight: identical in-flight requests await one shared run."""
+    import asyncio
+
+    case = _prompt_case("Shared prompt", name="shared")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Shared"),
+    }
+    calls = 0
+    release = asyncio.Event()
+
+    async def run() -> tuple[None, RolloutOutput[str]]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return None, RolloutOutput.from_success("shared result")
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        tasks = [
+            asyncio.create_task(cache.aget_or_run_agent(case, 0, candidate, False, run))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(output.result == "shared result" for _, output in results)
+
+        # A later request is served from the cache without running again.
+        _, output = await cache.aget_or_run_agent(case, 0, candidate, False, run)
+        assert output.result == "shared result"
+        assert calls == 1
+
+        stats = cache.get_cache_stats()
+        assert stats["coalesced"] == 2
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+    finally:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_leader_failure(tmp_path):
+    import asyncio
+
+    case = _prompt_case("Failing prompt", name="failing")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Failing"),
+    }
+
+    async def run() -> tuple[None, RolloutOutput[str]]:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        results = await asyncio.gather(
+            cache.aget_or_run_agent(case, 0, candidate, False, run),
+            cache.aget_or_run_agent(case, 0, candidate, False, run),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert cache._inflight == {}
+    finally:
+        cache.close()
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    """Eviction drops cold entries first and spares recently read ones."""
+    import time
+
+    backend = SQLiteBackend(tmp_path / "cache.sqlite3")
+    try:
+        backend.put_many({"cold": b"x" * 10, "warm": b"y" * 10, "hot": b"z" * 10})
+        time.sleep(0.01)
+        assert backend.get("hot") is not None
+        time.sleep(0.01)
+        backend.put("new", b"w" * 10)
+
+        preview = backend.evict(max_entries=2, dry_run=True)
+        assert preview == EvictionResult(num_entries=2, total_bytes=20, dry_run=True)
+        assert backend.stats().num_entries == 4
+
+        result = backend.evict(max_entries=2)
+        assert result.num_entries == 2
+        assert sorted(backend.iter_keys()) == ["hot", "new"]
+
+        assert backend.evict(ttl=3600).num_entries == 0
+        assert backend.evict(ttl=0).num_entries == 2
+    finally:
+        backend.close()
+
+
+def test_sqlite_backend_migrates_unversioned_schema(tmp_path):
+    """Databases created before usage tags existed gain the new columns."""
+    import sqlite3
+
+    path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+        "size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO entries VALUES ('old', x'00', 1, 0, 0)")
+    conn.commit()
+    conn.close()
+
+    backend = SQLiteBackend(path)
+    try:
+        assert backend.get("old") == b"\x00"
+        backend.put("new", b"\x01", EntryTags(key_type="metric", run_id="run-1"))
+        usage = {(row.run_id, row.key_type): row.num_entries for row in backend.usage()}
+        assert usage == {(None, None): 1, ("run-1", "metric"): 1}
+    finally:
+        backend.close()
+
+
+def test_cache_manager_enforces_limits_and_tags_entries(tmp_path):
+    case = _prompt_case("Limits prompt", name="limits")
+    output = RolloutOutput.from_success("result")
+    cache = CacheManager(cache_dir=tmp_path, model_identifier="test:model")
+    try:
+        cache.set_run_id("run-a")
+        for index in range(5):
+            candidate = {
+                "instructions": ComponentValue(
+                    name="instructions", text=f"variant {index}"
+                ),
+            }
+            cache.cache_metric_result(
+                case, 0, output, candidate, MetricResult(score=index / 5)
+            )
+
+        [row] = cache.get_cache_usage()
+        assert (row.run_id, row.model, row.key_type) == (
+            "run-a",
+            "test:model",
+            "metric",
+        )
+        assert row.num_entries == 5
+
+        result = cache.prune_cache(max_entries=3)
+        assert result.num_entries == 2
+        assert cache.get_cache_stats()["num_cached_results"] == 3
+    finally:
+        cache.close()
+
+    bounded = CacheManager(cache_dir=tmp_path, max_entries=1)
+    try:
+        # Limits are enforced when the manager opens an oversized cache.
+        assert bounded.get_cache_stats()["num_cached_results"] <= 1
+    finally:
+        bounded.close()
+
+
+def test_agent_run_trajectories_stored_separately(tmp_path):
+    """Untraced entries never satisfy traced lookups; legacy entries still load."""
+    import cloudpickle
+
+    case = _prompt_case("Layout prompt", name="layout")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Layout"),
+    }
+    output = RolloutOutput.from_success("layout result")
+    trajectory = AgentAdapterTrajectory(
+        messages=[], final_output="layout result", error=None
+    )
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        cache.cache_agent_run(case, 0, candidate, None, output, capture_traces=False)
+        assert cache.get_cached_agent_run(case, 0, candidate, True) is None
+
+        cache.cache_agent_run(
+            case, 0, candidate, trajectory, output, capture_traces=True
+        )
+        base_key = cache._agent_run_key(case, 0, candidate, None)
+        assert sorted(cache.backend.iter_keys()) == [
+            base_key,
+            f"{base_key}_trajectory",
+        ]
+
+        # Entries written with the old `_traces_<bool>` suffix are still served.
+        other = _prompt_case("Legacy layout", name="legacy-layout")
+        legacy_key = f"{cache._agent_run_key(other, 0, candidate, None)}_traces_True"
+        cache.backend.put(legacy_key, cloudpickle.dumps((trajectory, output)))
+        traced = cache.get_cached_agent_run(other, 0, candidate, True)
+        assert traced is not None and traced[0] is not None
+        untraced = cache.get_cached_agent_run(other, 0, candidate, False)
+        assert untraced is not None and untraced[0] is None
+    finally:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_untraced_request_joins_inflight_traced_run(tmp_path):
+    import asyncio
+
+    case = _prompt_case("Joined prompt", name="joined")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Joined"),
+    }
+    calls = 0
+
+    async def run() -> tuple[AgentAdapterTrajectory, RolloutOutput[str]]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return (
+            AgentAdapterTrajectory(messages=[], final_output="joined", error=None),
+            RolloutOutput.from_success("joined"),
+        )
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        traced_task = asyncio.create_task(
+            cache.aget_or_run_agent(case, 0, candidate, True, run)
+        )
+        await asyncio.sleep(0.01)
+        trajectory, output = await cache.aget_or_run_agent(
+            case, 0, candidate, False, run
+        )
+        assert trajectory is None
+        assert output.result == "joined"
+        assert (await traced_task)[0] is not None
+        assert calls == 1
+    finally:
+        cache.close()
+
+
+def test_memory_tier_evicts_by_entries_and_bytes():
+    tier = MemoryTier(max_entries=2, max_bytes=100)
+    tier.put("a", "A", 40)
+    tier.put("b", "B", 40)
+    assert tier.get("a") == "A"  # refreshes "a"
+    tier.put("c", "C", 40)
+    assert tier.get("b") is None
+    assert (len(tier), tier.total_bytes) == (2, 80)
+
+    tier.put("big", "BIG", 90)
+    assert tier.get("big") == "BIG"
+    assert len(tier) == 1
+
+    tier.put("huge", "HUGE", 101)
+    assert tier.get("huge") is None
+    assert MemoryTier(max_entries=0, max_bytes=100).enabled is False
+
+
+def test_cache_manager_reports_per_tier_hit_ratios(tmp_path):
+    case = _prompt_case("Tier prompt", name="tier")
+    output = RolloutOutput.from_success("tier result")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Tier"),
+    }
+    metric_result = MetricResult(score=1.0)
+
+    writer = CacheManager(cache_dir=tmp_path)
+    writer.cache_metric_result(case, 0, output, candidate, metric_result)
+    writer.close()
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        # First read comes from disk, the rest from the in-memory tier.
+        for _ in range(3):
+            assert cache.get_cached_metric_result(case, 0, output, candidate) == (
+                metric_result
+            )
+        other = _prompt_case("Missing", name="missing")
+        assert cache.get_cached_metric_result(other, 0, output, candidate) is None
+
+        tiers = cache.get_cache_stats()["tiers"]
+        assert tiers["memory"]["hits"] == 2
+        assert tiers["memory"]["lookups"] == 4
+        assert tiers["memory"]["hit_ratio"] == pytest.approx(0.5)
+        assert tiers["memory"]["entries"] == 1
+        assert tiers["backend"]["hits"] == 1
+        assert tiers["backend"]["lookups"] == 2
+        assert tiers["backend"]["hit_ratio"] == pytest.approx(0.5)
+    finally:
+        cache.close()
+
+
+def _tool_heavy_trajectory(prompt: str) -> AgentAdapterTrajectory:
+    from pydantic_ai.messages import ModelRequest, SystemPromptPart, UserPromptPart
+    from pydantic_ai.tools import ToolDefinition
+
+    instructions = "Follow the house style guide carefully. " * 100
+    tools = [
+        ToolDefinition(
+            name=f"tool_{index}",
+            description=f"Tool {index}. " + "Looks things up in the corpus. " * 20,
+            parameters_json_schema={
+                "type": "object",
+                "properties": {f"arg_{n}": {"type": "string"} for n in range(20)},
+            },
+        )
+        for index in range(5)
+    ]
+    return AgentAdapterTrajectory(
+        messages=[
+            ModelRequest(
+                parts=[
+                    SystemPromptPart(content=instructions),
+                    UserPromptPart(content=prompt),
+                ]
+            )
+        ],
+        final_output=prompt,
+        instructions=instructions,
+        function_tools=tools,
+        output_tools=tools[:1],
+    )
+
+
+def test_trajectory_payloads_share_blobs(tmp_path):
+    import cloudpickle
+
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Blobs"),
+    }
+    cache = CacheManager(cache_dir=tmp_path)
+    legacy_bytes = 0
+    try:
+        for index in range(10):
+            case = _prompt_case(f"Blob prompt {index}", name=f"blob-{index}")
+            trajectory = _tool_heavy_trajectory(f"Blob prompt {index}")
+            output = RolloutOutput.from_success(f"blob {index}")
+            cache.cache_agent_run(
+                case, index, candidate, trajectory, output, capture_traces=True
+            )
+            legacy_bytes += len(cloudpickle.dumps(output))
+            legacy_bytes += len(cloudpickle.dumps((trajectory, output)))
+
+        stats = cache.backend.stats()
+        assert 0 < stats.blob_bytes < stats.total_bytes
+        assert stats.total_bytes * 5 < legacy_bytes
+    finally:
+        cache.close()
+
+    # A cold reader resolves blobs back into equal objects.
+    reader = CacheManager(cache_dir=tmp_path, memory_max_entries=0)
+    try:
+        case = _prompt_case("Blob prompt 3", name="blob-3")
+        cached = reader.get_cached_agent_run(case, 3, candidate, True)
+        assert cached is not None
+        trajectory, output = cached
+        expected = _tool_heavy_trajectory("Blob prompt 3")
+        assert trajectory.instructions == expected.instructions
+        assert trajectory.function_tools == expected.function_tools
+        assert [part.content for part in trajectory.messages[0].parts] == [
+            part.content for part in expected.messages[0].parts
+        ]
+        assert output.result == "blob 3"
+    finally:
+        reader.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "pickle"])
+def test_unreferenced_blobs_are_pruned(tmp_path, backend):
+    from pydantic_ai_gepa.cache.codec import PayloadCodec
+
+    codec = PayloadCodec()
+    shared = "x" * 4096
+    first = codec.encode({"text": shared, "n": 1})
+    second = codec.encode({"text": shared, "n": 2})
+    assert first.blobs.keys() == second.blobs.keys()
+
+    cache = CacheManager(cache_dir=tmp_path, backend=backend)
+    try:
+        store = cache.backend
+        store.put_many(
+            {"first": first.payload, "second": second.payload},
+            blobs={**first.blobs, **second.blobs},
+        )
+        assert store.stats().blob_bytes > 0
+
+        store.evict(max_entries=1)
+        assert store.stats().blob_bytes > 0
+        (remaining,) = list(store.iter_keys())
+        payload = store.get(remaining)
+        assert codec.decode(payload, store.get_blobs)["text"] == shared
+
+        store.evict(max_entries=0)
+        assert store.stats() == BackendStats(num_entries=0, total_bytes=0)
+    finally:
+        cache.close()
+
+
+def test_codec_reads_legacy_and_rejects_newer_payloads():
+    import cloudpickle
+
+    from pydantic_ai_gepa.cache.codec import FORMAT_VERSION, MAGIC, PayloadCodec
+
+    codec = PayloadCodec(compression="zlib")
+    value = {"result": "ok", "notes": ["repeat me"] * 200}
+    encoded = codec.encode(value)
+    assert encoded.payload.startswith(MAGIC)
+    assert len(encoded.payload) < len(cloudpickle.dumps(value))
+    assert codec.decode(encoded.payload, dict) == value
+    assert codec.decode(cloudpickle.dumps(value), dict) == value
+
+    newer = bytearray(encoded.payload)
+    newer[len(MAGIC)] = FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="newer"):
+        codec.decode(bytes(newer), dict)
+    with pytest.raises(ValueError, match="Unknown compression"):
+        PayloadCodec(compression="brotli")  # type: ignore[arg-type]
+
+
+def test_bundle_round_trip_merges_filtered_entries(tmp_path):
+    from pydantic_ai_gepa.cache import BundleFilter
+
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Bundle"),
+    }
+    metric_result = MetricResult(score=0.5)
+    source = CacheManager(cache_dir=tmp_path / "source")
+    try:
+        for model in ("test:a", "test:b"):
+            source.set_model_identifier(model)
+            for index in range(3):
+                case = _prompt_case(f"Bundle prompt {index}", name=f"bundle-{index}")
+                output = RolloutOutput.from_success(f"bundle {index}")
+                source.cache_agent_run(
+                    case,
+                    index,
+                    candidate,
+                    _tool_heavy_trajectory(f"Bundle prompt {index}"),
+                    output,
+                    capture_traces=True,
+                )
+                source.cache_metric_result(
+                    case, index, output, candidate, metric_result
+                )
+        bundle_path = tmp_path / "warm.tar"
+        exported = source.export_bundle(bundle_path, BundleFilter(model="test:a"))
+        assert exported.num_entries == 9
+        assert exported.num_blobs > 0
+    finally:
+        source.close()
+
+    target = CacheManager(cache_dir=tmp_path / "target", model_identifier="test:a")
+    try:
+        imported = target.import_bundle(bundle_path)
+        assert (imported.num_entries, imported.skipped_entries) == (9, 0)
+        case = _prompt_case("Bundle prompt 1", name="bundle-1")
+        cached = target.get_cached_agent_run(case, 1, candidate, True)
+        assert cached is not None
+        assert cached[0].function_tools == _tool_heavy_trajectory("x").function_tools
+        assert (
+            target.get_cached_metric_result(case, 1, cached[1], candidate)
+            == metric_result
+        )
+        usage = target.get_cache_usage()
+        assert {row.model for row in usage} == {"test:a"}
+
+        again = target.import_bundle(bundle_path)
+        assert (again.num_entries, again.skipped_entries) == (0, 9)
+    finally:
+        target.close()
+
+
+def test_metrics_track_key_types_bytes_and_latency(tmp_path, monkeypatch):
+    from pydantic_ai_gepa.cache import metrics as cache_metrics
+
+    emitted: list[tuple[str, float, dict[str, Any]]] = []
+
+    class _Instrument:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def add(self, amount, attributes=None):
+            emitted.append((self.name, amount, dict(attributes or {})))
+
+        def record(self, amount, attributes=None):
+            emitted.append((self.name, amount, dict(attributes or {})))
+
+    monkeypatch.setattr(
+        cache_metrics,
+        "_instruments",
+        lambda: {
+            name: _Instrument(name)
+            for name in ("lookups", "tier_lookups", "coalesced", "bytes", "duration")
+        },
+    )
+
+    case = _prompt_case("Metrics prompt", name="metrics")
+    candidate = {
+        "instructions": ComponentValue(name="instructions", text="Metrics"),
+    }
+    output = RolloutOutput.from_success("metrics result")
+    writer = CacheManager(cache_dir=tmp_path)
+    writer.cache_metric_result(case, 0, output, candidate, MetricResult(score=1.0))
+    writer.close()
+
+    cache = CacheManager(cache_dir=tmp_path)
+    try:
+        assert cache.get_cached_metric_result(case, 0, output, candidate) is not None
+        assert cache.get_cached_agent_run(case, 0, candidate, True) is None
+        assert cache.get_cached_agent_run(case, 0, candidate, False) is None
+        cache.cache_agent_run(case, 0, candidate, None, output, capture_traces=False)
+
+        snapshot = cache.metrics_snapshot()
+        assert {
+            key_type: (counts.hits, counts.misses)
+            for key_type, counts in snapshot.lookups.items()
+        } == {"agent_run": (0, 1), "metric": (1, 0), "trajectory": (0, 1)}
+        assert (snapshot.hits, snapshot.misses) == (1, 2)
+        assert snapshot.bytes_read > 0 and snapshot.bytes_written > 0
+        assert snapshot.load_latency.count == 3
+        assert snapshot.store_latency.count == 1
+        assert snapshot.load_latency.quantile(0.5) > 0
+
+        stats = cache.get_cache_stats()
+        assert stats["key_types"]["metric"]["hit_ratio"] == 1.0
+        assert stats["latency"]["load"]["count"] == 3
+
+        cache.emit_metrics(node="EvaluateStep")
+        lookups = {
+            (attrs["key_type"], attrs["result"]): amount
+            for name, amount, attrs in emitted
+            if name == "lookups"
+        }
+        assert lookups == {
+            ("metric", "hit"): 1,
+            ("agent_run", "miss"): 1,
+            ("trajectory", "miss"): 1,
+        }
+        assert all(attrs["node"] == "EvaluateStep" for _, _, attrs in emitted)
+        assert sum(1 for name, _, _ in emitted if name == "duration") == 4
+
+        # Only changes since the previous emission are reported.
+        emitted.clear()
+        cache.emit_metrics(node="EvaluateStep")
+        assert emitted == []
+        cache.get_cached_metric_result(case, 0, output, candidate)
+        cache.emit_metrics(node="EvaluateStep")
+        assert [(name, amount) for name, amount, _ in emitted if name == "lookups"] == [
+            ("lookups", 1)
+        ]
+    finally:
+        cache.close()
@@ -284,3 +284,37 @@ async def test_make_reflective_dataset():
             ]
         )
     )
+
+
+@pytest.mark.asyncio
+async def test_evaluate_keeps_trajectories_aligned_with_limiter(monkeypatch):
+    """Cases without a trajectory keep their slot so traces line up with scores."""
+    import asyncio
+
+    agent = Agent(TestModel(custom_output_text="ok"), instructions="Be helpful")
+
+    def metric(
+        case: Case[str, str, dict[str, Any]], output: RolloutOutput[Any]
+    ) -> MetricResult:
+        if case.name == "bad":
+            raise RuntimeError("metric exploded")
+        return MetricResult(score=1.0, feedback="fine")
+
+    monkeypatch.setattr(
+        agent_adapter_module, "_classify_exception", lambda exc: "system"
+    )
+    adapter = AgentAdapter(agent=agent, metric=metric)
+    candidate = extract_seed_candidate(agent)
+    cases = [Case(name=name, inputs="Hello", metadata={}) for name in ("a", "bad", "c")]
+
+    result = await adapter.evaluate(
+        cases, candidate, capture_traces=True, limiter=asyncio.Semaphore(1)
+    )
+
+    assert result.scores == [1.0, 0.0, 1.0]
+    assert result.trajectories is not None
+    assert [trajectory is not None for trajectory in result.trajectories] == [
+        True,
+        False,
+        True,
+    ]